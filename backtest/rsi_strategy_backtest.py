@@ -12,6 +12,10 @@ from datetime import datetime, timedelta
 import duckdb
 import shutil
 import tempfile
+
+# Add project root to sys.path (shared indicator engine)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.indicator_panel import calculate_panel
 # ---------------------------------------------------------
 # 1. 한글 폰트 설정
 # ---------------------------------------------------------
@@ -144,21 +148,6 @@ def get_kosdaq150_tickers():
     latest = max(year_map.keys())
     return year_map[latest]
 
-def calculate_rsi(data, window):
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).fillna(0)
-    loss = (-delta.where(delta < 0, 0)).fillna(0)
-    
-    # Use SMA (Rolling Mean) instead of Wilder's Smoothing (EWM)
-    # This matches the logic used in 'optimize_all_dense.py' which yielded superior results.
-    # Wilder's Smoothing (Standard)
-    avg_gain = gain.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
-    
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
 def prepare_data(tickers, start_date, rsi_window, sma_window):
     # SMA 계산을 위한 충분한 데이터 확보 (약 6개월 전부터 로드)
     if isinstance(start_date, str):
@@ -212,6 +201,14 @@ def prepare_data(tickers, start_date, rsi_window, sma_window):
         
         # Ensure Types
         df_all['date'] = pd.to_datetime(df_all['date'])
+        # pivot() rejects repeated (date, symbol) rows: keep the last one
+        df_all = df_all.drop_duplicates(subset=['symbol', 'date'], keep='last')
+        
+        # RSI/SMA for every symbol in one pass over the (date x symbol) close panel
+        # (same values as Strategy.calculate_indicators per symbol, rows with a NULL close included)
+        closes = df_all.pivot(index='date', columns='symbol', values='close').astype(float)
+        present = df_all.assign(row=True).pivot(index='date', columns='symbol', values='row').notna()
+        indicators = calculate_panel(closes, rsi_window, sma_window, present)
         
         # Group by symbol
         grouped = df_all.groupby('symbol')
@@ -225,8 +222,8 @@ def prepare_data(tickers, start_date, rsi_window, sma_window):
             # We want: Open, High, Low, Close, Volume (Date is index)
             
             if len(df) >= sma_window + 10:
-                df['SMA'] = df['Close'].rolling(window=sma_window).mean()
-                df['RSI'] = calculate_rsi(df['Close'], window=rsi_window)
+                df['SMA'] = indicators['SMA'][symbol].reindex(df.index)
+                df['RSI'] = indicators['RSI'][symbol].reindex(df.index)
                 
                 # Filter start_date
                 df = df[df.index >= start_dt]
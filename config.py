@@ -10,6 +10,75 @@ KIS_CANO = os.getenv("KIS_CANO", "")
 KIS_ACNT_PRDT_CD = os.getenv("KIS_ACNT_PRDT_CD", "01")
 KIS_URL_BASE = os.getenv("KIS_URL_BASE", "https://openapi.koreainvestment.com:9443")
 
+# Extra appkeys for read-only market data (quotes / chart history). TPS is counted per appkey.
+# KIS_APP_KEY_2/KIS_APP_SECRET_2 ... KIS_APP_KEY_9/KIS_APP_SECRET_9 -> [(name, key, secret)]
+KIS_MARKET_DATA_KEYS = [
+    (str(i), os.getenv(f"KIS_APP_KEY_{i}"), os.getenv(f"KIS_APP_SECRET_{i}"))
+    for i in range(2, 10)
+    if os.getenv(f"KIS_APP_KEY_{i}") and os.getenv(f"KIS_APP_SECRET_{i}")
+]
+
+# KIS HTTP Connection Pool (keep-alive)
+KIS_HTTP_POOL_CONNECTIONS = int(os.getenv("KIS_HTTP_POOL_CONNECTIONS", 4))  # Number of host pools
+KIS_HTTP_POOL_SIZE = int(os.getenv("KIS_HTTP_POOL_SIZE", 10))  # Connections kept alive per host
+
+# KIS TPS Budget (per appkey). Real: 20 TPS, Mock(openapivts): ~2 TPS. Keep a small margin.
+KIS_TPS_LIMITS = {
+    "real": {
+        "total": float(os.getenv("KIS_TPS_REAL", 18)),
+        "order": float(os.getenv("KIS_TPS_REAL_ORDER", 10)),
+        "account": float(os.getenv("KIS_TPS_REAL_ACCOUNT", 10)),
+        "quote": float(os.getenv("KIS_TPS_REAL_QUOTE", 18)),
+        "history": float(os.getenv("KIS_TPS_REAL_HISTORY", 18)),
+        "burst": int(os.getenv("KIS_TPS_BURST", 1)),
+    },
+    "mock": {
+        "total": float(os.getenv("KIS_TPS_MOCK", 2)),
+        "order": float(os.getenv("KIS_TPS_MOCK_ORDER", 1)),
+        "account": float(os.getenv("KIS_TPS_MOCK_ACCOUNT", 2)),
+        "quote": float(os.getenv("KIS_TPS_MOCK_QUOTE", 2)),
+        "history": float(os.getenv("KIS_TPS_MOCK_HISTORY", 2)),
+        "burst": 1,
+    },
+}
+
+# Resilience (_send_request): jittered backoff, per-endpoint circuit breaker, adaptive TPS
+KIS_MAX_RETRIES = int(os.getenv("KIS_MAX_RETRIES", 5))
+KIS_BACKOFF_BASE = float(os.getenv("KIS_BACKOFF_BASE", 0.25))  # Seconds, doubled per attempt (full jitter)
+KIS_BACKOFF_CAP = float(os.getenv("KIS_BACKOFF_CAP", 8))
+KIS_CB_FAILURE_THRESHOLD = int(os.getenv("KIS_CB_FAILURE_THRESHOLD", 5))  # Consecutive failures before opening
+KIS_CB_RESET_SECONDS = float(os.getenv("KIS_CB_RESET_SECONDS", 30))  # Open -> half-open probe after N seconds
+KIS_TPS_DECREASE = float(os.getenv("KIS_TPS_DECREASE", 0.8))  # Shared TPS x factor on EGW00201
+KIS_TPS_RECOVERY = float(os.getenv("KIS_TPS_RECOVERY", 0.5))  # TPS regained per second of successful calls
+
+# Concurrent universe scan (AsyncKISClient worker pool size)
+KIS_ASYNC_CONCURRENCY = int(os.getenv("KIS_ASYNC_CONCURRENCY", 8))
+
+# Batch order submission (OrderExecutor worker pool; also capped by the order TPS budget)
+KIS_ORDER_CONCURRENCY = int(os.getenv("KIS_ORDER_CONCURRENCY", 5))
+
+# Daily OHLCV pagination: fetch page-sized date windows concurrently
+KIS_OHLCV_PARALLEL = os.getenv("KIS_OHLCV_PARALLEL", "true").lower() == "true"
+
+# Quote Snapshot (get_quotes)
+KIS_QUOTE_TTL = float(os.getenv("KIS_QUOTE_TTL", 3))  # Seconds a quote snapshot is reused
+KIS_MULTI_QUOTE_ENABLED = os.getenv("KIS_MULTI_QUOTE_ENABLED", "true").lower() == "true"  # FHKST11300006 (Real only)
+
+# Real-time Quote Stream (KIS websocket, H0STCNT0)
+KIS_WS_ENABLED = os.getenv("KIS_WS_ENABLED", "false").lower() == "true"
+KIS_WS_URL = os.getenv("KIS_WS_URL", "")  # Empty: Real ws://ops.koreainvestment.com:21000 / Mock :31000
+KIS_WS_MAX_SUBSCRIPTIONS = int(os.getenv("KIS_WS_MAX_SUBSCRIPTIONS", 40))  # KIS limit: 41 registrations per session
+KIS_WS_QUOTE_MAX_AGE = float(os.getenv("KIS_WS_QUOTE_MAX_AGE", 30))  # Seconds a streamed tick is served before falling back to REST
+KIS_HTS_ID = os.getenv("KIS_HTS_ID", "")  # tr_key of the execution-notice subscription (H0STCNI0 / H0STCNI9)
+KIS_FILL_STREAM_ENABLED = os.getenv("KIS_FILL_STREAM_ENABLED", "false").lower() == "true"  # Fills via websocket notices instead of polling
+
+# Balance Snapshot (get_balance)
+KIS_BALANCE_TTL = float(os.getenv("KIS_BALANCE_TTL", 10))  # Seconds a balance snapshot is reused
+
+# OHLCV Cache Refresh (05:00)
+OHLCV_REFRESH_MODE = os.getenv("OHLCV_REFRESH_MODE", "incremental")  # 'incremental' or 'full'
+OHLCV_RECONCILE_DAYS = int(os.getenv("OHLCV_RECONCILE_DAYS", 5))  # Overlap bars re-checked for price adjustments
+
 USER_DB_PATH = os.getenv("USER_DB_PATH", "data/user_data.db")
 
 # Telegram
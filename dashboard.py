@@ -7,6 +7,7 @@ import pytz
 # Custom Modules
 from src.kis_client import KISClient
 from src.strategy import Strategy
+from src.indicator_panel import close_panel
 from src.trade_manager import TradeManager
 from src.db_manager import DBManager
 import config
@@ -135,6 +136,7 @@ def main_dashboard():
         "📈 Trade History",
         "📒 Trading Journal",
         "💳 LLM Billing & Usage",
+        "📡 KIS API Metrics",
         "🔐 Change Password"
     ])
     
@@ -152,6 +154,49 @@ def main_dashboard():
         render_change_password_page()
     elif page == "💳 LLM Billing & Usage":
         render_credit_page()
+    elif page == "📡 KIS API Metrics":
+        render_api_metrics_page()
+
+def render_api_metrics_page():
+    st.title("📡 KIS API Metrics")
+    st.caption("Per-TR_ID call statistics dumped by the bot at the end of each scheduled job (data/metrics).")
+
+    from src.kis_metrics import KIS_METRICS_DIR, list_dumps, load_dump
+    import os
+
+    dumps = list_dumps()
+    if not dumps:
+        st.info("No metrics yet. The bot writes one dump per scheduled job (e.g. buy_analysis at 15:10).")
+        return
+
+    selected = st.sidebar.selectbox("Select Job Dump", dumps, index=0, key="metrics_dump")
+    try:
+        data = load_dump(os.path.join(KIS_METRICS_DIR, selected))
+    except Exception as e:
+        st.error(f"Failed to load {selected}: {e}")
+        return
+
+    rows = []
+    for tr_id, s in data.get("tr_ids", {}).items():
+        row = {k: v for k, v in s.items() if k not in ("statuses", "histogram")}
+        row["tr_id"] = tr_id
+        row["statuses"] = ", ".join(f"{k}: {v}" for k, v in s.get("statuses", {}).items())
+        rows.append(row)
+    if not rows:
+        st.info("No KIS calls in this job.")
+        return
+    df = pd.DataFrame(rows).set_index("tr_id")
+
+    st.subheader(f"{data.get('job')} @ {data.get('dumped_at')}")
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Calls", int(df["calls"].sum()))
+    m2.metric("Retries", int(df["retries"].sum()))
+    m3.metric("Rate Limited", int(df["rate_limited"].sum()))
+    m4.metric("Limiter Wait (s)", f"{df['limiter_wait_ms'].sum() / 1000:.1f}")
+
+    # Where the job time goes: request time + time queued in the TPS limiter
+    st.bar_chart(df[["total_ms", "limiter_wait_ms"]] / 1000)
+    st.dataframe(df, use_container_width=True)
 
 def render_credit_page():
     st.title("💳 LLM Billing & Usage")
@@ -330,6 +375,12 @@ def render_dashboard():
         total_eval_amt = 0.0
         total_pnl_amt = 0.0
         
+        # One store read + one quote snapshot for all holdings
+        frames = kis.get_ohlcv_cached_many([h['pdno'] for h in holdings])
+        # RSI/SMA for all holdings in one pass over the (date x code) close panel
+        panel, present = close_panel(frames, with_present=True)
+        indicators = strategy.calculate_panel(panel, present) if not panel.empty else {}
+        
         for i, h in enumerate(holdings):
             code = h['pdno']
             name = h['prdt_name']
@@ -341,21 +392,18 @@ def render_dashboard():
             eval_amt = curr * qty  # 평가 금액 계산
             
             # RSI/SMA Calculation & Day Change
-            df = kis.get_ohlcv_cached(code)
+            df = frames.get(code, pd.DataFrame())
             rsi = 0.0
             sma = 0.0
             is_above_sma = False
             day_change_pct = 0.0
 
             if not df.empty:
-                df = strategy.calculate_indicators(df)
                 latest = df.iloc[-1]
-                if 'RSI' in df.columns:
-                    rsi = latest['RSI']
-                if 'SMA' in df.columns:
-                    sma = latest['SMA']
-                    if 'Close' in df.columns and latest['Close'] > sma:
-                        is_above_sma = True
+                rsi = indicators['RSI'].at[latest['Date'], code]
+                sma = indicators['SMA'].at[latest['Date'], code]
+                if latest['Close'] > sma:
+                    is_above_sma = True
 
                 # Calculate day change
                 if len(df) >= 2:
@@ -7,8 +7,14 @@ import pytz
 from datetime import datetime, timedelta
 import config
 from src.kis_client import KISClient
+from src.async_kis_client import AsyncKISClient
+from src.market_stream import MarketStream
+from src.fill_stream import FillStream
+from src.order_executor import OrderExecutor, STATUS_SUBMITTED, STATUS_FAILED, summarize
+from src.stock_master import StockMaster
 from src.telegram_bot import TelegramBot
 from src.strategy import Strategy
+from src.indicator_panel import close_panel
 from src.trade_manager import TradeManager
 from src.db_manager import DBManager
             # 0. 07:00 Gemini Buy Advice (Removed - Replaced by Cron analyze_kosdaq150.py)
@@ -39,6 +45,7 @@ state = {
     "buy_analysis_done": False,
     "buy_exec_done": False,
     "trade_sync_done": False,
+    "status_prefetch_done": False,
     "buy_targets": [], # List of dict: {code, rsi, close_price, name}
     "sell_targets": [], # List of dict: {code, name, reason}
     "last_reset_date": None,
@@ -47,8 +54,11 @@ state = {
     "last_sent_hour": -1 
 }
 
-def load_exclusion_list(kis=None):
-    """Load excluded stock codes from file and optionally log names"""
+# Local stock master (names / index members), refreshed at 05:00
+stock_master = StockMaster()
+
+def load_exclusion_list():
+    """Load excluded stock codes from file and log their names"""
     exclude_file = "data/exclude_list.txt"
     excluded = set()
     if os.path.exists(exclude_file):
@@ -61,26 +71,11 @@ def load_exclusion_list(kis=None):
             
             logging.info(f"🚫 Exclusion List Loaded: {len(excluded)} items.")
             
-            # If KIS client is provided, fetch and display names
-            if kis and excluded:
+            # Display names from the local stock master (no API calls)
+            if excluded:
                 logging.info("   [Excluded Stocks]")
                 for code in excluded:
-                    name = "Unknown"
-                    try:
-                        # Fetch price info to get name
-                        time.sleep(0.1) 
-                        # Use get_stock_info first (most reliable for name)
-                        info = kis.get_stock_info(code)
-                        if info:
-                            name = info.get('prdt_name', "Unknown")
-                        else:
-                            # Fallback
-                            curr = kis.get_current_price(code)
-                            if curr:
-                                name = curr.get('hts_kor_isnm') or "Unknown"
-                    except Exception:
-                        pass
-                    logging.info(f"   - {code} : {name}")
+                    logging.info(f"   - {code} : {stock_master.name(code, 'Unknown')}")
 
         except Exception as e:
             logging.error(f"Failed to load exclusion list: {e}")
@@ -97,9 +92,10 @@ def reset_daily_state(kis):
         state["buy_analysis_done"] = False
         state["buy_exec_done"] = False
         state["trade_sync_done"] = False
+        state["status_prefetch_done"] = False
         state["buy_targets"] = []
         state["sell_targets"] = []
-        state["exclude_list"] = load_exclusion_list(kis)
+        state["exclude_list"] = load_exclusion_list()
         state["last_reset_date"] = today
         state["last_sent_hour"] = -1
         
@@ -113,7 +109,11 @@ def reset_daily_state(kis):
             logging.info(f"📈 Today ({today}) is a Trading Day.")
 
 def get_kosdaq150_universe():
-    """Fetch KOSDAQ 150 tickers. Prioritizes local file."""
+    """Fetch KOSDAQ 150 tickers. Prioritizes the local stock master, then the list file."""
+    members = stock_master.members("KOSDAQ150")
+    if members:
+        return members
+
     fallback_file = "data/kosdaq150_list.txt"
     if os.path.exists(fallback_file):
         universe = []
@@ -211,6 +211,12 @@ def main():
     logging.info("🚀 Continuous RSI Power Zone Bot Started")
     
     kis = KISClient()
+    market_stream = None
+    if config.KIS_WS_ENABLED:
+        # 실시간 체결가 스트림 (get_current_price / get_quotes 가 우선 사용)
+        market_stream = MarketStream(kis)
+        kis.attach_market_stream(market_stream)
+        market_stream.start()
     telegram = TelegramBot() # Changed from SlackBot
     strategy = Strategy()
     
@@ -221,7 +227,12 @@ def main():
     else:
         logging.info("📜 data/trade_history.json found. Loading existing history.")
     db_manager = DBManager()
-    trade_manager = TradeManager(db=db_manager)
+    trade_manager = TradeManager(db=db_manager, calendar=kis.calendar)
+    if config.KIS_FILL_STREAM_ENABLED:
+        # 실시간 체결통보: 체결 즉시 TradeManager / trade_history 반영 (시세 스트림과 같은 세션 공유)
+        fill_stream = FillStream(kis, ws=market_stream.ws if market_stream else None, trade_manager=trade_manager)
+        if fill_stream.start():
+            kis.attach_fill_stream(fill_stream)
 
     # Disable Telegram in Mock Mode? User might still want logs.
     # User requested control via .env ENABLE_NOTIFICATIONS, so we respect that.
@@ -258,9 +269,14 @@ def main():
             if current_time == "05:00":
                 if not state.get("refresh_done", False):
                     logging.info("🧹 [05:00] Starting Daily OHLCV Cache Refresh...")
+                    try:
+                        stock_master.refresh()
+                    except Exception as e:
+                        logging.error(f"Stock Master Refresh Error: {e}")
                     universe = get_kosdaq150_universe()
                     if universe:
-                        kis.refresh_ohlcv_cache(universe)
+                        with kis.metrics.job("ohlcv_refresh"):
+                            kis.refresh_ohlcv_cache(universe, incremental=(config.OHLCV_REFRESH_MODE == "incremental"))
                         state["refresh_done"] = True
                         telegram.send_message("✅ Daily OHLCV Refresh Complete.")
             else:
@@ -271,13 +287,23 @@ def main():
                 # 1. 08:30 Morning Sell Analysis (Yesterday's signals)
                 if current_time >= config.TIME_MORNING_ANALYSIS and current_time < config.TIME_PRE_ORDER:
                     if not state["sell_analysis_done"]:
-                        run_morning_sell_analysis(kis, telegram, strategy, trade_manager)
+                        with kis.metrics.job("sell_analysis"):
+                            run_morning_sell_analysis(kis, telegram, strategy, trade_manager)
                         state["sell_analysis_done"] = True
+                    
+                    # 위험/관리종목 상태 일괄 조회 (당일 캐시 -> 15:10 최종 필터는 메모리 조회)
+                    if not state["status_prefetch_done"]:
+                        universe = get_kosdaq150_universe()
+                        if universe:
+                            with kis.metrics.job("status_prefetch"):
+                                kis.prefetch_stock_status([u['code'] for u in universe])
+                        state["status_prefetch_done"] = True
 
                 # 2. 08:50 Morning Sell Execution (Market Sell at Open)
                 if current_time >= config.TIME_PRE_ORDER and current_time < config.TIME_ORDER_CHECK:
                     if not state["sell_exec_done"]:
-                        run_morning_sell_execution(kis, telegram, trade_manager)
+                        with kis.metrics.job("sell_execution"):
+                            run_morning_sell_execution(kis, telegram, trade_manager)
                         state["sell_exec_done"] = True
 
                 # 3. Evening Buy Analysis (Analyze for Close Buy)
@@ -285,18 +311,21 @@ def main():
                 buy_anal_start_time = "15:00" if kis.is_mock else config.TIME_SELL_CHECK
                 if current_time >= buy_anal_start_time and current_time < config.TIME_SELL_EXEC:
                     if not state["buy_analysis_done"]:
-                        run_evening_buy_analysis(kis, telegram, strategy, trade_manager, db_manager)
+                        with kis.metrics.job("buy_analysis"):
+                            run_evening_buy_analysis(kis, telegram, strategy, trade_manager, db_manager)
                         state["buy_analysis_done"] = True
 
                 # 4. 15:20 Evening Buy Execution (Execute Market/Best Buy for Close)
                 if current_time >= config.TIME_SELL_EXEC and current_time < config.TIME_TRADE_SYNC:
                     if not state["buy_exec_done"]:
-                        run_evening_buy_execution(kis, telegram, trade_manager)
+                        with kis.metrics.job("buy_execution"):
+                            run_evening_buy_execution(kis, telegram, trade_manager)
                         state["buy_exec_done"] = True
 
                 # 5. 15:40 Sync Trades
                 if current_time >= config.TIME_TRADE_SYNC and not state["trade_sync_done"]:
-                    sync_trades_at_close(kis, telegram, trade_manager)
+                    with kis.metrics.job("trade_sync"):
+                        sync_trades_at_close(kis, telegram, trade_manager)
                     state["trade_sync_done"] = True
             
             # Periodic Holdings Display (XX:10)
@@ -354,20 +383,16 @@ def run_morning_sell_execution(kis, telegram, trade_manager):
 
     logging.info(f"💸 [08:50] Executing Market Sells for {len(state['sell_targets'])} targets...")
     
-    for target in state["sell_targets"]:
-        code = target['code']
-        name = target['name']
-        qty = target['qty']
-        
-        success, msg = kis.send_order(code, qty, side="sell", price=0, order_type="01")
-        if success:
-            logging.info(f"👋 Sell Order: {name} ({qty}주)")
-            telegram.send_message(f"👋 Sell Order: {name}\nQty: {qty}")
-            trade_manager.update_sell(code, name, get_now_kst().strftime("%Y%m%d"), 0, qty, 0)
+    # 전 종목 동시 주문 (주문 TPS 한도 내)
+    report = OrderExecutor(kis).sell(state["sell_targets"])
+    today_str = get_now_kst().strftime("%Y%m%d")
+    for r in report:
+        if r['status'] == STATUS_SUBMITTED:
+            logging.info(f"👋 Sell Order: {r['name']} ({r['qty']}주, {r['elapsed_ms']:.0f}ms)")
+            trade_manager.update_sell(r['code'], r['name'], today_str, 0, r['qty'], 0)
         else:
-            logging.error(f"❌ Sell Failed {name}: {msg}")
-            telegram.send_message(f"❌ Sell Failed: {name}\nMsg: {msg}")
-        time.sleep(0.2)
+            logging.error(f"❌ Sell Failed {r['name']}: {r['msg']}")
+    telegram.send_message(f"👋 Sell Orders\n{summarize(report)}")
 
 def run_evening_buy_analysis(kis, telegram, strategy, trade_manager, db_manager):
     """15:10: 코스닥 150 전 종목 스캔 및 매수 조건 체크 (실시간 RSI/SMA)"""
@@ -392,33 +417,63 @@ def run_evening_buy_analysis(kis, telegram, strategy, trade_manager, db_manager)
     total = len(universe)
     
     logging.info(f"Scanning {total} stocks for Buy Signal...")
-    for i, item in enumerate(universe):
+    held_codes = {h['pdno'] for h in balance['holdings'] if int(h['hldg_qty']) > 0}
+    scan_items = []
+    for item in universe:
         code = item['code']
-        name = item['name']
         
         # 1. Basic Filters
         if code in state["exclude_list"]: continue
-        if any(h['pdno'] == code for h in balance['holdings'] if int(h['hldg_qty']) > 0): continue
+        if code in held_codes: continue
         if not trade_manager.can_buy(code): continue
-        
-        # 2. Fetch OHLCV & Indicators
-        # OHLCV fetching includes rate limit delay internally
-        df = kis.get_daily_ohlcv(code)
+        scan_items.append(item)
+
+    # 2. Fetch OHLCV for all candidates concurrently
+    # (AsyncKISClient shares kis' session/token/rate limiter, so TPS budget is respected)
+    scan_codes = [item['code'] for item in scan_items]
+    if kis.market_stream:
+        # 보유종목 우선, 남는 실시간 등록 슬롯은 후보 종목에 할당 (나머지는 REST 시세)
+        kis.market_stream.set_watchlist(sorted(held_codes) + scan_codes)
+    async_kis = AsyncKISClient(kis)
+    try:
+        scan_data = async_kis.fetch_scan_data_sync(scan_codes, with_price=False)
+    finally:
+        async_kis.close()
+    # 현재가는 한 번의 스냅샷으로 일괄 조회 (멀티종목 시세, 30종목/요청)
+    quotes = kis.get_quotes(scan_codes)
+    logging.info(f"Fetched scan data for {len(scan_data)}/{len(scan_items)} stocks ({len(quotes)} quotes).")
+
+    frames = {}
+    for item in scan_items:
+        code = item['code']
+        fetched = scan_data.get(code)
+        if not fetched: continue
+        df = fetched['df']
         if df.empty: continue
         
         # 실시간 현재가 반영 (장 마감 전이므로 마지막 봉 업데이트)
-        curr_info = kis.get_current_price(code)
+        curr_info = quotes.get(code)
         if curr_info:
             curr_p = float(curr_info['stck_prpr'])
             df.loc[df.index[-1], 'Close'] = curr_p
-            
-        df = strategy.calculate_indicators(df)
-        if len(df) < strategy.sma_window: continue
+        frames[code] = df
+
+    # 전 종목 RSI/SMA를 (날짜 x 종목) 패널로 한 번에 계산 (종목별 calculate_indicators와 동일한 값)
+    panel, present = close_panel(frames, with_present=True)
+    indicators = strategy.calculate_panel(panel, present) if not panel.empty else {}
+
+    for i, item in enumerate(scan_items):
+        code = item['code']
+        name = item['name']
         
-        latest = df.iloc[-1]
-        rsi = latest['RSI']
-        sma = latest['SMA']
-        close = latest['Close']
+        df = frames.get(code)
+        if df is None or len(df) < strategy.sma_window: continue
+        
+        # 종목 자신의 마지막 봉 기준 (거래정지 등으로 날짜가 다를 수 있음)
+        last_date = df['Date'].iloc[-1] if 'Date' in df.columns else df.index[-1]
+        rsi = indicators['RSI'].at[last_date, code]
+        sma = indicators['SMA'].at[last_date, code]
+        close = df['Close'].iloc[-1]
         
         # [DEBUG] 상세 로그 출력 (사용자 요청)
         logging.info(f"🧐 Check: {name}({code}) RSI:{rsi:.2f} SMA:{sma:.1f} Close:{close:,.0f}")
@@ -434,7 +489,7 @@ def run_evening_buy_analysis(kis, telegram, strategy, trade_manager, db_manager)
             )
 
             if rsi <= config.RSI_BUY_THRESHOLD and close > sma:
-                # 4. Dangerous stock check (Final filter)
+                # 4. Dangerous stock check (Final filter, served from today's status cache)
                 is_dangerous, reason = kis.check_dangerous_stock(code)
                 if not is_dangerous:
                     final_candidates.append({"code": code, "name": name, "rsi": rsi})
@@ -443,11 +498,14 @@ def run_evening_buy_analysis(kis, telegram, strategy, trade_manager, db_manager)
                     logging.info(f"🚫 Skipping {name} ({code}): {reason}")
 
         if (i+1) % 10 == 0:
-            logging.info(f"Progress: {i+1}/{total}...")
+            logging.info(f"Progress: {i+1}/{len(scan_items)}...")
 
     # Sort by RSI (ascending)
     final_candidates.sort(key=lambda x: x['rsi'])
     state["buy_targets"] = final_candidates[:slots_open]
+    if kis.market_stream:
+        # 15:20 매수 집행 전까지 보유종목 + 매수 대상만 실시간 추적
+        kis.market_stream.set_watchlist(sorted(held_codes) + [t['code'] for t in state["buy_targets"]])
     
     msg = f"✅ Market Scan Done. Found {len(final_candidates)} signals. Targets: {len(state['buy_targets'])}."
     if state["buy_targets"]:
@@ -459,51 +517,29 @@ def run_evening_buy_execution(kis, telegram, trade_manager):
     """15:20: 종가 매수 주문 집행"""
     if not state["buy_targets"]: return
 
-    balance = kis.get_balance()
-    cash = float(balance.get('max_buy_amt', 0))
-    amt_per_stock = config.BUY_AMOUNT_KRW
+    # 주문 수량 산정용: 캐시된 잔고 대신 항상 최신 잔고 조회 (매수가능금액 포함)
+    balance = kis.get_balance(force_refresh=True)
+    cash = float(balance['max_buy_amt']) if balance else None
     
     logging.info(f"🛒 [15:20] Executing Close Buys...")
-    for target in state["buy_targets"]:
-        if cash < amt_per_stock * 0.5: break
-        
-        curr = kis.get_current_price(target['code'])
-        if not curr: continue
-        price = float(curr['stck_prpr'])
-        
-        qty = int(amt_per_stock / price)
-        if qty < 1: continue
-        
-        # [Patch] Check Buyable Cash
-        try:
-            buyable = kis.get_buyable_cash()
-            max_amt = float(buyable.get('max_buy', 0))
-            expected_needed = qty * price
-            
-            if expected_needed > max_amt:
-                logging.warning(f"⚠️ Insufficient Cash for {target['name']}. Needed: {expected_needed:.0f}, Max: {max_amt:.0f}. Adjusting qty.")
-                qty = int(max_amt / price)
-        except Exception as e:
-            logging.error(f"⚠️ Failed to check buying power: {e}")
-
-        if qty < 1: 
-            logging.warning(f"⚠️ Qty adjusted to 0. Skipping {target['name']}.")
-            continue
-
-        success, msg = kis.send_order(target['code'], qty, side="buy", price=0, order_type="01")
-        if success:
-            logging.info(f"✅ Buy Order: {target['name']} ({qty}주)")
-            telegram.send_message(f"✅ Buy Order: {target['name']}\nQty: {qty}")
-            # cash -= (qty * price) # Recalculated nicely by get_buyable_cash each time effectively, though we might want to keep local tracking for speed if we didn't call API every time. 
-            # But the patch calls API every time.
-            cash -= (qty * price)
-        time.sleep(0.2)
+    # 시세 1회 조회 + 잔고의 매수가능금액으로 일괄 수량 산정, 동시 주문 (주문 TPS 한도 내)
+    report = OrderExecutor(kis).buy(state["buy_targets"], config.BUY_AMOUNT_KRW, cash=cash)
+    for r in report:
+        if r['status'] == STATUS_SUBMITTED:
+            logging.info(f"✅ Buy Order: {r['name']} ({r['qty']}주, {r['elapsed_ms']:.0f}ms)")
+        elif r['status'] == STATUS_FAILED:
+            logging.error(f"❌ Buy Failed {r['name']}: {r['msg']}")
+    telegram.send_message(f"✅ Buy Orders\n{summarize(report)}")
 
 def sync_trades_at_close(kis, telegram, trade_manager):
     """15:40: 체결 기록 동기화"""
     logging.info("📝 [15:40] Syncing Trade History...")
     today_str = get_now_kst().strftime("%Y%m%d")
-    trades = kis.get_period_trades(today_str, today_str) or []
+    if kis.fill_stream and kis.fill_stream.is_live():
+        # 체결통보로 유지된 당일 주문 장부 사용 (API 호출 없음)
+        trades = kis.fill_stream.book.ccld_rows()
+    else:
+        trades = kis.get_period_trades(today_str, today_str) or []
     
     aggregated = {}
     for t in trades:
@@ -521,7 +557,9 @@ def sync_trades_at_close(kis, telegram, trade_manager):
             trade_manager.update_buy(code, data['name'], today_str, data['buy']['amt']/data['buy']['qty'], data['buy']['qty'])
         if data['sell']['qty'] > 0:
             trade_manager.update_sell(code, data['name'], today_str, data['sell']['amt']/data['sell']['qty'], data['sell']['qty'], 0.0)
-            
+    
+    # 체결 반영 후 잔고 스냅샷 폐기
+    kis.invalidate_balance()
     telegram.send_message("✅ Daily Trade Sync Complete.")
 
 if __name__ == "__main__":
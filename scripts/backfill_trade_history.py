@@ -0,0 +1,37 @@
+import sys
+import os
+import argparse
+import logging
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.kis_client import KISClient
+from src.db_manager import DBManager
+from src.trade_backfill import backfill_trade_history, BACKFILL_CHUNK_DAYS
+from src.utils import get_now_kst
+
+# Rebuild trade_history from the account's concluded orders (inquire-daily-ccld, all pages).
+# python scripts/backfill_trade_history.py --start 20250101 [--end 20250630] [--replace]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill trade_history from KIS concluded orders")
+    parser.add_argument("--start", required=True, help="YYYYMMDD")
+    parser.add_argument("--end", default=get_now_kst().strftime("%Y%m%d"), help="YYYYMMDD (default: today)")
+    parser.add_argument("--chunk-days", type=int, default=BACKFILL_CHUNK_DAYS)
+    parser.add_argument("--replace", action="store_true", help="Overwrite existing (date, code, action) rows")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    summary = backfill_trade_history(KISClient(), DBManager(), args.start, args.end,
+                                     chunk_days=args.chunk_days, replace=args.replace)
+    print(f"Chunks: {summary['chunks']}, Orders: {summary['rows']}, "
+          f"Inserted: {summary['inserted']}, Updated: {summary['updated']}")
+    if summary['failed']:
+        print(f"Failed ranges (re-run these): {', '.join(f'{s}~{e}' for s, e in summary['failed'])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import sys
+import os
+import json
+import glob
+import timeit
+import argparse
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+import src.json_codec as json_codec
+from src.kis_simulator import FakeKISServer, SimulatorData
+
+# Micro-benchmark: stdlib Response.json() vs src.json_codec on KIS response payloads.
+# python scripts/bench_json_codec.py [--files "data/recorded/*.json"] [--number 2000]
+# Without --files, payloads are rendered by the KIS simulator in the real response shapes.
+
+
+def simulator_payloads():
+    """(name, body bytes) for the heaviest responses of a trading day."""
+    codes = [f"{100000 + i:06d}" for i in range(30)]
+    data = SimulatorData(names={c: f"종목{c}" for c in codes}, cash=100_000_000)
+    for code in codes[:20]:
+        data.fill(code, "buy", 10, float(data.price(code)["stck_prpr"]))
+    server = FakeKISServer(data)
+
+    params = {"FID_INPUT_ISCD": codes[0], "FID_INPUT_DATE_1": "20240101", "FID_INPUT_DATE_2": "20241231"}
+    multi = {f"FID_INPUT_ISCD_{i + 1}": code for i, code in enumerate(codes)}
+    ccld = {"INQR_STRT_DT": "00000000", "INQR_END_DT": "99999999"}
+    routes = [
+        ("daily_chart (100 rows)", server._daily_chart(params, "FHKST03010100")),
+        ("multi_quote (30 codes)", server._multi_price(multi, "FHKST11300006")),
+        ("balance (20 holdings)", server._balance({}, "TTTC8434R")),
+        ("daily_ccld (20 orders)", server._daily_ccld(ccld, "TTTC8001R")),
+        ("inquire_price", server._inquire_price(params, "FHKST01010100")),
+    ]
+    return [(name, json.dumps(result[1], ensure_ascii=False).encode("utf-8")) for name, result in routes]
+
+
+def file_payloads(pattern):
+    payloads = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "rb") as f:
+            payloads.append((os.path.basename(path), f.read()))
+    return payloads
+
+
+def make_response(body):
+    res = requests.Response()
+    res.status_code = 200
+    res._content = body
+    res.headers["Content-Type"] = "application/json; charset=utf-8"
+    res.encoding = "utf-8"
+    return res
+
+
+def decode_twice(res):
+    # _send_request checks msg_cd, then the KISClient method reads the outputs
+    res.json()
+    return res.json()
+
+
+def run(args):
+    payloads = file_payloads(args.files) if args.files else simulator_payloads()
+    if not payloads:
+        print(f"No payloads matched {args.files}")
+        return
+
+    print(f"Codec backend: {json_codec.BACKEND} ({args.number} responses per payload, res.json() x2 each)")
+    print(f"{'payload':<26}{'KB':>8}{'stdlib us':>12}{'codec us':>12}{'speedup':>10}")
+    total_std = total_fast = 0.0
+    for name, body in payloads:
+        # Each round builds a fresh Response, as every HTTP call does
+        std = timeit.timeit(lambda: decode_twice(make_response(body)), number=args.number) / args.number
+        fast = timeit.timeit(lambda: decode_twice(json_codec.install(make_response(body))), number=args.number) / args.number
+        assert json_codec.install(make_response(body)).json() == make_response(body).json()
+        total_std += std
+        total_fast += fast
+        print(f"{name:<26}{len(body) / 1024:>8.1f}{std * 1e6:>12.1f}{fast * 1e6:>12.1f}{std / fast:>9.2f}x")
+
+    order = {"CANO": "12345678", "ACNT_PRDT_CD": "01", "PDNO": "005930", "ORD_DVSN": "01", "ORD_QTY": "10", "ORD_UNPR": "0"}
+    std = timeit.timeit(lambda: json.dumps(order), number=args.number) / args.number
+    fast = timeit.timeit(lambda: json_codec.dumps(order), number=args.number) / args.number
+    print(f"{'order body (encode)':<26}{len(json.dumps(order)) / 1024:>8.1f}{std * 1e6:>12.1f}{fast * 1e6:>12.1f}{std / fast:>9.2f}x")
+    print(f"Decode total: {total_std * 1e6:.1f}us -> {total_fast * 1e6:.1f}us ({total_std / total_fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark KIS response decoding (stdlib vs json_codec)")
+    parser.add_argument("--files", help="Glob of recorded response bodies (JSON files)")
+    parser.add_argument("--number", type=int, default=2000)
+    run(parser.parse_args())
@@ -0,0 +1,66 @@
+import sys
+import os
+import time
+import argparse
+import tempfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src.kis_client import KISClient
+from src.kis_simulator import FakeKISServer
+from src.token_store import TokenStore
+
+# Offline benchmark of the 15:10 scan pattern (2y daily chart + quotes per code) against the KIS simulator.
+# python scripts/bench_kis_scan.py --codes 150 --latency 0.05 --tps 18
+
+
+def run(args):
+    server = FakeKISServer(latency=args.latency, latency_jitter=args.jitter, tps=args.tps,
+                           rate_limit_rate=args.rate_limit_rate, server_error_rate=args.server_error_rate, seed=1)
+    url = server.start()
+    tmp = tempfile.mkdtemp()
+
+    kis = KISClient()
+    kis.base_url = url
+    kis.is_mock = False
+    for cred in kis.credentials.market_data:
+        cred.store = TokenStore(os.path.join(tmp, f"token_{cred.name}.json"))
+
+    codes = [f"{100000 + i:06d}" for i in range(args.codes)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=config.KIS_ASYNC_CONCURRENCY) as pool:
+        frames = list(pool.map(
+            lambda c: kis.get_daily_ohlcv(c, start_date=args.start, end_date=args.end, parallel=args.parallel), codes
+        ))
+    chart_elapsed = time.perf_counter() - start
+    quotes = kis.get_quotes(codes)
+    total_elapsed = time.perf_counter() - start
+    server.stop()
+
+    print(f"codes={len(codes)} bars={sum(len(f) for f in frames)} quotes={len(quotes)}")
+    print(f"chart phase {chart_elapsed:.2f}s, total {total_elapsed:.2f}s")
+    print(f"server requests={dict(server.requests)} rejected={dict(server.rejected)}")
+    print(f"{'TR_ID':<16}{'calls':>7}{'retries':>9}{'429s':>6}{'avg_ms':>9}{'p95_ms':>9}{'wait_ms':>11}")
+    for tr_id, s in kis.metrics.snapshot().items():
+        print(f"{tr_id:<16}{s['calls']:>7}{s['retries']:>9}{s['rate_limited']:>6}{s['avg_ms']:>9}{s['p95_ms']:>9}{s['limiter_wait_ms']:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark KISClient scan throughput against the local simulator")
+    parser.add_argument("--codes", type=int, default=150)
+    parser.add_argument("--start", default="20240101")
+    parser.add_argument("--end", default="20251231")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--tps", type=float, default=20)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--parallel", action=argparse.BooleanOptionalAction, default=None,
+                        help="Concurrent chart windows per code (default: KIS_OHLCV_PARALLEL)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    run(args)
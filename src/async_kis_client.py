@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import config
+from src.kis_client import KISClient
+
+
+class AsyncKISClient:
+    """
+    asyncio variant of KISClient for universe-wide scans.
+    - Wraps a (shared) KISClient: same pooled session, tokens and TPS limiters
+    - Blocking HTTP calls run on a worker pool, at most `max_concurrency` in flight
+    - Actual request pacing is still done by each appkey's rate limiter (KISClient.credentials),
+      so concurrency fills the TPS budget instead of exceeding it
+    Sync callers use the *_sync façade methods (or keep using KISClient directly).
+    """
+    def __init__(self, kis=None, max_concurrency=None):
+        self.kis = kis or KISClient()
+        self.max_concurrency = max_concurrency or config.KIS_ASYNC_CONCURRENCY
+        # Worker pool size bounds the number of in-flight requests
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="kis-async")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking KISClient method on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    # --- Async API ---
+    async def get_daily_ohlcv(self, code, start_date=None, end_date=None, period_code="D"):
+        return await self._run(self.kis.get_daily_ohlcv, code, start_date=start_date, end_date=end_date, period_code=period_code)
+
+    async def get_current_price(self, code):
+        return await self._run(self.kis.get_current_price, code)
+
+    async def get_balance(self, force_refresh=False):
+        return await self._run(self.kis.get_balance, force_refresh=force_refresh)
+
+    async def check_dangerous_stock(self, code):
+        return await self._run(self.kis.check_dangerous_stock, code)
+
+    async def get_quotes(self, codes, max_age=None):
+        return await self._run(self.kis.get_quotes, codes, max_age=max_age)
+
+    async def fetch_scan_data(self, codes, start_date=None, with_price=True):
+        """
+        Fetch OHLCV (+ current price) for every code concurrently.
+        with_price=False skips the per-code quote (take one get_quotes() snapshot instead).
+        Returns dict: code -> {'df': DataFrame, 'price': dict or None}
+        Codes that fail are logged and omitted.
+        """
+        async def no_price():
+            return None
+
+        async def fetch_one(code):
+            df, curr = await asyncio.gather(
+                self.get_daily_ohlcv(code, start_date=start_date),
+                self.get_current_price(code) if with_price else no_price()
+            )
+            return code, df, curr
+
+        results = await asyncio.gather(*(fetch_one(c) for c in codes), return_exceptions=True)
+
+        data = {}
+        for code, result in zip(codes, results):
+            if isinstance(result, Exception):
+                logging.error(f"[KIS-Async] Scan fetch failed for {code}: {result}")
+                continue
+            _, df, curr = result
+            data[code] = {'df': df, 'price': curr}
+        return data
+
+    async def check_dangerous_stocks(self, codes):
+        """Returns dict: code -> (is_dangerous, reason)"""
+        results = await asyncio.gather(*(self.check_dangerous_stock(c) for c in codes), return_exceptions=True)
+        checked = {}
+        for code, result in zip(codes, results):
+            if isinstance(result, Exception):
+                logging.error(f"[KIS-Async] Danger check failed for {code}: {result}")
+                checked[code] = (True, "Check Error")
+            else:
+                checked[code] = result
+        return checked
+
+    # --- Sync façade ---
+    def fetch_scan_data_sync(self, codes, start_date=None, with_price=True):
+        return asyncio.run(self.fetch_scan_data(codes, start_date=start_date, with_price=with_price))
+
+    def check_dangerous_stocks_sync(self, codes):
+        return asyncio.run(self.check_dangerous_stocks(codes))
@@ -3,7 +3,7 @@ import datetime
 import logging
 import os
 import config
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 MARKET_DB_FILE = "data/stock_analysis.db"
 # User DB path from config, default if not set
@@ -237,20 +237,34 @@ class DBManager:
         return results
 
     # --- User Data DB Methods ---
-    def save_trade_record(self, date: str, code: str, name: str, action: str, price: float, quantity: int, pnl_amt: float = 0.0, pnl_pct: float = 0.0):
+    def save_trade_record(self, date: str, code: str, name: str, action: str, price: float, quantity: int, pnl_amt: float = 0.0, pnl_pct: float = 0.0, replace: bool = False):
+        """
+        One row per (date, code, action).
+        replace=True: an existing row is updated with the given price/quantity (cumulative fills
+        from the execution-notice stream); otherwise it is kept and the call is skipped.
+        """
         try:
             # 중복 체크: 동일 날짜, 종목, 작업이 이미 있는지 확인
             with sqlite3.connect(self.user_db) as conn:
                 cursor = conn.cursor()
+                amount = float(price * quantity)
                 cursor.execute("""
-                    SELECT 1 FROM trade_history 
+                    SELECT id FROM trade_history 
                     WHERE date = ? AND code = ? AND action = ?
                 """, (date, code, action))
-                if cursor.fetchone():
+                existing = cursor.fetchone()
+                if existing and replace:
+                    cursor.execute("""
+                        UPDATE trade_history SET name = ?, price = ?, quantity = ?, amount = ?, pnl_amt = ?, pnl_pct = ?
+                        WHERE id = ?
+                    """, (name, price, quantity, amount, pnl_amt, pnl_pct, existing[0]))
+                    conn.commit()
+                    logging.info(f"[DB] Updated {action} record for {name} ({code}): {quantity} @ {price:,.0f}")
+                    return
+                if existing:
                     logging.info(f"[DB] Trade record already exists for {name} ({code}) {action} on {date}. Skipping.")
                     return
 
-                amount = float(price * quantity)
                 cursor.execute("""
                     INSERT INTO trade_history (date, code, name, action, price, quantity, amount, pnl_amt, pnl_pct)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -260,6 +274,51 @@ class DBManager:
         except Exception as e:
             logging.error(f"[DB] Save Trade Record Error: {e}")
 
+    def save_trade_records(self, records: List[Dict], replace: bool = False) -> Tuple[int, int]:
+        """
+        Batched save_trade_record for backfills: one transaction, executemany.
+        records: dicts with date (YYYY-MM-DD), code, name, action, price, quantity
+        and optional pnl_amt / pnl_pct. Same one-row-per-(date, code, action) rule.
+        Returns (inserted, updated).
+        """
+        if not records:
+            return 0, 0
+        try:
+            with sqlite3.connect(self.user_db) as conn:
+                cursor = conn.cursor()
+                dates = [r['date'] for r in records]
+                cursor.execute("""
+                    SELECT id, date, code, action FROM trade_history
+                    WHERE date BETWEEN ? AND ?
+                """, (min(dates), max(dates)))
+                existing = {(date, code, action): row_id for row_id, date, code, action in cursor.fetchall()}
+
+                inserts, updates = [], []
+                for r in records:
+                    key = (r['date'], r['code'], r['action'])
+                    price, quantity = float(r['price']), int(r['quantity'])
+                    values = (r['name'], price, quantity, price * quantity, float(r.get('pnl_amt', 0.0)), float(r.get('pnl_pct', 0.0)))
+                    if key not in existing:
+                        inserts.append(key[:2] + (values[0], key[2]) + values[1:])
+                        existing[key] = None
+                    elif replace and existing[key] is not None:
+                        updates.append(values + (existing[key],))
+
+                cursor.executemany("""
+                    INSERT INTO trade_history (date, code, name, action, price, quantity, amount, pnl_amt, pnl_pct)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, inserts)
+                cursor.executemany("""
+                    UPDATE trade_history SET name = ?, price = ?, quantity = ?, amount = ?, pnl_amt = ?, pnl_pct = ?
+                    WHERE id = ?
+                """, updates)
+                conn.commit()
+        except Exception as e:
+            logging.error(f"[DB] Save Trade Records Error: {e}")
+            return 0, 0
+        logging.info(f"[DB] Trade records batch: {len(inserts)} inserted, {len(updates)} updated, {len(records) - len(inserts) - len(updates)} skipped")
+        return len(inserts), len(updates)
+
     def get_trade_history(self) -> List[Dict]:
         results = []
         try:
@@ -0,0 +1,276 @@
+import logging
+import threading
+import config
+from src.kis_websocket import KISWebSocket, TR_FILL_NOTICE, TR_FILL_NOTICE_MOCK, split_records, default_ws_url
+from src.utils import get_now_kst
+
+# H0STCNI0 / H0STCNI9 field positions (국내주식 실시간체결통보)
+F_CUST_ID = 0
+F_ORDER_NO = 2
+F_ORIG_ORDER_NO = 3
+F_SIDE = 4          # 01: Sell, 02: Buy
+F_REVISE_CLS = 5    # 0: Order, 1: Revise, 2: Cancel
+F_CODE = 8
+F_FILL_QTY = 9
+F_FILL_PRICE = 10
+F_FILL_TIME = 11
+F_REJECTED = 12     # Y: Rejected
+F_FILLED = 13       # 1: Accepted (order / revise / cancel / reject), 2: Filled
+F_BRANCH_NO = 15
+F_ORDER_QTY = 16
+F_NAME = 18
+F_ORDER_PRICE = 22
+
+
+def _int(value):
+    try:
+        return int(float(value or 0))
+    except ValueError:
+        return 0
+
+
+class FillBook:
+    """
+    Today's orders and fills, keyed by order number.
+    - Seeded from an inquire-daily-ccld snapshot (load_rows), then updated by execution notices
+    - Answers the same questions as the REST polling helpers (filled info, outstanding orders,
+      concluded rows for the close sync) without any API call
+    Cleared on a new KST date.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._date = None
+        self._orders = {}  # order no -> order dict
+
+    def _roll(self):
+        today = get_now_kst().strftime("%Y%m%d")
+        if self._date != today:
+            self._date = today
+            self._orders = {}
+
+    def _order(self, order_no, code="", name="", side="02"):
+        order = self._orders.get(order_no)
+        if order is None:
+            order = self._orders[order_no] = {
+                'odno': order_no, 'orgn_odno': '', 'ord_gno_brno': '', 'pdno': code, 'prdt_name': name,
+                'sll_buy_dvsn_cd': side, 'ord_qty': 0, 'ord_unpr': 0, 'filled_qty': 0, 'filled_amt': 0.0,
+                'cancelled_qty': 0, 'rejected': False,
+            }
+        return order
+
+    # --- Updates ---
+    def load_rows(self, rows):
+        """Replace the book with a REST snapshot (inquire-daily-ccld output1 rows)."""
+        with self._lock:
+            self._roll()
+            self._orders = {}
+            for row in rows:
+                order = self._order(row.get('odno', ''), row.get('pdno', ''), row.get('prdt_name', ''), row.get('sll_buy_dvsn_cd', '02'))
+                order.update(
+                    orgn_odno=row.get('orgn_odno', ''), ord_gno_brno=row.get('ord_gno_brno', ''),
+                    ord_qty=_int(row.get('ord_qty')), ord_unpr=_int(row.get('ord_unpr')),
+                    filled_qty=_int(row.get('tot_ccld_qty')), filled_amt=float(row.get('tot_ccld_amt') or 0),
+                    cancelled_qty=_int(row.get('cncl_cfrm_qty')),
+                )
+
+    def on_notice(self, fields):
+        """
+        Apply one execution notice. Returns (order dict copy, is_fill) or None if ignored.
+        Fill notices carry the quantity of that single execution, not a running total.
+        """
+        if len(fields) <= F_ORDER_QTY:
+            return None
+        with self._lock:
+            self._roll()
+            order_no = fields[F_ORDER_NO]
+            order = self._order(order_no, fields[F_CODE], fields[F_NAME] if len(fields) > F_NAME else "", fields[F_SIDE])
+            if fields[F_FILLED] == '2':
+                qty = _int(fields[F_FILL_QTY])
+                order['filled_qty'] += qty
+                order['filled_amt'] += qty * float(fields[F_FILL_PRICE] or 0)
+                order['ord_qty'] = max(order['ord_qty'], _int(fields[F_ORDER_QTY]), order['filled_qty'])
+                return dict(order), True
+
+            # Acceptance notices
+            order['ord_gno_brno'] = fields[F_BRANCH_NO]
+            order['orgn_odno'] = fields[F_ORIG_ORDER_NO]
+            qty = _int(fields[F_ORDER_QTY])
+            if fields[F_REJECTED] == 'Y':
+                order['rejected'] = True
+            elif fields[F_REVISE_CLS] == '2':
+                # Cancel: the original order's remainder is gone
+                orig = self._orders.get(fields[F_ORIG_ORDER_NO])
+                if orig:
+                    orig['cancelled_qty'] += qty
+                order['ord_qty'] = qty
+                order['cancelled_qty'] = qty
+            else:
+                if fields[F_REVISE_CLS] == '1':
+                    # Revise: the remainder moves to the new order number
+                    orig = self._orders.get(fields[F_ORIG_ORDER_NO])
+                    if orig:
+                        orig['cancelled_qty'] += qty
+                order['ord_qty'] = qty
+                if len(fields) > F_ORDER_PRICE:
+                    order['ord_unpr'] = _int(fields[F_ORDER_PRICE])
+            return dict(order), False
+
+    # --- Queries ---
+    def _remaining(self, order):
+        if order['rejected']:
+            return 0
+        return max(0, order['ord_qty'] - order['filled_qty'] - order['cancelled_qty'])
+
+    def filled_info(self, code, side="buy"):
+        """Same shape as KISClient.get_today_filled_info()."""
+        side_code = "02" if side == "buy" else "01"
+        qty = amt = unfilled = 0
+        with self._lock:
+            self._roll()
+            for order in self._orders.values():
+                if order['pdno'] != code or order['sll_buy_dvsn_cd'] != side_code:
+                    continue
+                qty += order['filled_qty']
+                amt += order['filled_amt']
+                unfilled += self._remaining(order)
+        return {
+            'filled_qty': qty,
+            'avg_price': amt / qty if qty else 0.0,
+            'total_amount': amt,
+            'unfilled_qty': unfilled,
+        }
+
+    def totals(self, code, side_code):
+        """(filled qty, filled amount, name) of today's orders for code/side."""
+        qty, amt, name = 0, 0.0, ""
+        with self._lock:
+            for order in self._orders.values():
+                if order['pdno'] == code and order['sll_buy_dvsn_cd'] == side_code:
+                    qty += order['filled_qty']
+                    amt += order['filled_amt']
+                    name = name or order['prdt_name']
+        return qty, amt, name
+
+    def outstanding(self):
+        """Unfilled orders, same keys as KISClient.get_outstanding_orders()."""
+        result = []
+        with self._lock:
+            self._roll()
+            for order in self._orders.values():
+                remaining = self._remaining(order)
+                if remaining <= 0:
+                    continue
+                result.append({
+                    'odno': order['odno'], 'orgn_odno': order['odno'],
+                    'krx_fwdg_ord_orgno': order['ord_gno_brno'], 'ord_gno_brno': order['ord_gno_brno'],
+                    'pdno': order['pdno'], 'prdt_name': order['prdt_name'],
+                    'sll_buy_dvsn_cd': order['sll_buy_dvsn_cd'],
+                    'ord_unpr': str(order['ord_unpr']),
+                    'ord_qty': str(order['filled_qty'] + remaining), 'ccld_qty': str(order['filled_qty']),
+                })
+        return result
+
+    def ccld_rows(self):
+        """Orders with fills, in inquire-daily-ccld output1 shape (for sync_trades_at_close)."""
+        with self._lock:
+            self._roll()
+            return [{
+                'odno': o['odno'], 'pdno': o['pdno'], 'prdt_name': o['prdt_name'],
+                'sll_buy_dvsn_cd': o['sll_buy_dvsn_cd'], 'ord_qty': str(o['ord_qty']),
+                'tot_ccld_qty': str(o['filled_qty']), 'tot_ccld_amt': str(int(round(o['filled_amt']))),
+            } for o in self._orders.values() if o['filled_qty'] > 0]
+
+
+class FillStream:
+    """
+    Real-time execution notices (H0STCNI0 Real / H0STCNI9 Mock, tr_key = HTS ID).
+    - Keeps a FillBook current within one websocket frame of each fill
+    - Each fill updates TradeManager / trade_history with today's cumulative quantity and average price
+    - On every (re)connect the book is re-seeded from one inquire-daily-ccld call, so notices
+      missed while disconnected are not lost; until then is_live() is False and callers poll REST
+    ws: share an existing KISWebSocket session (e.g. MarketStream.ws); otherwise one is created
+    """
+    def __init__(self, kis, hts_id=None, ws=None, url=None, trade_manager=None, record_path=None):
+        self.kis = kis
+        self.hts_id = hts_id or config.KIS_HTS_ID
+        self.tr_id = TR_FILL_NOTICE_MOCK if kis.is_mock else TR_FILL_NOTICE
+        self.trade_manager = trade_manager
+        self.book = FillBook()
+        self.listeners = []  # callables(order dict), called for every fill
+        self._synced = threading.Event()
+
+        self._owns_ws = ws is None
+        self.ws = ws or KISWebSocket(
+            url or config.KIS_WS_URL or default_ws_url(kis.is_mock),
+            kis.get_approval_key,
+            record_path=record_path
+        )
+        self.ws.add_handler(self.tr_id, self._on_notice)
+        self.ws.on_connect.append(self.resync)
+
+    def start(self):
+        if not self.hts_id:
+            logging.warning("[Fills] KIS_HTS_ID not set. Execution notices disabled (REST polling).")
+            return False
+        if self._owns_ws:
+            self.ws.start()
+        elif self.ws.connected.is_set():
+            # Shared session already up: its on_connect has passed
+            threading.Thread(target=self.resync, name="fill-resync", daemon=True).start()
+        return bool(self.ws.subscribe(self.tr_id, [self.hts_id]))
+
+    def stop(self):
+        if self._owns_ws:
+            self.ws.stop()
+
+    def is_live(self):
+        """Connected and seeded since the last (re)connect: the book can replace REST polling."""
+        return self.ws.connected.is_set() and self._synced.is_set()
+
+    def resync(self):
+        """Re-seed the book from REST (one inquire-daily-ccld call) and push totals to TradeManager."""
+        self._synced.clear()
+        today = get_now_kst().strftime("%Y%m%d")
+        try:
+            rows = self.kis.get_period_trades(today, today, ccld_dvsn="00")
+        except Exception as e:
+            logging.error(f"[Fills] Resync failed: {e}")
+            return
+        self.book.load_rows(rows or [])
+        for code, side_code in {(r.get('pdno'), r.get('sll_buy_dvsn_cd')) for r in rows or [] if _int(r.get('tot_ccld_qty'))}:
+            self._record(code, side_code)
+        self._synced.set()
+        logging.info(f"[Fills] Order book synced ({len(rows or [])} orders today)")
+
+    def _on_notice(self, tr_id, encrypted, count, payload):
+        if encrypted:
+            return
+        for fields in split_records(payload, count):
+            result = self.book.on_notice(fields)
+            if not result:
+                continue
+            order, is_fill = result
+            if not is_fill:
+                continue
+            logging.info(f"[Fills] {order['prdt_name']}({order['pdno']}) {'BUY' if order['sll_buy_dvsn_cd'] == '02' else 'SELL'} "
+                         f"{fields[F_FILL_QTY]}@{fields[F_FILL_PRICE]} (order {order['odno']}: {order['filled_qty']}/{order['ord_qty']})")
+            self._record(order['pdno'], order['sll_buy_dvsn_cd'])
+            for listener in self.listeners:
+                try:
+                    listener(order)
+                except Exception as e:
+                    logging.error(f"[Fills] Listener error: {e}")
+        self.kis.invalidate_balance()
+
+    def _record(self, code, side_code):
+        """Write today's cumulative fill for code/side to TradeManager (and trade_history)."""
+        if not self.trade_manager:
+            return
+        qty, amt, name = self.book.totals(code, side_code)
+        if qty <= 0:
+            return
+        today = get_now_kst().strftime("%Y%m%d")
+        if side_code == '02':
+            self.trade_manager.update_buy(code, name, today, amt / qty, qty, replace=True)
+        else:
+            self.trade_manager.update_sell(code, name, today, amt / qty, qty, 0.0, replace=True)
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+# Universe-wide RSI / SMA over a (date x ticker) close panel.
+# Results are bit-for-bit identical to Strategy.calculate_indicators on each ticker's own
+# DataFrame: the kernels below replay pandas' rolling-mean and ewm(adjust=False) recursions
+# with the same floating-point operations, vectorized across tickers (one loop over dates).
+
+
+def _pack(values, present=None):
+    """
+    Move each column's valid rows to the top, keeping their order.
+    A ticker listed late, suspended or delisted is then computed on exactly the rows its
+    own DataFrame would have. Valid rows are `present` (bool array of the same shape) when
+    given, else the non-NaN cells: without the mask a row whose Close is NaN is dropped,
+    while calculate_indicators keeps it. Returns (packed, order, valid).
+    """
+    valid = ~np.isnan(values) if present is None else np.asarray(present, dtype=bool)
+    order = np.argsort(~valid, axis=0, kind="stable")
+    return np.take_along_axis(values, order, axis=0), order, valid
+
+
+def _unpack(packed, order, valid):
+    out = np.empty_like(packed)
+    np.put_along_axis(out, order, packed, axis=0)
+    out[~valid] = np.nan
+    return out
+
+
+def _rolling_mean(x, window):
+    """pandas Series.rolling(window).mean() per column (Kahan sums, same-value / sign rules)."""
+    T, N = x.shape
+    out = np.full((T, N), np.nan)
+    if T == 0:
+        return out
+    if window == 1:
+        return x.copy()
+
+    nobs = np.zeros(N, dtype=np.int64)
+    neg_ct = np.zeros(N, dtype=np.int64)
+    sum_x = np.zeros(N)
+    comp_add = np.zeros(N)
+    comp_remove = np.zeros(N)
+    same_ct = np.zeros(N, dtype=np.int64)
+    prev = x[0].copy()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for i in range(T):
+            if i >= window:
+                val = x[i - window]
+                obs = ~np.isnan(val)
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = np.where(obs, t - sum_x - y, comp_remove)
+                sum_x = np.where(obs, t, sum_x)
+                nobs -= obs
+                neg_ct -= obs & np.signbit(val)
+
+            val = x[i]
+            obs = ~np.isnan(val)
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = np.where(obs, t - sum_x - y, comp_add)
+            sum_x = np.where(obs, t, sum_x)
+            nobs += obs
+            neg_ct += obs & np.signbit(val)
+            same_ct = np.where(obs, np.where(val == prev, same_ct + 1, 1), same_ct)
+            prev = np.where(obs, val, prev)
+
+            result = sum_x / nobs
+            result = np.where((neg_ct == 0) & (result < 0), 0.0, result)
+            result = np.where((neg_ct == nobs) & (result > 0), 0.0, result)
+            result = np.where(same_ct >= nobs, prev, result)
+            out[i] = np.where((nobs >= window) & (nobs > 0), result, np.nan)
+    return out
+
+
+def _ewm_mean(x, alpha, min_periods):
+    """pandas Series.ewm(alpha=alpha, min_periods=min_periods, adjust=False).mean() per column."""
+    T, N = x.shape
+    out = np.full((T, N), np.nan)
+    if T == 0:
+        return out
+    # pandas converts alpha to a center of mass and back
+    com = (1.0 - alpha) / alpha
+    new_wt = 1.0 / (1.0 + com)
+    old_wt = 1.0 - new_wt
+    min_periods = max(min_periods, 1)
+
+    weighted = x[0].copy()
+    nobs = (~np.isnan(weighted)).astype(np.int64)
+    out[0] = np.where(nobs >= min_periods, weighted, np.nan)
+    for i in range(1, T):
+        cur = x[i]
+        obs = ~np.isnan(cur)
+        nobs += obs
+        seen = ~np.isnan(weighted)
+        blended = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+        weighted = np.where(seen & obs & (weighted != cur), blended, np.where(~seen & obs, cur, weighted))
+        out[i] = np.where(nobs >= min_periods, weighted, np.nan)
+    return out
+
+
+def sma_matrix(close, window, present=None):
+    """Simple moving average of a (dates x tickers) float array, NaN where a ticker has no row."""
+    packed, order, valid = _pack(np.asarray(close, dtype=np.float64), present)
+    return _unpack(_rolling_mean(packed, window), order, valid)
+
+
+def rsi_matrix(close, window, present=None):
+    """Wilder RSI (ewm alpha=1/window) of a (dates x tickers) float array, NaN where a ticker has no row."""
+    packed, order, valid = _pack(np.asarray(close, dtype=np.float64), present)
+    delta = np.full_like(packed, np.nan)
+    delta[1:] = packed[1:] - packed[:-1]
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = -np.where(delta < 0, delta, 0.0)
+
+    avg_gain = _ewm_mean(gain, 1 / window, window)
+    avg_loss = _ewm_mean(loss, 1 / window, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+    return _unpack(rsi, order, valid)
+
+
+def close_panel(frames, date_col="Date", with_present=False):
+    """
+    {code: OHLCV DataFrame} -> Close panel (DataFrame, sorted dates x codes).
+    Dates come from date_col when present, else the index. Missing rows stay NaN.
+    A date repeated within one frame keeps its last row.
+    with_present=True also returns the (dates x codes) bool mask of rows each frame has,
+    for calculate_panel to tell a NaN Close apart from a missing row.
+    """
+    columns = {}
+    for code, df in frames.items():
+        if df is None or df.empty:
+            continue
+        index = pd.Index(df[date_col] if date_col in df.columns else df.index)
+        close = pd.Series(df['Close'].to_numpy(dtype=np.float64), index=index)
+        columns[code] = close[~index.duplicated(keep='last')]
+    if not columns:
+        panel = pd.DataFrame()
+        return (panel, panel.astype(bool)) if with_present else panel
+    panel = pd.DataFrame(columns).sort_index()
+    if not with_present:
+        return panel
+    present = pd.DataFrame({code: pd.Series(True, index=s.index) for code, s in columns.items()})
+    return panel, present.reindex(panel.index).notna()
+
+
+def calculate_panel(close, rsi_window, sma_window, present=None):
+    """
+    Close panel (DataFrame, dates x tickers) -> {'RSI': DataFrame, 'SMA': DataFrame} of the same shape.
+    present: optional bool DataFrame of the rows each ticker has (see close_panel); by default
+    a NaN Close counts as a missing row.
+    """
+    values = close.to_numpy(dtype=np.float64)
+    mask = None
+    if present is not None:
+        mask = present.reindex(index=close.index, columns=close.columns, fill_value=False).to_numpy(dtype=bool)
+    return {
+        'RSI': pd.DataFrame(rsi_matrix(values, rsi_window, mask), index=close.index, columns=close.columns),
+        'SMA': pd.DataFrame(sma_matrix(values, sma_window, mask), index=close.index, columns=close.columns),
+    }
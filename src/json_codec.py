@@ -0,0 +1,44 @@
+import json
+import requests
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json fallback
+    orjson = None
+
+# Active backend name (logged by the benchmark / startup)
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data):
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Encode obj as compact UTF-8 JSON bytes (request bodies)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def install(res):
+    """
+    Make res.json() decode with the fast codec, once: later calls return the same object,
+    so _send_request's error check and the caller share one decode.
+    Anything that is not a requests.Response (e.g. a test double) is left untouched.
+    Decode errors are ValueError subclasses for both backends, like requests' own.
+    """
+    if not isinstance(res, requests.Response):
+        return res
+    cache = []
+
+    def decode(**kwargs):
+        if not cache:
+            cache.append(loads(res.content))
+        return cache[0]
+
+    res.json = decode
+    return res
@@ -1,17 +1,48 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
-import os
 import logging
+import threading
+import copy
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import pytz
 from datetime import datetime, timedelta
 import config
+from src.kis_credentials import build_pool
+from src.resilience import Backoff, CircuitBreaker
+from src.kis_metrics import KISMetrics
+import src.json_codec as json_codec
+from src.ohlcv_store import OHLCVStore
+from src.quote_cache import QuoteCache
+from src.trading_calendar import TradingCalendar
+from src.stock_status_cache import StockStatusCache, evaluate_status, is_managed
+from src.ohlcv_parser import parse_chart_rows, merge_pages, to_frame
+
+# Max codes per multi-symbol quote request (FHKST11300006)
+MULTI_QUOTE_BATCH = 30
+
+# Daily chart (FHKST03010100) page limit and the calendar-day window that always fits in one page:
+# 140 days = exactly 20 weeks = 100 weekdays, so a window is a full page less that stretch's holidays
+OHLCV_PAGE_SIZE = 100
+OHLCV_WINDOW_DAYS = 140
+
+# inquire-daily-ccld: TTTC8001R serves the last 3 months, CTSC9115R anything older
+PERIOD_TRADES_RECENT_DAYS = 90
 
 # Configure logging
 # Configure logging
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def period_trades_cutoff():
+    """First date (YYYYMMDD) still served by the recent inquire-daily-ccld TR."""
+    tz_kst = pytz.timezone('Asia/Seoul')
+    today = datetime.now(pytz.utc).astimezone(tz_kst)
+    return (today - timedelta(days=PERIOD_TRADES_RECENT_DAYS)).strftime("%Y%m%d")
+
+
 class KISClient:
     def __init__(self):
         self.app_key = config.KIS_APP_KEY
@@ -58,153 +89,288 @@ class KISClient:
         self.account_no = config.KIS_CANO
         self.base_url = config.KIS_URL_BASE
         
-        self.access_token = None
-        self.token_expired_at = 0
+        # Pooled keep-alive session (reuses TCP/TLS connections across all KIS calls)
+        self.session = self._create_session()
         
         # Check if Mock Trading (Virtual)
         self.is_mock = "openapivts" in self.base_url
         if self.is_mock:
             logging.info(f"[KIS] Running in Mock Investment Mode (openapivts detected)")
         
+        # Appkeys with their own token + TPS limiter (Real/Mock budgets, per endpoint class).
+        # Orders/account use the account's key; quotes/history round-robin over all keys.
+        self.credentials = build_pool(self.app_key, self.app_secret, config.KIS_MARKET_DATA_KEYS, is_mock=self.is_mock)
+        self.rate_limiter = self.credentials.primary.rate_limiter
+        # Retry backoff + per-endpoint circuit breakers (see _send_request)
+        self.backoff = Backoff(base=config.KIS_BACKOFF_BASE, cap=config.KIS_BACKOFF_CAP)
+        self._breakers = {}
+        self._breaker_lock = threading.Lock()
+        # Per-TR_ID call statistics (dumped per scheduled job, see src.kis_metrics)
+        self.metrics = KISMetrics()
+        
+        # Columnar OHLCV cache shared with the dashboard (data/ohlcv/ohlcv.arrow)
+        self.ohlcv_store = OHLCVStore()
+        # Today's in-progress candle per code (never persisted)
+        self._live_bars = {}
+        # Write-through buffered inside ohlcv_batch(): code -> (closed bars, synced YYYYMMDD, bars changed)
+        self._ohlcv_pending = None
+        self._ohlcv_pending_lock = threading.Lock()
+        
+        # Short-TTL quote snapshots (get_current_price / get_quotes)
+        self.quote_cache = QuoteCache(ttl=config.KIS_QUOTE_TTL)
+        # Real-time quote book (src.market_stream.MarketStream), attached by the caller
+        self.market_stream = None
+        self._approval_key = None
+        # Real-time execution notices (src.fill_stream.FillStream), attached by the caller
+        self.fill_stream = None
+        
+        # Short-TTL balance snapshot (invalidated on order / revise-cancel / fill sync)
+        self._balance_cache = None  # (monotonic ts, balance dict)
+        self._balance_lock = threading.Lock()
+        
+        # Per-day stock status (warning / managed) cache (data/stock_status.json)
+        self.status_cache = StockStatusCache()
+        
+        # Persisted KRX calendar (is_trading_day, holding days). Mock server has no calendar API.
+        self.calendar = TradingCalendar(fetcher=None if self.is_mock else self.fetch_holidays)
+        
         if not self.app_key or not self.app_secret:
             logging.warning("[KIS] Warning: API credentials not found in config.")
 
-    def _get_headers(self, tr_id, data=None):
-        """Construct headers for API requests."""
-        if self.access_token is None or time.time() > self.token_expired_at:
-            self.get_access_token()
+    def _create_session(self):
+        """
+        Build a requests.Session with a per-host connection pool.
+        Every KIS call goes through this session so the TCP/TLS handshake
+        to openapi.koreainvestment.com is paid once per pooled connection
+        instead of once per request.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.KIS_HTTP_POOL_CONNECTIONS, # Number of hosts kept in the pool
+            pool_maxsize=config.KIS_HTTP_POOL_SIZE,            # Keep-alive connections per host
+            max_retries=0                                      # Retries are handled in _send_request
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+
+    def close(self):
+        """Release pooled connections."""
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+    @property
+    def access_token(self):
+        return self.credentials.primary.access_token
+
+    @property
+    def token_expired_at(self):
+        return self.credentials.primary.token_expired_at
+
+    def _get_headers(self, tr_id, data=None, credential=None):
+        """Construct headers for API requests (credential: appkey to sign with, default the account's)."""
+        cred = credential or self.credentials.primary
+        if not cred.is_valid():
+            with cred.lock:
+                # Re-check: another thread may have refreshed while we waited
+                if not cred.is_valid():
+                    cred.fetch_token(self.session, self.base_url)
             
         headers = {
             "content-type": "application/json; charset=utf-8",
-            "authorization": f"Bearer {self.access_token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
+            "authorization": f"Bearer {cred.access_token}",
+            "appkey": cred.app_key,
+            "appsecret": cred.app_secret,
             "tr_id": tr_id
         }
         return headers
 
-    def _save_token(self):
-        """Save token to file."""
-        data = {
-            'access_token': self.access_token,
-            'token_expired_at': self.token_expired_at
-        }
-        try:
-            with open('token.json', 'w') as f:
-                json.dump(data, f)
-        except Exception as e:
-            logging.error(f"[KIS] Failed to save token: {e}")
+    def _breaker(self, path):
+        """Circuit breaker for one endpoint (created on first use)."""
+        with self._breaker_lock:
+            breaker = self._breakers.get(path)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    path, failure_threshold=config.KIS_CB_FAILURE_THRESHOLD, reset_timeout=config.KIS_CB_RESET_SECONDS
+                )
+                self._breakers[path] = breaker
+            return breaker
 
-    def _load_token(self):
-        """Load token from file."""
-        try:
-            with open('token.json', 'r') as f:
-                data = json.load(f)
-                if time.time() < data['token_expired_at']:
-                    self.access_token = data['access_token']
-                    self.token_expired_at = data['token_expired_at']
-                    logging.info(f"[KIS] Loaded cached Access Token (Expires in {int(self.token_expired_at - time.time())}s)")
-                    return True
-        except:
-            pass
-        return False
-
-    def _send_request(self, method, path, tr_id, params=None, body=None):
+    def _send_request(self, method, path, tr_id, params=None, body=None, tr_cont=""):
         """
-        Refactored Request Handler with Auto Token Refresh and Rate Limit Handling
+        Request Handler with Auto Token Refresh and Rate Limit Handling.
+        tr_cont: "N" to request the next page of a continued inquiry (CTX_AREA keys in params)
+        - EGW00201 / TPS messages: lower the limiter's shared TPS, retry after jittered backoff
+        - 5xx / network errors: jittered backoff, counted by the endpoint's circuit breaker
+        - POST (orders) are not idempotent: only retried on an explicit rate-limit or
+          token-expiry rejection, never after a 5xx or a possibly-delivered request
+        Every attempt is recorded in self.metrics (latency, status, retries, limiter wait).
+        Bodies are encoded and responses decoded with src.json_codec (orjson when installed).
+        Returns the last Response, or None if nothing was received (or the circuit is open).
         """
         url = f"{self.base_url}{path}"
+        breaker = self._breaker(path)
+        idempotent = method == "GET"
+        # Market data may go to any appkey; orders/account stay on the account's key
+        cred = self.credentials.for_tr_id(tr_id)
         
         # Max retries for rate limits or server errors
-        max_retries = 5
+        max_retries = config.KIS_MAX_RETRIES
+        res = None
         
         for attempt in range(max_retries):
-            headers = self._get_headers(tr_id)
+            if attempt:
+                self.metrics.record_retry(tr_id)
+            if not breaker.allow():
+                self.metrics.record_circuit_open(tr_id)
+                logging.error(f"[KIS] Circuit open for {path}. Skipping request ({tr_id}).")
+                return None
+            
+            headers = self._get_headers(tr_id, credential=cred)
+            if tr_cont:
+                headers["tr_cont"] = tr_cont
             res = None
+            # Block only as long as the appkey's TPS budget requires
+            self.metrics.record_wait(tr_id, cred.rate_limiter.acquire(tr_id))
+            started = time.perf_counter()
             try:
                 if method == "GET":
-                    res = requests.get(url, headers=headers, params=params, timeout=10)
+                    res = self.session.get(url, headers=headers, params=params, timeout=10)
                 else:
-                    res = requests.post(url, headers=headers, data=json.dumps(body) if body else None, timeout=10)
-                
-                # Check JSON for specific error codes
-                is_expired = False
-                is_ratelimit = False
-                msg = ""
-                try:
-                    data = res.json()
-                    msg_cd = data.get('msg_cd', '')
-                    msg = data.get('msg1', '')
-                    if msg_cd == 'EGW00123':
-                        is_expired = True
-                    elif msg_cd == 'EGW00201' or "초과" in msg:
-                        is_ratelimit = True
-                except:
-                    pass
-                
-                # 1. Handle Token Expiry
-                if is_expired:
-                    logging.warning("[KIS] Token Expired (EGW00123). Refreshing and retrying...")
-                    self.access_token = None
-                    if os.path.exists('token.json'):
-                        os.remove('token.json')
-                    self.get_access_token()
-                    continue
-                
-                # 2. Handle Rate Limit
-                if is_ratelimit or res.status_code == 500:
-                    wait_time = 1.0 if self.is_mock else 0.5
-                    logging.warning(f"[KIS] Rate Limit or Server Error ({res.status_code}). Waiting {wait_time}s... (Attempt {attempt+1}/{max_retries})")
-                    time.sleep(wait_time)
-                    continue
-                
-                return res
-            
-            except Exception as e:
+                    res = self.session.post(url, headers=headers, data=json_codec.dumps(body) if body else None, timeout=10)
+            except requests.exceptions.ConnectTimeout as e:
+                self.metrics.record_call(tr_id, (time.perf_counter() - started) * 1000, "EXC", error=True)
+                # Never reached the server: safe to retry for every method
+                breaker.record_failure()
+                logging.error(f"[KIS] Connect Timeout: {e}")
+                time.sleep(self.backoff.delay(attempt))
+                continue
+            except requests.exceptions.RequestException as e:
+                self.metrics.record_call(tr_id, (time.perf_counter() - started) * 1000, "EXC", error=True)
+                breaker.record_failure()
                 logging.error(f"[KIS] Request Exception: {e}")
-                time.sleep(1)
+                if not idempotent:
+                    # The order may have been delivered; let the caller reconcile
+                    return None
+                time.sleep(self.backoff.delay(attempt))
+                continue
+            
+            # Decode once with the fast codec; callers' res.json() reuses the result
+            json_codec.install(res)
+            # Check JSON for specific error codes
+            is_expired = False
+            is_ratelimit = False
+            try:
+                data = res.json()
+                msg_cd = data.get('msg_cd', '')
+                msg = data.get('msg1', '')
+                if msg_cd == 'EGW00123':
+                    is_expired = True
+                elif msg_cd == 'EGW00201' or "초당 거래건수" in msg:
+                    # Only the TPS message: order rejections such as "주문가능수량을 초과" are final
+                    is_ratelimit = True
+            except ValueError:
+                pass
+            self.metrics.record_call(
+                tr_id, (time.perf_counter() - started) * 1000, res.status_code,
+                error=is_expired or is_ratelimit or res.status_code >= 400
+            )
+            
+            # 1. Handle Token Expiry
+            if is_expired:
+                logging.warning("[KIS] Token Expired (EGW00123). Refreshing and retrying...")
+                with cred.lock:
+                    # Refresh only once even if several threads (or processes) hit the expired token
+                    if headers['authorization'] == f"Bearer {cred.access_token}":
+                        cred.fetch_token(self.session, self.base_url, rejected_token=cred.access_token)
+                continue
+            
+            # 2. Handle Rate Limit (rejected before processing -> safe to retry orders too)
+            # Mock server often answers 500 instead of EGW00201 when over its budget
+            if is_ratelimit or (self.is_mock and res.status_code == 500 and idempotent):
+                cred.rate_limiter.on_rate_limited()
+                self.metrics.record_rate_limited(tr_id)
+                wait_time = self.backoff.delay(attempt)
+                logging.warning(f"[KIS] Rate Limit ({tr_id}). Waiting {wait_time:.2f}s... (Attempt {attempt+1}/{max_retries})")
+                time.sleep(wait_time)
+                continue
+            
+            # 3. Handle Server Error
+            if res.status_code >= 500:
+                breaker.record_failure()
+                if not idempotent:
+                    return res
+                wait_time = self.backoff.delay(attempt)
+                logging.warning(f"[KIS] Server Error {res.status_code} ({tr_id}). Waiting {wait_time:.2f}s... (Attempt {attempt+1}/{max_retries})")
+                time.sleep(wait_time)
                 continue
+            
+            breaker.record_success()
+            cred.rate_limiter.on_success()
+            return res
                 
         return res
 
     def get_access_token(self):
-        """Get or refresh OAuth access token."""
-        # Try loading from file first
-        if self._load_token():
-            return
+        """Get or refresh the account appkey's OAuth access token."""
+        with self.credentials.primary.lock:
+            self.credentials.primary.fetch_token(self.session, self.base_url)
 
-        url = f"{self.base_url}/oauth2/tokenP"
+    def get_approval_key(self):
+        """Websocket approval key (POST /oauth2/Approval). Cached for the client's lifetime."""
+        if self._approval_key:
+            return self._approval_key
+        url = f"{self.base_url}/oauth2/Approval"
         headers = {"content-type": "application/json"}
         body = {
             "grant_type": "client_credentials",
             "appkey": self.app_key,
-            "appsecret": self.app_secret
+            "secretkey": self.app_secret
         }
-        
-        try:
-            res = requests.post(url, headers=headers, data=json.dumps(body), timeout=10)
-            data = res.json()
-            if 'access_token' in data:
-                self.access_token = data['access_token']
-                # Token usually valid for 24h
-                self.token_expired_at = time.time() + data.get('expires_in', 86400) - 60
-                logging.info("[KIS] Access Token refreshed.")
-                self._save_token()
-            else:
-                logging.error(f"[KIS] Token Error: {data}")
-                raise Exception("Failed to get Access Token")
-        except Exception as e:
-            logging.error(f"[KIS] Auth Exception: {e}")
-            raise
+        res = self.session.post(url, headers=headers, data=json.dumps(body), timeout=10)
+        data = res.json()
+        if 'approval_key' not in data:
+            logging.error(f"[KIS] Approval Key Error: {data}")
+            raise Exception("Failed to get Websocket Approval Key")
+        self._approval_key = data['approval_key']
+        return self._approval_key
 
-    def get_current_price(self, code):
+    def attach_market_stream(self, stream):
+        """Serve quotes from a MarketStream's book while its ticks are fresh."""
+        self.market_stream = stream
+
+    def attach_fill_stream(self, stream):
+        """Serve fill / outstanding-order queries from a FillStream while it is live."""
+        self.fill_stream = stream
+
+    def _stream_quote(self, code):
+        if self.market_stream is None:
+            return None
+        return self.market_stream.get_quote(code)
+
+    def get_current_price(self, code, use_cache=True, use_stream=True):
         """
         Fetch current price details.
         Also used to check 'Admin Issue' status from output fields if available,
         though fetching 'master' info is more reliable for status.
         Here we use standard price query.
         TR_ID: FHKST01010100 (Stock Current Price)
+        use_cache: return a full inquire-price snapshot younger than KIS_QUOTE_TTL if present
+        use_stream: return the streamed quote if fresh (price/volume fields only, no status codes)
         """
+        if use_stream:
+            streamed = self._stream_quote(code)
+            if streamed:
+                return streamed
+        
+        if use_cache:
+            cached = self.quote_cache.get(code, full_only=True)
+            if cached:
+                return cached
+        
         path = "/uapi/domestic-stock/v1/quotations/inquire-price"
         
         params = {
@@ -213,51 +379,154 @@ class KISClient:
         }
         
         
-        for attempt in range(5):
-            res = self._send_request("GET", path, "FHKST01010100", params=params)
-            
-            if res:
-                if res.status_code == 200:
-                    data = res.json()
-                    if data['rt_cd'] == '0':
-                        return data['output']
-                    else:
-                        # Check for Rate Limit (EGW00201 or similar msg)
-                        msg = data.get('msg1', '')
-                        code_err = data.get('msg_cd', '')
-                        if "초과" in msg or code_err == "EGW00201":
-                            logging.warning(f"[KIS] Rate Limit (GetPrice) -> Sleeping 0.5s... ({attempt+1}/5)")
-                            time.sleep(0.5)
-                            continue
-                        
-                        logging.warning(f"[KIS] GetPrice Error {code}: {msg}")
-                        return None
-                elif res.status_code == 500: # Sometimes Mock throws 500 on rate limit
-                     logging.warning(f"[KIS] Server Error 500 (GetPrice) -> Sleeping 1s... ({attempt+1}/5)")
-                     time.sleep(1)
-                     continue
-
-            time.sleep(0.1) # Default short wait between retries if net error
+        # Rate-limit / 5xx retries (with backoff) are handled by _send_request
+        res = self._send_request("GET", path, "FHKST01010100", params=params)
+        if res is not None and res.status_code == 200:
+            data = res.json()
+            if data['rt_cd'] == '0':
+                self.quote_cache.put(code, data['output'], full=True)
+                return data['output']
+            logging.warning(f"[KIS] GetPrice Error {code}: {data.get('msg1', '')}")
+            return None
             
         logging.error(f"[KIS] Failed to get price for {code} after retries.")
         return None
 
-    def get_daily_ohlcv(self, code, start_date=None, end_date=None, period_code="D"):
+    def get_quotes(self, codes, max_age=None):
+        """
+        Batched quote snapshot for many codes.
+        0. Fresh real-time quotes from the attached MarketStream
+        1. Fresh entries from the quote cache (TTL: KIS_QUOTE_TTL)
+        2. Multi-symbol TR (FHKST11300006, up to 30 codes per call, Real only)
+        3. Fallback: concurrent single inquire-price calls (paced by the rate limiter)
+        Returns dict: code -> inquire-price style dict (stck_prpr, stck_oprc, stck_hgpr, stck_lwpr, acml_vol, ...)
+        Codes that could not be fetched are omitted.
+        """
+        quotes = {}
+        missing = []
+        for code in dict.fromkeys(codes):
+            cached = self._stream_quote(code) or self.quote_cache.get(code, max_age=max_age)
+            if cached:
+                quotes[code] = cached
+            else:
+                missing.append(code)
+        
+        # Multi-symbol TR is not supported on the Mock server
+        if missing and config.KIS_MULTI_QUOTE_ENABLED and not self.is_mock:
+            for i in range(0, len(missing), MULTI_QUOTE_BATCH):
+                quotes.update(self._get_multi_quotes(missing[i:i + MULTI_QUOTE_BATCH]))
+            missing = [c for c in missing if c not in quotes]
+        
+        if missing:
+            workers = min(config.KIS_ASYNC_CONCURRENCY, len(missing))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis-quote") as pool:
+                for code, data in zip(missing, pool.map(lambda c: self.get_current_price(c, use_cache=False, use_stream=False), missing)):
+                    if data:
+                        quotes[code] = data
+        
+        return quotes
+
+    def _get_multi_quotes(self, codes):
+        """
+        Multi-symbol current price (관심종목 멀티종목 시세조회).
+        TR_ID: FHKST11300006, max 30 codes per request.
+        Output is normalized to inquire-price field names and cached as partial snapshots.
+        """
+        path = "/uapi/domestic-stock/v1/quotations/intstock-multprice"
+        params = {}
+        for i, code in enumerate(codes, start=1):
+            params[f"FID_COND_MRKT_DIV_CODE_{i}"] = "J"
+            params[f"FID_INPUT_ISCD_{i}"] = code
+        
+        quotes = {}
+        try:
+            res = self._send_request("GET", path, "FHKST11300006", params=params)
+            if res is None or res.status_code != 200:
+                return quotes
+            data = res.json()
+            if data.get('rt_cd') != '0':
+                logging.warning(f"[KIS] Multi Quote Error: {data.get('msg1')}")
+                return quotes
+            for item in data.get('output', []):
+                code = item.get('inter_shrn_iscd')
+                if not code or code not in codes:
+                    continue
+                quote = {
+                    'stck_shrn_iscd': code,
+                    'hts_kor_isnm': item.get('inter_kor_isnm', ''),
+                    'stck_prpr': item.get('inter2_prpr', '0'),
+                    'stck_oprc': item.get('inter2_oprc', '0'),
+                    'stck_hgpr': item.get('inter2_hgpr', '0'),
+                    'stck_lwpr': item.get('inter2_lwpr', '0'),
+                    'stck_sdpr': item.get('inter2_sdpr', '0'),
+                    'stck_prdy_clpr': item.get('inter2_prdy_clpr', '0'),
+                    'prdy_ctrt': item.get('prdy_ctrt', '0'),
+                    'acml_vol': item.get('acml_vol', '0'),
+                }
+                if float(quote['stck_prpr'] or 0) <= 0:
+                    continue
+                self.quote_cache.put(code, quote, full=False)
+                quotes[code] = quote
+        except Exception as e:
+            logging.error(f"[KIS] Multi Quote Exception: {e}")
+        return quotes
+
+    def get_daily_ohlcv(self, code, start_date=None, end_date=None, period_code="D", parallel=None, as_arrays=False,
+                        strict=False):
         """
         Fetch daily OHLCV for chart/strategy.
-        TR_ID: FHKST01010400 (Daily Price)
+        TR_ID: FHKST03010100 (Daily Item Chart Price, max 100 bars per call)
+        parallel: split [start, end] into page-sized date windows and fetch them concurrently
+                  (default: config.KIS_OHLCV_PARALLEL). Daily period only.
+        as_arrays: return OHLCVArrays (int32 dates, float64 prices, int64 volume) instead of a DataFrame
+        strict: raise instead of logging when a page fails, so callers can tell an API error
+                from a range with no bars
         """
         # Switching to CHART API for longer history (needed for SMA 100)
-        # TR_ID: FHKST03010100
-        path = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
-        url = f"{self.base_url}{path}"
-        headers = self._get_headers("FHKST03010100")
-        
         # Calculate start/end dates
         target_start_date = start_date if start_date else "20230101"
         current_end_date = end_date if end_date else datetime.now().strftime("%Y%m%d")
         
-        all_dfs = []
+        if parallel is None:
+            parallel = config.KIS_OHLCV_PARALLEL
+        
+        windows = self._ohlcv_windows(target_start_date, current_end_date) if parallel and period_code == "D" else []
+        if len(windows) > 1:
+            workers = min(config.KIS_ASYNC_CONCURRENCY, len(windows))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis-ohlcv") as pool:
+                chunks = pool.map(lambda w: self._fetch_ohlcv_window(code, w[0], w[1], period_code, strict), windows)
+                pages = [page for chunk in chunks for page in chunk]
+        else:
+            pages = self._fetch_ohlcv_window(code, target_start_date, current_end_date, period_code, strict)
+        
+        # Pages are merged as arrays; a DataFrame is built once at the end (or never)
+        arrays = merge_pages(pages)
+        return arrays if as_arrays else to_frame(arrays)
+
+    @staticmethod
+    def _ohlcv_windows(start_date, end_date):
+        """
+        Split [start_date, end_date] (YYYYMMDD) into windows that fit in one chart page.
+        OHLCV_WINDOW_DAYS calendar days never hold more than 100 trading days, and hold
+        close to 100 so parallel paging costs about as many calls as serial paging.
+        Newest window first.
+        """
+        start_dt = datetime.strptime(start_date, "%Y%m%d")
+        window_end = datetime.strptime(end_date, "%Y%m%d")
+        windows = []
+        while window_end >= start_dt:
+            window_start = max(start_dt, window_end - timedelta(days=OHLCV_WINDOW_DAYS - 1))
+            windows.append((window_start.strftime("%Y%m%d"), window_end.strftime("%Y%m%d")))
+            window_end = window_start - timedelta(days=1)
+        return windows
+
+    def _fetch_ohlcv_window(self, code, target_start_date, current_end_date, period_code="D", strict=False):
+        """
+        Page backwards through one date range. Returns a list of OHLCVArrays pages.
+        A window sized by _ohlcv_windows completes in a single call.
+        """
+        path = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+        pages = []
         
         while True:
             params = {
@@ -269,42 +538,31 @@ class KISClient:
                 "FID_ORG_ADJ_PRC": "1" # Adjusted Price
             }
             
-            # Rate limit buffer inside loop (essential)
-            # Mock server needs longer delay to avoid 500 errors
-            delay = 0.5 if self.is_mock else 0.1
-            time.sleep(delay) 
-            
+            # Pagination is paced by the central rate limiter (Mock budget is lower)
             res = self._send_request("GET", path, "FHKST03010100", params=params)
-            if res.status_code == 200:
+            if res is not None and res.status_code == 200:
                 data = res.json()
+                if data.get('rt_cd') != '0' and strict:
+                    raise Exception(f"[KIS] OHLCV Error ({code}): {data.get('msg1')}")
                 if data['rt_cd'] == '0' and data['output2']:
-                    chunk_df = pd.DataFrame(data['output2'])
-                    
-                    # Clean up columns for this chunk
-                    chunk_df = chunk_df.rename(columns={
-                        'stck_bsop_date': 'Date',
-                        'stck_oprc': 'Open',
-                        'stck_hgpr': 'High',
-                        'stck_lwpr': 'Low',
-                        'stck_clpr': 'Close',
-                        'acml_vol': 'Volume'
-                    })
-                    chunk_df = chunk_df[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
-                    
-                    # Store chunk
-                    all_dfs.append(chunk_df)
+                    # Typed arrays straight from the JSON rows (blank placeholder rows are dropped)
+                    page = parse_chart_rows(data['output2'])
+                    pages.append(page)
                     
                     # Update end_date for next iteration
                     # output2 is usually sorted desc by date, so first item is latest, last item is oldest in this chunk
                     # But reliable way is to check min date in this chunk
-                    dates = chunk_df['Date'].tolist()
-                    if not dates: break
+                    dates = page.date
+                    if len(dates) == 0: break
                     
-                    min_date_str = min(dates) # "YYYYMMDD"
+                    min_date_str = str(dates.min()) # "YYYYMMDD"
                     
                     # Check if we reached target start
                     if min_date_str <= target_start_date:
                         break
+                    # A partial page means the range is exhausted
+                    if len(dates) < OHLCV_PAGE_SIZE:
+                        break
                         
                     # Calculate new end_date = min_date - 1 day
                     min_date_dt = datetime.strptime(min_date_str, "%Y%m%d")
@@ -318,63 +576,61 @@ class KISClient:
                     # No more data or error
                     break
             else:
-                logging.error(f"[KIS] Network Error in OHLCV loop: {res.status_code}")
+                status = res.status_code if res is not None else "None"
+                if strict:
+                    raise Exception(f"[KIS] Network Error in OHLCV loop ({code}): {status}")
+                logging.error(f"[KIS] Network Error in OHLCV loop: {status}")
                 break
-                
-        if all_dfs:
-            df = pd.concat(all_dfs)
-            # Drop duplicates just in case overlap
-            df = df.drop_duplicates(subset=['Date'])
-            
-            # Convert types
-            cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-            df[cols] = df[cols].apply(pd.to_numeric)
-            df['Date'] = pd.to_datetime(df['Date'])
-            
-            # Filter solely within range (API might return a bit outside boundary depending on logic)
-            # Actually, let's trust the logic but just sort.
-            df = df.sort_values('Date') # Ascending
-            
-            return df
-        return pd.DataFrame()
+        return pages
 
-    def get_ohlcv_cached(self, code, start_date=None, end_date=None):
+    def get_ohlcv_cached(self, code, start_date=None, end_date=None, cached=None):
         """
         Fetch OHLCV using local cache + Gap Filling + Real-time Update.
-        1. Load data/ohlcv/{code}.pkl
-        2. If gap exists between cache and today, fetch missing days via API.
-        3. Append/Update today's real-time price.
-        4. (Optional) Save updated history to cache if gap was large? (Skipping save to avoid partial corruption, in-memory only)
+        1. Load the symbol from the OHLCV store (memory-mapped, zero-copy slice)
+           or use `cached` when the caller already read it (get_ohlcv_cached_many)
+        2. If gap exists between cache and today, fetch missing days via API (once per day per symbol).
+        3. Write-through: closed bars (before today) from the gap fill are persisted to the store.
+        4. Today's live candle is kept separately in memory and merged with the real-time price.
         """
-        cache_dir = "data/ohlcv"
-        cache_path = os.path.join(cache_dir, f"{code}.pkl")
+        df = pd.DataFrame() if cached is None else cached
+        pending = self._pending_ohlcv(code)
         
-        df = pd.DataFrame()
-        
-        # 1. Load Cache
-        if os.path.exists(cache_path):
+        # 1. Load Cache (bars buffered by an open ohlcv_batch() are newer than the store)
+        if pending is not None:
+            df = pending[0].copy()
+        elif cached is None:
             try:
-                df = pd.read_pickle(cache_path)
-            except Exception:
-                pass
+                df = self.ohlcv_store.load(code)
+            except Exception as e:
+                logging.warning(f"[KIS] OHLCV store read failed for {code}: {e}")
 
         today = datetime.now()
         today_str = today.strftime("%Y%m%d")
+        today_dt = pd.to_datetime(today_str)
+        fetched = pd.DataFrame()
         
         # 2. Check Cache & Fill Gap
+        # An API error leaves the symbol unsynced (retried on the next call);
+        # a successful fetch with no new closed bars still counts as today's sync
         if df.empty:
             # Full Fetch
-            df = self.get_daily_ohlcv(code, start_date=start_date, end_date=end_date)
-            # If we fetched everything, we might as well save it if it's substantial history?
-            # For now, keep inconsistent-save policy from before to be safe.
+            try:
+                fetched = self.get_daily_ohlcv(code, start_date=start_date, end_date=end_date, strict=True)
+            except Exception as e:
+                logging.warning(f"[KIS] OHLCV fetch failed for {code}: {e}")
+            else:
+                df = fetched[fetched['Date'] < today_dt] if not fetched.empty else fetched
+                # Persist only when it is the default full history (a short window must not become the cache)
+                if start_date is None and end_date is None:
+                    self._persist_closed_bars(code, df, today_str)
         else:
             # Has cache. Check last date.
             last_dt = df.iloc[-1]['Date']
             last_date_str = last_dt.strftime("%Y%m%d")
             
-            # If last date is earlier than today, we might have a gap.
-            # Even if it is yesterday, we might want to ensure we have up to today.
-            if last_date_str < today_str:
+            # Gap check against the API runs once per day per symbol (synced marker in the store)
+            synced = pending[1] if pending is not None else self.ohlcv_store.synced_date(code)
+            if last_date_str < today_str and synced != today_str:
                 # Calculate start_fetch_date = last_date + 1 day
                 next_day = last_dt + timedelta(days=1)
                 fetch_start = next_day.strftime("%Y%m%d")
@@ -382,16 +638,32 @@ class KISClient:
                 if fetch_start <= today_str:
                     # Fetch from fetch_start to today
                     # logging.info(f"[KIS] Filling gap for {code}: {fetch_start} ~ {today_str}")
-                    gap_df = self.get_daily_ohlcv(code, start_date=fetch_start, end_date=today_str)
-                    
-                    if not gap_df.empty:
-                        # Append
-                        df = pd.concat([df, gap_df]).drop_duplicates(subset=['Date'], keep='last')
-                        df = df.sort_values('Date').reset_index(drop=True)
+                    try:
+                        fetched = self.get_daily_ohlcv(code, start_date=fetch_start, end_date=today_str, strict=True)
+                    except Exception as e:
+                        logging.warning(f"[KIS] OHLCV gap fill failed for {code}: {e}")
+                    else:
+                        closed = fetched[fetched['Date'] < today_dt] if not fetched.empty else fetched
+                        if not closed.empty:
+                            # Append closed bars
+                            df = pd.concat([df, closed]).drop_duplicates(subset=['Date'], keep='last')
+                            df = df.sort_values('Date').reset_index(drop=True)
+                        # No new closed bars: only the synced marker is written
+                        self._persist_closed_bars(code, df, today_str, changed=not closed.empty)
+
+        # Today's candle from the chart API is live (not persisted) -> keep it separate
+        if not fetched.empty:
+            live = fetched[fetched['Date'] == today_dt]
+            if not live.empty:
+                self._live_bars[code] = live.iloc[-1].to_dict()
+        live_bar = self._live_bars.get(code)
+        if live_bar is not None and live_bar['Date'] == today_dt:
+            df = pd.concat([df, pd.DataFrame([live_bar])], ignore_index=True)
 
         # 3. Force Update Today's Candle with Real-Time Current Price
         # (Chart API might be delayed or have different values than current price API)
-        curr = self.get_current_price(code)
+        # get_quotes serves the streamed tick or a prefetched snapshot when fresh
+        curr = self.get_quotes([code]).get(code)
         if curr:
             curr_price = float(curr['stck_prpr'])
             try:
@@ -421,64 +693,205 @@ class KISClient:
             except Exception as e:
                  logging.warning(f"[KIS] Failed to merge real-time price: {e}")
 
+        # Remember the updated live candle (in memory only)
+        if not df.empty and df.iloc[-1]['Date'] == today_dt:
+            self._live_bars[code] = df.iloc[-1].to_dict()
+
         # Filter by start_date if needed
         if start_date and not df.empty:
             df = df[df['Date'] >= pd.to_datetime(start_date)]
             
         return df
 
-    def refresh_ohlcv_cache(self, universe_list):
+    def get_ohlcv_cached_many(self, codes):
+        """
+        get_ohlcv_cached for several symbols: one store read (load_many) and one quote snapshot.
+        Write-through is buffered and flushed in one store rewrite (see ohlcv_batch).
+        Returns dict code -> DataFrame (empty when nothing could be fetched).
+        """
+        try:
+            cached = self.ohlcv_store.load_many(codes)
+        except Exception as e:
+            logging.warning(f"[KIS] OHLCV store read failed: {e}")
+            cached = {}
+        self.get_quotes(codes)
+        with self.ohlcv_batch():
+            return {code: self.get_ohlcv_cached(code, cached=cached.get(code, pd.DataFrame())) for code in codes}
+
+    @contextmanager
+    def ohlcv_batch(self):
+        """
+        Buffer get_ohlcv_cached write-through until the block exits, then write every
+        symbol in a single put_many (each store write rewrites the whole universe file).
+        Nested blocks flush with the outermost one.
+        """
+        with self._ohlcv_pending_lock:
+            outer = self._ohlcv_pending is None
+            if outer:
+                self._ohlcv_pending = {}
+        try:
+            yield
+        finally:
+            if outer:
+                self.flush_ohlcv()
+
+    def flush_ohlcv(self):
+        """Write the buffered closed bars (and their synced markers) in one store rewrite."""
+        with self._ohlcv_pending_lock:
+            pending, self._ohlcv_pending = self._ohlcv_pending, None
+        if not pending:
+            return
+        try:
+            self.ohlcv_store.put_many({code: df for code, (df, _, changed) in pending.items() if changed},
+                                      synced={code: synced for code, (_, synced, _) in pending.items()})
+        except Exception as e:
+            logging.warning(f"[KIS] OHLCV write-through failed for {len(pending)} symbols: {e}")
+
+    def _pending_ohlcv(self, code):
+        with self._ohlcv_pending_lock:
+            return None if self._ohlcv_pending is None else self._ohlcv_pending.get(code)
+
+    def _persist_closed_bars(self, code, closed, today_str, changed=True):
+        """
+        Write-through for get_ohlcv_cached: store the symbol's closed history (bars before today)
+        and mark it as gap-checked for today. The live (today) candle is never persisted.
+        changed=False records the synced marker only (no store rewrite).
+        Inside ohlcv_batch() the write is buffered; otherwise it is one store write.
+        """
+        with self._ohlcv_pending_lock:
+            if self._ohlcv_pending is not None:
+                previous = self._ohlcv_pending.get(code)
+                changed = changed or (previous is not None and previous[2])
+                self._ohlcv_pending[code] = (closed, today_str, changed)
+                return
+        try:
+            self.ohlcv_store.put_many({code: closed} if changed else {}, synced={code: today_str})
+        except Exception as e:
+            logging.warning(f"[KIS] OHLCV write-through failed for {code}: {e}")
+
+    def refresh_ohlcv_cache(self, universe_list, incremental=False, reconcile_days=None):
         """
-        Force-refresh OHLCV cache for the entire universe.
-        Deletes existing .pkl files and fetches fresh data.
+        Refresh OHLCV cache (OHLCVStore) for the entire universe.
+        - Full mode (default): re-downloads ~2 years for every symbol and replaces it.
+        - Incremental mode: appends only closed bars after the cached last date.
+          The last `reconcile_days` cached bars are re-fetched as overlap; if the adjusted
+          closes no longer match (corporate action), the symbol is fully reloaded.
+        All updates are written to the store in a single atomic rewrite at the end.
         """
-        logging.info(f"🔄 Starting Full OHLCV Cache Refresh for {len(universe_list)} stocks...")
+        mode = "Incremental" if incremental else "Full"
+        if reconcile_days is None:
+            reconcile_days = config.OHLCV_RECONCILE_DAYS
+        logging.info(f"🔄 Starting {mode} OHLCV Cache Refresh for {len(universe_list)} stocks...")
         count = 0
-        cache_dir = "data/ohlcv"
+        stats = {"appended": 0, "reloaded": 0, "unchanged": 0}
+        updates = {}
+        
+        # Fetch full history (~2 years default)
+        # Calculate start_date = 2 years ago
+        start_date = (datetime.now() - timedelta(days=730)).strftime("%Y%m%d")
         
         for item in universe_list:
             code = item['code']
             name = item['name']
-            cache_path = os.path.join(cache_dir, f"{code}.pkl")
-            
-            # 1. Delete existing cache
-            if os.path.exists(cache_path):
-                try:
-                    os.remove(cache_path)
-                except Exception as e:
-                    logging.warning(f"Failed to delete cache for {code}: {e}")
-            
-            # 2. Fetch Fresh Data & Save
-            # get_daily_ohlcv returns DF but doesn't save (helper). 
-            # We must save it explicitly here to rebuild the cache files.
             
             try:
-                # Fetch full history (~2 years default)
-                # Calculate start_date = 2 years ago
-                start_date = (datetime.now() - timedelta(days=730)).strftime("%Y%m%d")
-                df = self.get_daily_ohlcv(code, start_date=start_date)
+                if incremental:
+                    status, df = self._refresh_symbol_incremental(code, start_date, reconcile_days)
+                else:
+                    status, df = self._reload_symbol(code, start_date)
                 
-                if not df.empty:
-                    if not os.path.exists(cache_dir):
-                        os.makedirs(cache_dir)
-                    df.to_pickle(cache_path)
+                stats[status] += 1
+                if status != "unchanged":
+                    updates[code] = df
                     count += 1
             except Exception as e:
                 logging.error(f"Failed to refresh {name} ({code}): {e}")
                 
-            # Rate Limit (Mock: 0.5s, Real: 0.1s)
-            time.sleep(0.3)
+            # Rate limit is enforced per request by KISRateLimiter
             
             if (count + 1) % 10 == 0:
                 logging.info(f"   Refreshed {count+1}/{len(universe_list)}...")
+        
+        if updates:
+            self.ohlcv_store.put_many(updates)
                 
-        logging.info(f"✅ Full OHLCV Refresh Complete. Updated {count} files.")
+        logging.info(f"✅ {mode} OHLCV Refresh Complete. Updated {count} symbols. "
+                     f"(Appended: {stats['appended']}, Reloaded: {stats['reloaded']}, Unchanged: {stats['unchanged']})")
+
+    def _refresh_symbol_incremental(self, code, start_date, reconcile_days):
+        """
+        Delta-refresh a single cached symbol.
+        Returns (status, df): status is 'appended', 'reloaded' or 'unchanged',
+        df is the full updated history to store (None if unchanged).
+        """
+        cached = self.ohlcv_store.load(code)
+        if cached.empty:
+            return self._reload_symbol(code, start_date)
+        
+        overlap = cached.tail(max(1, reconcile_days))
+        fetch_start = overlap.iloc[0]['Date'].strftime("%Y%m%d")
+        
+        fresh = self.get_daily_ohlcv(code, start_date=fetch_start)
+        if fresh.empty:
+            return "unchanged", None
+        
+        fresh = self._closed_bars(fresh)
+        
+        # 1. Reconcile overlapping days (adjusted close must match)
+        merged = overlap[['Date', 'Close']].merge(fresh[['Date', 'Close']], on='Date', how='left', suffixes=('_cached', '_fresh'))
+        if merged['Close_fresh'].isna().any() or ((merged['Close_cached'] - merged['Close_fresh']).abs() > 0.5).any():
+            logging.info(f"[KIS] {code}: Adjusted price mismatch in reconciliation window. Full reload.")
+            return self._reload_symbol(code, start_date)
+        
+        # 2. Append new bars only
+        last_dt = cached.iloc[-1]['Date']
+        new_bars = fresh[fresh['Date'] > last_dt]
+        if new_bars.empty:
+            return "unchanged", None
+        
+        df = pd.concat([cached, new_bars], ignore_index=True)
+        return "appended", df
+
+    def _reload_symbol(self, code, start_date):
+        """Re-download the full history window of a symbol (closed bars only)."""
+        df = self._closed_bars(self.get_daily_ohlcv(code, start_date=start_date))
+        if df.empty:
+            return "unchanged", None
+        return "reloaded", df
+
+    @staticmethod
+    def _closed_bars(df):
+        """Drop today's bar: only closed bars are cached (the live candle is handled by get_ohlcv_cached)."""
+        if df.empty:
+            return df
+        return df[df['Date'] < pd.Timestamp(datetime.now().date())]
+
+    def invalidate_balance(self):
+        """Drop the cached balance (next get_balance() queries the API)."""
+        with self._balance_lock:
+            self._balance_cache = None
 
-    def get_balance(self):
+    def get_balance(self, force_refresh=False):
         """
         Check account balance and holdings.
         TR_ID: TTTC8434R (Real) / VTTC8434R (Mock)
+        Served from a snapshot younger than KIS_BALANCE_TTL unless force_refresh=True.
         """
+        if not force_refresh:
+            with self._balance_lock:
+                cached = self._balance_cache
+            if cached and time.monotonic() - cached[0] <= config.KIS_BALANCE_TTL:
+                # Copy so callers can't mutate the shared snapshot
+                return copy.deepcopy(cached[1])
+        
+        balance = self._fetch_balance()
+        if balance:
+            with self._balance_lock:
+                self._balance_cache = (time.monotonic(), balance)
+            return copy.deepcopy(balance)
+        return None
+
+    def _fetch_balance(self):
         path = "/uapi/domestic-stock/v1/trading/inquire-balance"
         url = f"{self.base_url}{path}"
         
@@ -500,6 +913,9 @@ class KISClient:
         }
         
         res = self._send_request("GET", path, tr_id, params=params)
+        if res is None:
+            logging.error("[KIS] Balance Request Failed (No Response)")
+            return None
         if res.status_code == 200:
             data = res.json()
             if data['rt_cd'] == '0':
@@ -508,6 +924,11 @@ class KISClient:
                 summary = data['output2'][0]
                 
                 cash_info = self.get_buyable_cash()
+                if cash_info is None:
+                    # Buying-power inquiry failed: fall back to the deposit from the balance summary
+                    deposit = float(summary.get('dnca_tot_amt', 0))
+                    logging.warning(f"[KIS] Using balance deposit as orderable cash: {deposit:,.0f}")
+                    cash_info = {"cash": deposit, "max_buy": deposit}
                 
                 return {
                     'cash_available': cash_info['cash'], # Real Orderable Cash
@@ -527,7 +948,7 @@ class KISClient:
         """
         Fetch Real-Time Orderable Cash via inquire-psbl-order.
         TR_ID: TTTC8908R (Real) / VTTC8908R (Mock)
-        Returns dict with 'cash' and 'max_buy'
+        Returns dict with 'cash' and 'max_buy', or None if the inquiry failed
         """
         path = "/uapi/domestic-stock/v1/trading/inquire-psbl-order"
         
@@ -546,8 +967,12 @@ class KISClient:
         }
         
         res = self._send_request("GET", path, tr_id, params=params)
-        if res and res.status_code == 200:
-            data = res.json()
+        if res is not None and res.status_code == 200:
+            try:
+                data = res.json()
+            except ValueError:
+                logging.warning("[KIS] Buyable Cash Error: invalid response body")
+                return None
             if data['rt_cd'] == '0':
                 return {
                     "cash": float(data['output']['ord_psbl_cash']),
@@ -555,74 +980,69 @@ class KISClient:
                 }
             else:
                  logging.warning(f"[KIS] Buyable Cash Error: {data['msg1']}")
-        return {"cash": 0.0, "max_buy": 0.0}
+        else:
+            logging.warning(f"[KIS] Buyable Cash Error: HTTP {res.status_code if res is not None else 'None'}")
+        return None
 
     def is_trading_day(self, date_str):
         """
         Check if the given date (YYYYMMDD) is a trading day.
-        TR_ID: CTCA0903R (Check Holiday)
+        Answered from the persisted trading calendar (data/trading_calendar.json),
+        which fetches a whole year via CTCA0903R the first time it is needed.
         """
         # [Override] Mock Investment -> Always Trading Day
         if self.is_mock:
             logging.info(f"[KIS] Mock Mode: Forcing Trading Day = True for {date_str}")
             return True
 
-        # [Optimization] Local Weekend Check
         try:
-            dt = datetime.strptime(date_str, "%Y%m%d")
-            # 0=Mon, 4=Fri, 5=Sat, 6=Sun
-            if dt.weekday() >= 5:
-                # logging.info(f"[KIS] {date_str} is Weekend (Local Check). Skipping API.")
-                return False
+            datetime.strptime(date_str, "%Y%m%d")
         except ValueError:
             logging.error(f"[KIS] Invalid Date Format for Holiday Check: {date_str}")
-            # Fallback to API check if parsing fails, though likely to fail there too
-            pass
+            return True
 
+        return self.calendar.is_trading_day(date_str)
+
+    def fetch_holidays(self, start_date, end_date):
+        """
+        Fetch the KRX calendar between start_date and end_date (YYYYMMDD).
+        TR_ID: CTCA0903R (Check Holiday). Each call returns a block of days from BASS_DT,
+        so the next call continues from the day after the last one returned.
+        Returns dict: YYYYMMDD -> is_open (opnd_yn == 'Y'). Raises if nothing could be fetched.
+        """
         path = "/uapi/domestic-stock/v1/quotations/chk-holiday"
         tr_id = "CTCA0903R"
         
-        params = {
-            "BASS_DT": date_str,
-            "CTX_AREA_NK": "",
-            "CTX_AREA_FK": ""
-        }
-        
-        retry_count = 0
-        while retry_count < 5:
+        days = {}
+        cursor = start_date
+        while cursor <= end_date:
+            params = {
+                "BASS_DT": cursor,
+                "CTX_AREA_NK": "",
+                "CTX_AREA_FK": ""
+            }
             res = self._send_request("GET", path, tr_id, params=params)
-            if res and res.status_code == 200:
-                data = res.json()
-                if data['rt_cd'] == '0':
-                    outputs = data.get('output', [])
-                    for item in outputs:
-                        if item['bass_dt'] == date_str:
-                            return item['opnd_yn'] == 'Y'
-                    return True 
-                else:
-                    if "초당 거래건수를 초과하였습니다" in data.get('msg1', ''):
-                        # TPS Limit -> Wait and Retry (Don't count strictly against limit or allow many retries)
-                        logging.warning(f"[KIS] Holiday Check TPS Limit -> Retrying...")
-                        time.sleep(1)
-                        # retry_count unchanged? No, avoid infinite loop risk. 
-                        # But TPS can be frequent. Let's not increment count for TPS.
-                        continue
-                        
-                    logging.warning(f"[KIS] Holiday Check Error: {data['msg1']}")
-                    return True # Default open on non-TPS error
-            else:
-                 retry_count += 1
-                 status = res.status_code if res else "None"
-                 # Mock Server Workaround: 500 Error
-                 if self.is_mock and status == 500:
-                     logging.warning("[KIS-MOCK] Holiday Check 500 Error. Mock Server Unstable. Assuming Open.")
-                     return True
-                 
-                 logging.warning(f"[KIS] Holiday Check Network Error ({status}). Retrying...")
-                 time.sleep(1)
-        
-        logging.error("[KIS] Holiday Check Failed after retries. Defaulting to True.")
-        return True
+            if res is None or res.status_code != 200:
+                status = res.status_code if res is not None else "None"
+                logging.warning(f"[KIS] Holiday Check Network Error ({status}).")
+                break
+            data = res.json()
+            if data.get('rt_cd') != '0':
+                logging.warning(f"[KIS] Holiday Check Error: {data.get('msg1')}")
+                break
+            
+            outputs = [item for item in data.get('output', []) if item.get('bass_dt', '') >= cursor]
+            if not outputs:
+                break
+            for item in outputs:
+                if item['bass_dt'] <= end_date:
+                    days[item['bass_dt']] = item['opnd_yn'] == 'Y'
+            last = max(item['bass_dt'] for item in outputs)
+            cursor = (datetime.strptime(last, "%Y%m%d") + timedelta(days=1)).strftime("%Y%m%d")
+        
+        if not days:
+            raise Exception(f"Holiday calendar fetch failed from {start_date}")
+        return days
 
     def send_order(self, code, qty, side="buy", price=0, order_type="00"):
         """
@@ -657,103 +1077,88 @@ class KISClient:
             "ORD_UNPR": str(price) # 0 for Market
         }
         
-        while True:
-            res = self._send_request("POST", path, tr_id, body=body)
-            if res is None:
-                logging.error("[KIS] Order Request Failed (No Response)")
-                return False, "No Response"
+        # TPS rejections are retried (bounded, with backoff) inside _send_request;
+        # 5xx / lost responses are not, since the order may have been accepted
+        res = self._send_request("POST", path, tr_id, body=body)
+        if res is None:
+            logging.error("[KIS] Order Request Failed (No Response)")
+            return False, "No Response"
 
-            try:
-                data = res.json()
-            except Exception as e:
-                logging.error(f"[KIS] Order Response JSON Error: {e}")
-                return False, "JSON Error"
+        try:
+            data = res.json()
+        except Exception as e:
+            logging.error(f"[KIS] Order Response JSON Error: {e}")
+            return False, "JSON Error"
 
-            if data['rt_cd'] == '0':
-                logging.info(f"[KIS] Order Success: {side.upper()} {code} {qty}ea @ {price if price >0 else 'Market'}")
-                return True, data['msg1']
-            else:
-                # Check for TPS Limit Error
-                if "초당 거래건수를 초과하였습니다" in data.get('msg1', ''):
-                    logging.warning(f"[KIS] Order Rate Limit Exceeded: {data['msg1']} -> Sleeping 5s and retrying...")
-                    time.sleep(5)
-                    continue
-                else:
-                    logging.error(f"[KIS] Order Failed: {data['msg1']}")
-                    return False, data['msg1']
+        if data['rt_cd'] == '0':
+            logging.info(f"[KIS] Order Success: {side.upper()} {code} {qty}ea @ {price if price >0 else 'Market'}")
+            self.invalidate_balance()
+            return True, data['msg1']
+        else:
+            logging.error(f"[KIS] Order Failed: {data['msg1']}")
+            return False, data['msg1']
 
     def check_manage_status(self, code):
         """
         Check if the stock is a Managed Item (Administrative Issue).
-        Uses 'psearch/price' or master inquiry.
-        Actually, simplest way via API is examining 'is_dangerous' or similar from price query if available.
-        
-        Alternate: Search Info (CTPF4002R - Search Stock Info)
-        This endpoint returns Detailed State.
+        Uses the status fields of Inquire Price (FHKST01010100) via today's status cache:
+        'iscd_stat_cls_code' 51 (Admin Issue) or 'mang_issu_cls_code' != 'N'.
+        Returns: True if managed, False if normal, None if the status could not be fetched.
         """
-        # Note: Implementing a robust check might require looking up the specific 'market warning' code.
-        # For now, we will assume if 'get_current_price' returns 'is_admin_issue' equivalent.
-        # Let's check 'output' of 'get_current_price' more closely in docs.
-        # It has 'mrkt_warn_cls_code' (Market Warning Class).
-        # And commonly 'adm_isu_yn' (Admin Issue Yes/No) is NOT clearly in all lightweight queries.
-        
-        # We will use FinanceDataReader in the main strategy to filter initially if possible.
-        # But if we must use KIS:
-        # Use 'Inquire Subject Item Info' (JTTT2001R) - but this is for specific account holdings? No.
-        
-        # Let's rely on get_daily_ohlcv or similar not returning error? No.
-        
-        # Strategy: We will use the 'Market Warning Code' from Inquire Price (FHKST01010100)
-        # return dict contains:
-        # 'mrkt_warn_cls_code': '00'(Normal), '01'(Caution), '02'(Warning), '03'(Danger)
-        # This is a good proxy. 'Admin' might be separate.
-        
-        # For safety, we will implement this check in Strategy using FinanceDataReader if KIS is ambiguous.
-        pass
+        status = self.get_stock_status(code)
+        if status is None:
+            return None
+        return is_managed(status)
 
-    def check_dangerous_stock(self, code):
+    def get_stock_status(self, code, use_cache=True):
         """
-        Check if the stock is in a dangerous state (Suspended, Admin Issue, Market Warning).
-        Returns: (is_dangerous: bool, reason: str)
+        Status fields (iscd_stat_cls_code, mrkt_warn_cls_code, ...) for code.
+        Served from the per-day status cache; fetched via Inquire Price on a miss.
         """
-        # Reuse get_current_price which fetches FHKST01010100
-        # We need the RAW data, but get_current_price returns 'output' dict.
+        if use_cache:
+            status = self.status_cache.get(code)
+            if status is not None:
+                return status
         
         data = None
-        for _ in range(3): # Retry up to 3 times
-            data = self.get_current_price(code)
+        for _ in range(3): # Retry up to 3 times (paced by the rate limiter)
+            # Status codes only come from the REST snapshot (not the real-time stream)
+            data = self.get_current_price(code, use_stream=False)
             if data:
                 break
-            time.sleep(0.5)
-            
         if not data:
-            return True, "No Data" # Can't verify, so risky
+            return None
+        self.status_cache.put(code, data)
+        return self.status_cache.get(code)
 
-        # 1. Issue Status Class Code (iscd_stat_cls_code)
-        # 55: Normal (KOSPI 200), 57: Normal
-        # 58: Trading Suspended (confirmed with Fadu)
-        # 51: Admin Issue, 52: Inv Caution, 53: Warning, 54: Danger
-        iscd_code = data.get('iscd_stat_cls_code', '')
-        if iscd_code in ['51', '52', '53', '54', '58', '59']:
-             return True, f"Bad Status Code ({iscd_code})"
-
-        # 2. Market Warning (mrkt_warn_cls_code)
-        # 00: Normal, 01: Caution, 02: Warning, 03: Danger
-        warn_code = data.get('mrkt_warn_cls_code', '00')
-        if warn_code != '00':
-             return True, f"Market Warning ({warn_code})"
-             
-        # 3. Management Issue (mang_issu_cls_code)
-        # N: Normal. Not 'N' -> Issue (assuming 'Y' or code)
-        mang_code = data.get('mang_issu_cls_code', 'N')
-        if mang_code != 'N':
-             return True, f"Management Issue ({mang_code})"
-             
-        # 4. Investment Caution (invt_caful_yn)
-        if data.get('invt_caful_yn', 'N') == 'Y':
-             return True, "Investment Caution"
+    def prefetch_stock_status(self, codes):
+        """
+        Bulk-fill today's status cache (morning), so the evening filter is a memory lookup.
+        Only codes missing from today's cache are queried. Returns the number fetched.
+        """
+        missing = [c for c in dict.fromkeys(codes) if self.status_cache.get(c) is None]
+        if not missing:
+            return 0
+        
+        workers = min(config.KIS_ASYNC_CONCURRENCY, len(missing))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kis-status") as pool:
+            results = pool.map(lambda c: self.get_current_price(c, use_stream=False), missing)
+            fetched = {code: data for code, data in zip(missing, results) if data}
+        
+        # One write for the whole batch
+        self.status_cache.put_many(fetched)
+        logging.info(f"[KIS] Stock status cached for {len(fetched)}/{len(missing)} codes.")
+        return len(fetched)
 
-        return False, "Safe"
+    def check_dangerous_stock(self, code):
+        """
+        Check if the stock is in a dangerous state (Suspended, Admin Issue, Market Warning).
+        Returns: (is_dangerous: bool, reason: str)
+        """
+        status = self.get_stock_status(code)
+        if status is None:
+            return True, "No Data" # Can't verify, so risky
+        return evaluate_status(status)
 
 
     def get_outstanding_orders(self):
@@ -761,7 +1166,11 @@ class KISClient:
         Fetch unfilled (outstanding) orders.
         Real: TTTC8001R (Daily Conclusion - Unfilled)
         Mock: Not Supported (API returns 90000000 or empty data)
+        Served from the execution-notice book (no API call) while a FillStream is live.
         """
+        if self.fill_stream and self.fill_stream.is_live():
+            return self.fill_stream.book.outstanding()
+        
         if self.is_mock:
             # [Mock Environment] 
             # VTTC8036R returns "Not Supported" (Code 90000000).
@@ -873,26 +1282,50 @@ class KISClient:
         if int(qty) == 0:
              body["QTY_ALL_ORD_YN"] = "Y"
         
+        # Like send_order, 5xx / lost responses are returned as-is (not retried)
         res = self._send_request("POST", path, tr_id, body=body)
         if res is None:
              return False, "Network Error"
              
-        data = res.json()
-        if data['rt_cd'] == '0':
+        try:
+            data = res.json()
+        except Exception as e:
+            # e.g. an HTML 502/503 page from the gateway
+            logging.error(f"[KIS] Order {'Cancel' if is_cancel else 'Revise'} Response JSON Error ({res.status_code}): {e}")
+            return False, "JSON Error"
+
+        if data.get('rt_cd') == '0':
             logging.info(f"[KIS] Order {'Cancel' if is_cancel else 'Revise'} Success: {order_no}")
+            self.invalidate_balance()
             return True, data['msg1']
         else:
-             logging.error(f"[KIS] Order {'Cancel' if is_cancel else 'Revise'} Failed: {data['msg1']}")
-             return False, data['msg1']
+             msg = data.get('msg1') or f"HTTP {res.status_code}"
+             logging.error(f"[KIS] Order {'Cancel' if is_cancel else 'Revise'} Failed: {msg}")
+             return False, msg
 
-    def get_period_trades(self, start_date, end_date):
+    def get_period_trades(self, start_date, end_date, ccld_dvsn="01"):
         """
-        Fetch Trade History (Concluded Orders) for a period.
-        TR_ID: TTTC8001R (Real) / VTTC8001R (Mock)
+        Fetch Trade History (Concluded Orders) for a period (all pages).
+        ccld_dvsn: 01 concluded only (default), 00 all orders, 02 unfilled only
+        """
+        return list(self.iter_period_trades(start_date, end_date, ccld_dvsn=ccld_dvsn))
+
+    def iter_period_trades(self, start_date, end_date, ccld_dvsn="01", strict=False):
+        """
+        Yield inquire-daily-ccld output1 rows for a period, page by page as they arrive.
+        TR_ID: TTTC8001R (Real) / VTTC8001R (Mock), periods older than 3 months
+               CTSC9115R (Real) / VTSC9115R (Mock)
         Path: /uapi/domestic-stock/v1/trading/inquire-daily-ccld
+        Follows the continuation keys (ctx_area_fk100/nk100 + tr_cont response header
+        F/M = more, D/E = last) until the last page. Pages hold 100 rows (Real) / 15 (Mock).
+        strict: raise instead of logging when a page fails, so callers can tell a
+        truncated period from a complete one
         """
         path = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
-        tr_id = "VTTC8001R" if self.is_mock else "TTTC8001R"
+        if start_date >= period_trades_cutoff():
+            tr_id = "VTTC8001R" if self.is_mock else "TTTC8001R"
+        else:
+            tr_id = "VTSC9115R" if self.is_mock else "CTSC9115R"
         
         params = {
             "CANO": self.account_no,
@@ -902,7 +1335,7 @@ class KISClient:
             "SLL_BUY_DVSN_CD": "00",   # 00: All, 01: Sell, 02: Buy
             "INQR_DVSN": "00",         # 00: Order order? 01: Order No?
             "PDNO": "",
-            "CCLD_DVSN": "01",         # 01: Concluded (Executed)
+            "CCLD_DVSN": ccld_dvsn,    # 01: Concluded (Executed)
             "ORD_GNO_BRNO": "",
             "ODNO": "",
             "INQR_DVSN_3": "00",
@@ -911,14 +1344,36 @@ class KISClient:
             "CTX_AREA_NK100": ""
         }
         
-        res = self._send_request("GET", path, tr_id, params=params)
-        if res and res.status_code == 200:
-            data = res.json()
-            if data['rt_cd'] == '0':
-                return data['output1'] 
+        page = 0
+        tr_cont = ""
+        while True:
+            page += 1
+            res = self._send_request("GET", path, tr_id, params=params, tr_cont=tr_cont)
+            error = None
+            if res is None or res.status_code != 200:
+                error = f"HTTP {res.status_code if res is not None else 'None'}"
             else:
-                logging.error(f"[KIS] Period Trades Error: {data['msg1']}")
-        return []
+                data = res.json()
+                if data.get('rt_cd') != '0':
+                    error = data.get('msg1')
+            if error:
+                message = f"[KIS] Period Trades Error ({start_date}~{end_date}, page {page}): {error}"
+                if strict:
+                    raise Exception(message)
+                logging.error(message)
+                return
+            
+            for row in data.get('output1') or []:
+                # An empty result comes back as one blank row
+                if row.get('odno'):
+                    yield row
+            
+            next_key = (data.get('ctx_area_nk100') or "").strip()
+            if res.headers.get('tr_cont') not in ('F', 'M') or not next_key:
+                return
+            params["CTX_AREA_FK100"] = data.get('ctx_area_fk100') or ""
+            params["CTX_AREA_NK100"] = data.get('ctx_area_nk100') or ""
+            tr_cont = "N"
 
     def get_today_filled_info(self, code, side="buy"):
         """
@@ -932,6 +1387,10 @@ class KISClient:
                 'unfilled_qty': 미체결 수량
             }
         """
+        # Execution notices keep this current without polling inquire-daily-ccld
+        if self.fill_stream and self.fill_stream.is_live():
+            return self.fill_stream.book.filled_info(code, side)
+        
         tz_kst = pytz.timezone('Asia/Seoul')
         today_str = datetime.now(pytz.utc).astimezone(tz_kst).strftime("%Y%m%d")
         
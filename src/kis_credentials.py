@@ -0,0 +1,108 @@
+import json
+import time
+import itertools
+import logging
+import threading
+from src.token_store import TokenStore
+from src.rate_limiter import KISRateLimiter, classify_tr_id, ENDPOINT_QUOTE, ENDPOINT_HISTORY
+
+# Read-only market data: may be served by any configured appkey
+MARKET_DATA_CLASSES = (ENDPOINT_QUOTE, ENDPOINT_HISTORY)
+
+
+class KISCredential:
+    """
+    One appkey/secret pair with its own access token cache and TPS limiter.
+    KIS counts TPS per appkey, so every credential gets a separate KISRateLimiter.
+    """
+    def __init__(self, name, app_key, app_secret, token_path="token.json", is_mock=False):
+        self.name = name
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.token_path = token_path
+        # Token file shared with other local processes (dashboard, scripts)
+        self.store = TokenStore(token_path)
+        self.rate_limiter = KISRateLimiter(is_mock=is_mock)
+        self.access_token = None
+        self.token_expired_at = 0
+        # Serializes token refresh between threads of this process
+        self.lock = threading.Lock()
+
+    def is_valid(self):
+        return self.access_token is not None and time.time() <= self.token_expired_at
+
+    def fetch_token(self, session, base_url, rejected_token=None):
+        """
+        Load the shared cached token, or issue a new one (POST /oauth2/tokenP).
+        Issuing is single-flight across processes (TokenStore); rejected_token is the
+        token the server just refused, which forces a refresh unless someone already did it.
+        """
+        def issue():
+            return self._issue_token(session, base_url)
+
+        cached = self.store.get_or_refresh(issue, rejected_token=rejected_token)
+        if cached.access_token != self.access_token:
+            logging.info(f"[KIS] Using Access Token ({self.name}, Expires in {int(cached.expires_at - time.time())}s)")
+        self.access_token = cached.access_token
+        self.token_expired_at = cached.expires_at
+
+    def _issue_token(self, session, base_url):
+        url = f"{base_url}/oauth2/tokenP"
+        headers = {"content-type": "application/json"}
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret
+        }
+
+        try:
+            res = session.post(url, headers=headers, data=json.dumps(body), timeout=10)
+            data = res.json()
+            if 'access_token' in data:
+                logging.info(f"[KIS] Access Token refreshed ({self.name}).")
+                # Token usually valid for 24h
+                return data['access_token'], time.time() + data.get('expires_in', 86400) - 60
+            logging.error(f"[KIS] Token Error ({self.name}): {data}")
+            raise Exception("Failed to get Access Token")
+        except Exception as e:
+            logging.error(f"[KIS] Auth Exception ({self.name}): {e}")
+            raise
+
+
+class CredentialPool:
+    """
+    Routes each TR_ID to a credential.
+    - Orders / account inquiries: always the account's own appkey (primary)
+    - Quotes / chart history: round-robin over the primary and every extra appkey,
+      so aggregate market-data TPS scales with the number of keys
+    """
+    def __init__(self, primary, extras=()):
+        self.primary = primary
+        self.market_data = [primary] + list(extras)
+        self._cycle = itertools.cycle(self.market_data)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.market_data)
+
+    def for_tr_id(self, tr_id):
+        if len(self.market_data) == 1 or classify_tr_id(tr_id) not in MARKET_DATA_CLASSES:
+            return self.primary
+        with self._lock:
+            return next(self._cycle)
+
+
+def build_pool(app_key, app_secret, extra_keys=(), is_mock=False):
+    """
+    Primary credential (token.json) plus extra market-data keys.
+    extra_keys: [(name, app_key, app_secret)] (config.KIS_MARKET_DATA_KEYS), token file token_<name>.json
+    """
+    primary = KISCredential("primary", app_key, app_secret, token_path="token.json", is_mock=is_mock)
+    extras = [
+        KISCredential(name, key, secret, token_path=f"token_{name}.json", is_mock=is_mock)
+        for name, key, secret in extra_keys
+        if key and secret and key != app_key
+    ]
+    if extras:
+        logging.info(f"[KIS] Market data sharded over {len(extras) + 1} appkeys")
+    return CredentialPool(primary, extras)
@@ -0,0 +1,167 @@
+import os
+import csv
+import json
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from src.utils import get_now_kst, atomic_replace
+
+KIS_METRICS_DIR = "data/metrics"
+
+# Latency histogram upper bounds (ms); the last bucket catches everything slower
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+CSV_COLUMNS = (
+    "tr_id", "calls", "errors", "retries", "rate_limited", "circuit_open",
+    "total_ms", "avg_ms", "p50_ms", "p95_ms", "max_ms", "limiter_wait_ms", "statuses",
+)
+
+
+class TRStats:
+    """Counters + latency histogram for one TR_ID."""
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.circuit_open = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.limiter_wait_ms = 0.0
+        self.statuses = {}  # HTTP status (or "EXC") -> count
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def percentile(self, q):
+        """Upper bound (ms) of the histogram bucket holding the q-th quantile."""
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if seen >= rank and n:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "circuit_open": self.circuit_open,
+            "total_ms": round(self.total_ms, 1),
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "limiter_wait_ms": round(self.limiter_wait_ms, 1),
+            "statuses": dict(self.statuses),
+            "histogram": dict(zip([f"<={b}" for b in LATENCY_BUCKETS_MS] + ["slower"], self.histogram)),
+        }
+
+
+class KISMetrics:
+    """
+    In-process registry of KIS REST call statistics, keyed by TR_ID.
+    - KISClient._send_request records every HTTP attempt, retry, rate-limit hit and limiter wait
+    - job(name) scopes the registry to one scheduled job and dumps it to
+      data/metrics/<YYYYMMDD_HHMM>_<name>.json/.csv when the job ends (read by the dashboard)
+    """
+    def __init__(self, directory=KIS_METRICS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _get(self, tr_id):
+        stats = self._stats.get(tr_id)
+        if stats is None:
+            stats = self._stats[tr_id] = TRStats()
+        return stats
+
+    # --- Recording (called from worker threads) ---
+    def record_call(self, tr_id, elapsed_ms, status, error=False):
+        with self._lock:
+            stats = self._get(tr_id)
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            if error:
+                stats.errors += 1
+
+    def record_retry(self, tr_id):
+        with self._lock:
+            self._get(tr_id).retries += 1
+
+    def record_rate_limited(self, tr_id):
+        with self._lock:
+            self._get(tr_id).rate_limited += 1
+
+    def record_circuit_open(self, tr_id):
+        with self._lock:
+            self._get(tr_id).circuit_open += 1
+
+    def record_wait(self, tr_id, seconds):
+        with self._lock:
+            self._get(tr_id).limiter_wait_ms += seconds * 1000
+
+    # --- Reporting ---
+    def snapshot(self):
+        """{tr_id: stats dict}, slowest total time first."""
+        with self._lock:
+            items = [(tr_id, s.to_dict()) for tr_id, s in self._stats.items()]
+        items.sort(key=lambda kv: kv[1]["total_ms"] + kv[1]["limiter_wait_ms"], reverse=True)
+        return dict(items)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def dump(self, name, now=None):
+        """Write the registry to <dir>/<YYYYMMDD_HHMM>_<name>.json and .csv. Returns the JSON path."""
+        now = now or get_now_kst()
+        snapshot = self.snapshot()
+        base = os.path.join(self.directory, f"{now.strftime('%Y%m%d_%H%M')}_{name}")
+        payload = {"job": name, "dumped_at": now.strftime("%Y-%m-%d %H:%M:%S"), "tr_ids": snapshot}
+
+        def write_csv(f):
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            for tr_id, s in snapshot.items():
+                row = dict(s, tr_id=tr_id, statuses=";".join(f"{k}:{v}" for k, v in s["statuses"].items()))
+                writer.writerow([row[c] for c in CSV_COLUMNS])
+
+        try:
+            atomic_replace(f"{base}.json", lambda f: json.dump(payload, f, indent=1), mode="w")
+            atomic_replace(f"{base}.csv", write_csv, mode="w")
+        except Exception as e:
+            logging.error(f"[KIS] Failed to dump metrics ({name}): {e}")
+            return None
+        return f"{base}.json"
+
+    @contextmanager
+    def job(self, name):
+        """Scope the registry to one scheduled job: reset on entry, dump on exit."""
+        self.reset()
+        try:
+            yield self
+        finally:
+            path = self.dump(name)
+            if path:
+                calls = sum(s["calls"] for s in self.snapshot().values())
+                logging.info(f"[KIS] API metrics for {name}: {calls} calls -> {path}")
+
+
+def list_dumps(directory=KIS_METRICS_DIR):
+    """Metric dump files (JSON), newest first."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted((f for f in os.listdir(directory) if f.endswith(".json")), reverse=True)
+
+
+def load_dump(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
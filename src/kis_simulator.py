@@ -0,0 +1,455 @@
+import json
+import time
+import zlib
+import random
+import logging
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Chart TR page size (FHKST03010100)
+CHART_PAGE_SIZE = 100
+# Days returned per chk-holiday call
+HOLIDAY_BLOCK_DAYS = 30
+# inquire-daily-ccld page size (Real: 100, Mock: 15)
+CCLD_PAGE_SIZE = 100
+
+RATE_LIMIT_BODY = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+TOKEN_EXPIRED_BODY = {"rt_cd": "1", "msg_cd": "EGW00123", "msg1": "기간이 만료된 token 입니다."}
+
+
+def _ok(**outputs):
+    return dict({"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다."}, **outputs)
+
+
+def _error(msg1, msg_cd="OPSQ0002"):
+    return {"rt_cd": "1", "msg_cd": msg_cd, "msg1": msg1}
+
+
+class SimulatorData:
+    """
+    Market + account state served by FakeKISServer.
+    - charts: code -> [chart row] (FHKST03010100 output2 fields), any order
+    - prices: code -> inquire-price output (derived from the last chart bar if missing)
+    - holidays: YYYYMMDD -> "Y"/"N" opnd_yn overrides (default: weekdays open)
+    - cash / holdings: account state, updated by simulated fills
+    Codes without recorded data get a deterministic synthetic random-walk history.
+    """
+    def __init__(self, charts=None, prices=None, holidays=None, names=None, cash=10_000_000, holdings=None):
+        self.charts = {code: sorted(rows, key=lambda r: r["stck_bsop_date"]) for code, rows in (charts or {}).items()}
+        self.prices = dict(prices or {})
+        self.holidays = dict(holidays or {})
+        self.names = dict(names or {})
+        self.cash = float(cash)
+        self.holdings = {h["pdno"]: dict(h) for h in (holdings or [])}
+        self.orders = []  # inquire-daily-ccld output1 rows
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a recorded fixture: {"charts", "prices", "holidays", "names", "cash", "holdings"}."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(**{k: data[k] for k in ("charts", "prices", "holidays", "names", "cash", "holdings") if k in data})
+
+    # --- Calendar ---
+    def is_open(self, date_str):
+        if date_str in self.holidays:
+            return self.holidays[date_str] == "Y"
+        return datetime.strptime(date_str, "%Y%m%d").weekday() < 5
+
+    # --- Market data ---
+    def chart(self, code):
+        with self._lock:
+            if code not in self.charts:
+                self.charts[code] = self._synthetic_chart(code)
+            return self.charts[code]
+
+    def _synthetic_chart(self, code, start="20200101"):
+        rng = random.Random(zlib.crc32(code.encode()))
+        price = rng.uniform(5_000, 100_000)
+        day = datetime.strptime(start, "%Y%m%d")
+        end = datetime.now()
+        rows = []
+        while day <= end:
+            date_str = day.strftime("%Y%m%d")
+            if self.is_open(date_str):
+                open_ = price
+                price = max(100.0, price * (1 + rng.gauss(0, 0.02)))
+                high = max(open_, price) * (1 + abs(rng.gauss(0, 0.005)))
+                low = min(open_, price) * (1 - abs(rng.gauss(0, 0.005)))
+                rows.append({
+                    "stck_bsop_date": date_str,
+                    "stck_oprc": str(int(open_)), "stck_hgpr": str(int(high)),
+                    "stck_lwpr": str(int(low)), "stck_clpr": str(int(price)),
+                    "acml_vol": str(rng.randint(10_000, 1_000_000)),
+                })
+            day += timedelta(days=1)
+        return rows
+
+    def price(self, code):
+        if code in self.prices:
+            return self.prices[code]
+        rows = self.chart(code)
+        last = rows[-1]
+        prev_close = rows[-2]["stck_clpr"] if len(rows) > 1 else last["stck_oprc"]
+        return {
+            "stck_shrn_iscd": code,
+            "hts_kor_isnm": self.names.get(code, code),
+            "stck_prpr": last["stck_clpr"], "stck_oprc": last["stck_oprc"],
+            "stck_hgpr": last["stck_hgpr"], "stck_lwpr": last["stck_lwpr"],
+            "stck_sdpr": prev_close, "stck_prdy_clpr": prev_close,
+            "prdy_ctrt": f"{(float(last['stck_clpr']) / float(prev_close) - 1) * 100:.2f}",
+            "acml_vol": last["acml_vol"],
+            "iscd_stat_cls_code": "55", "mrkt_warn_cls_code": "00",
+            "mang_issu_cls_code": "N", "invt_caful_yn": "N",
+        }
+
+    # --- Account ---
+    def fill(self, code, side, qty, price):
+        """Fill an order immediately. Returns (ok, order_no or error message)."""
+        now = datetime.now()
+        amount = qty * price
+        with self._lock:
+            holding = self.holdings.get(code)
+            if side == "buy":
+                if amount > self.cash:
+                    return False, "주문가능금액을 초과 했습니다"
+                self.cash -= amount
+                if holding:
+                    total = int(holding["hldg_qty"]) + qty
+                    avg = (float(holding["pchs_avg_pric"]) * int(holding["hldg_qty"]) + amount) / total
+                    holding.update(hldg_qty=str(total), pchs_avg_pric=f"{avg:.4f}")
+                else:
+                    self.holdings[code] = {
+                        "pdno": code, "prdt_name": self.names.get(code, code),
+                        "hldg_qty": str(qty), "pchs_avg_pric": f"{price:.4f}",
+                    }
+            else:
+                if not holding or int(holding["hldg_qty"]) < qty:
+                    return False, "주문가능수량을 초과 했습니다"
+                self.cash += amount
+                left = int(holding["hldg_qty"]) - qty
+                if left:
+                    holding["hldg_qty"] = str(left)
+                else:
+                    del self.holdings[code]
+            order_no = f"{len(self.orders) + 1:010d}"
+            self.orders.append({
+                "ord_dt": now.strftime("%Y%m%d"), "ord_tmd": now.strftime("%H%M%S"),
+                "odno": order_no, "orgn_odno": "", "ord_gno_brno": "00950",
+                "sll_buy_dvsn_cd": "02" if side == "buy" else "01",
+                "pdno": code, "prdt_name": self.names.get(code, code),
+                "ord_qty": str(qty), "ord_unpr": str(int(price)),
+                "tot_ccld_qty": str(qty), "tot_ccld_amt": str(int(amount)),
+                "avg_prvs": str(int(price)), "rmn_qty": "0", "cncl_yn": "N",
+            })
+            return True, order_no
+
+    def balance(self):
+        with self._lock:
+            holdings = []
+            total_eval = total_pchs = 0.0
+            for code, h in self.holdings.items():
+                qty = int(h["hldg_qty"])
+                cur = float(self.price(code)["stck_prpr"])
+                pchs = float(h["pchs_avg_pric"]) * qty
+                evlu = cur * qty
+                total_eval += evlu
+                total_pchs += pchs
+                holdings.append(dict(
+                    h, prpr=str(int(cur)), pchs_amt=str(int(pchs)), evlu_amt=str(int(evlu)),
+                    evlu_pfls_amt=str(int(evlu - pchs)),
+                    evlu_pfls_rt=f"{(evlu / pchs - 1) * 100 if pchs else 0:.2f}",
+                ))
+            summary = {
+                "dnca_tot_amt": str(int(self.cash)),
+                "tot_evlu_amt": str(int(self.cash + total_eval)),
+                "evlu_pfls_smt_tl": str(int(total_eval - total_pchs)),
+                "evlu_pfls_rt": f"{(total_eval / total_pchs - 1) * 100 if total_pchs else 0:.2f}",
+            }
+            return holdings, summary
+
+
+class FakeKISServer:
+    """
+    Local stand-in for the KIS REST API (no network), for offline tests and benchmarks.
+    Serves token, quote (single + multi), daily chart, holiday, balance, buyable cash,
+    order, revise/cancel and daily-ccld endpoints from SimulatorData.
+    - latency / latency_jitter: seconds added to every response
+    - tps: per-appkey requests per second; excess calls get EGW00201 (like the real server)
+    - rate_limit_rate / server_error_rate: random EGW00201 / HTTP 500 fault injection
+    - expire_tokens(): invalidate issued tokens (next calls get EGW00123)
+    Runs on a background thread (ThreadingHTTPServer); point KISClient.base_url at `url`.
+    """
+    def __init__(self, data=None, host="127.0.0.1", port=0, latency=0.0, latency_jitter=0.0,
+                 tps=None, rate_limit_rate=0.0, server_error_rate=0.0, seed=None):
+        self.data = data or SimulatorData()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.tps = tps
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.ccld_page_size = CCLD_PAGE_SIZE
+        self.url = None
+        self.requests = Counter()  # tr_id (or path) -> calls
+        self.rejected = Counter()  # reason -> count
+        self._rng = random.Random(seed)
+        self._tokens = set()
+        self._recent = {}  # appkey -> deque of request times (last second)
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    # --- Lifecycle ---
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self.url = f"http://{self.host}:{self.port}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="kis-sim", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def expire_tokens(self):
+        with self._lock:
+            self._tokens.clear()
+
+    # --- Request pipeline ---
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, payload, headers=None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                split = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(split.query, keep_blank_values=True).items()}
+                self._reply(*server.handle("GET", split.path, self.headers, params))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+                self._reply(*server.handle("POST", urlsplit(self.path).path, self.headers, body))
+
+        return Handler
+
+    def _throttled(self, appkey):
+        """Sliding one-second window per appkey."""
+        if not self.tps:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            recent = self._recent.setdefault(appkey, deque())
+            while recent and now - recent[0] >= 1.0:
+                recent.popleft()
+            if len(recent) >= self.tps:
+                return True
+            recent.append(now)
+            return False
+
+    def handle(self, method, path, headers, params):
+        """Returns (HTTP status, JSON payload) or (HTTP status, JSON payload, response headers)."""
+        if self.latency or self.latency_jitter:
+            time.sleep(self.latency + self._rng.uniform(0, self.latency_jitter))
+
+        route = ROUTES.get((method, path))
+        if route is None:
+            return 404, _error(f"Unknown endpoint {method} {path}", msg_cd="EGW00002")
+        tr_id = headers.get("tr_id") or path
+        with self._lock:
+            self.requests[tr_id] += 1
+
+        if not path.startswith("/oauth2/"):
+            token = (headers.get("authorization") or "").replace("Bearer ", "", 1)
+            with self._lock:
+                valid = token in self._tokens
+            if not valid:
+                self.rejected["token"] += 1
+                return 500, TOKEN_EXPIRED_BODY
+            if self._throttled(headers.get("appkey", "")):
+                self.rejected["tps"] += 1
+                return 500, RATE_LIMIT_BODY
+            roll = self._rng.random()
+            if roll < self.rate_limit_rate:
+                self.rejected["fault_rate_limit"] += 1
+                return 500, RATE_LIMIT_BODY
+            if roll < self.rate_limit_rate + self.server_error_rate:
+                self.rejected["fault_server_error"] += 1
+                return 500, {}
+        return route(self, params, tr_id)
+
+    # --- Endpoints ---
+    def _token(self, body, tr_id):
+        with self._lock:
+            token = f"sim-{len(self._tokens) + 1}-{self._rng.getrandbits(32):08x}"
+            self._tokens.add(token)
+        return 200, {"access_token": token, "token_type": "Bearer", "expires_in": 86400}
+
+    def _approval(self, body, tr_id):
+        return 200, {"approval_key": f"sim-approval-{self._rng.getrandbits(32):08x}"}
+
+    def _inquire_price(self, params, tr_id):
+        return 200, _ok(output=self.data.price(params.get("FID_INPUT_ISCD", "")))
+
+    def _multi_price(self, params, tr_id):
+        output = []
+        for i in range(1, 31):
+            code = params.get(f"FID_INPUT_ISCD_{i}")
+            if not code:
+                continue
+            p = self.data.price(code)
+            output.append({
+                "inter_shrn_iscd": code, "inter_kor_isnm": p.get("hts_kor_isnm", code),
+                "inter2_prpr": p["stck_prpr"], "inter2_oprc": p["stck_oprc"],
+                "inter2_hgpr": p["stck_hgpr"], "inter2_lwpr": p["stck_lwpr"],
+                "inter2_sdpr": p["stck_sdpr"], "inter2_prdy_clpr": p["stck_prdy_clpr"],
+                "prdy_ctrt": p["prdy_ctrt"], "acml_vol": p["acml_vol"],
+            })
+        return 200, _ok(output=output)
+
+    def _daily_chart(self, params, tr_id):
+        code = params.get("FID_INPUT_ISCD", "")
+        start = params.get("FID_INPUT_DATE_1", "")
+        end = params.get("FID_INPUT_DATE_2", "")
+        rows = [r for r in self.data.chart(code) if start <= r["stck_bsop_date"] <= end]
+        # Newest first, one page; an empty range still returns one blank row
+        rows = rows[::-1][:CHART_PAGE_SIZE] or [{k: "" for k in ("stck_bsop_date", "stck_oprc", "stck_hgpr", "stck_lwpr", "stck_clpr", "acml_vol")}]
+        price = self.data.price(code)
+        return 200, _ok(output1={"stck_shrn_iscd": code, "hts_kor_isnm": price.get("hts_kor_isnm", code)}, output2=rows)
+
+    def _holiday(self, params, tr_id):
+        day = datetime.strptime(params.get("BASS_DT") or datetime.now().strftime("%Y%m%d"), "%Y%m%d")
+        output = []
+        for _ in range(HOLIDAY_BLOCK_DAYS):
+            date_str = day.strftime("%Y%m%d")
+            is_open = "Y" if self.data.is_open(date_str) else "N"
+            output.append({"bass_dt": date_str, "wday_dvsn_cd": f"{(day.isoweekday() % 7) + 1:02d}",
+                           "bzdy_yn": is_open, "tr_day_yn": is_open, "opnd_yn": is_open, "sttl_day_yn": is_open})
+            day += timedelta(days=1)
+        return 200, _ok(output=output)
+
+    def _balance(self, params, tr_id):
+        holdings, summary = self.data.balance()
+        return 200, _ok(output1=holdings, output2=[summary])
+
+    def _buyable_cash(self, params, tr_id):
+        cash = str(int(self.data.cash))
+        return 200, _ok(output={"ord_psbl_cash": cash, "max_buy_amt": cash, "nrcvb_buy_amt": cash})
+
+    def _order(self, body, tr_id):
+        code = body.get("PDNO", "")
+        qty = int(body.get("ORD_QTY") or 0)
+        limit = float(body.get("ORD_UNPR") or 0)
+        if not code or qty <= 0:
+            return 200, _error("주문수량을 확인하세요")
+        # Market / best-price orders fill at the current price, limit orders at their price
+        price = limit if body.get("ORD_DVSN") == "00" and limit > 0 else float(self.data.price(code)["stck_prpr"])
+        side = "sell" if tr_id.endswith("0801U") else "buy"
+        ok, result = self.data.fill(code, side, qty, price)
+        if not ok:
+            return 200, _error(result, msg_cd="APBK0952")
+        return 200, _ok(output={"KRX_FWDG_ORD_ORGNO": "00950", "ODNO": result, "ORD_TMD": datetime.now().strftime("%H%M%S")})
+
+    def _revise_cancel(self, body, tr_id):
+        # Orders fill immediately, so there is never anything left to revise or cancel
+        return 200, _error("정정/취소할 수량이 없습니다", msg_cd="APBK0918")
+
+    def _daily_ccld(self, params, tr_id):
+        start = params.get("INQR_STRT_DT", "")
+        end = params.get("INQR_END_DT", "")
+        code = params.get("PDNO", "")
+        side = params.get("SLL_BUY_DVSN_CD", "00")
+        rows = [
+            o for o in self.data.orders
+            if start <= o["ord_dt"] <= end and (not code or o["pdno"] == code)
+            and side in ("00", o["sll_buy_dvsn_cd"])
+        ]
+        if params.get("CCLD_DVSN") == "02":  # Unfilled only
+            rows = [o for o in rows if o["rmn_qty"] != "0"]
+        summary = {"tot_ord_qty": str(sum(int(o["ord_qty"]) for o in rows)),
+                   "tot_ccld_qty": str(sum(int(o["tot_ccld_qty"]) for o in rows))}
+        # Newest first; CTX_AREA_NK100 carries the offset of the next page
+        rows = rows[::-1]
+        offset = int(params.get("CTX_AREA_NK100") or 0)
+        page = rows[offset:offset + self.ccld_page_size]
+        more = offset + self.ccld_page_size < len(rows)
+        next_key = str(offset + self.ccld_page_size) if more else ""
+        payload = _ok(output1=page, output2=summary, ctx_area_fk100=f"{start}{end}" if more else "", ctx_area_nk100=next_key)
+        return 200, payload, {"tr_cont": ("M" if offset else "F") if more else ("E" if offset else "D")}
+
+ROUTES = {
+    ("POST", "/oauth2/tokenP"): FakeKISServer._token,
+    ("POST", "/oauth2/Approval"): FakeKISServer._approval,
+    ("GET", "/uapi/domestic-stock/v1/quotations/inquire-price"): FakeKISServer._inquire_price,
+    ("GET", "/uapi/domestic-stock/v1/quotations/intstock-multprice"): FakeKISServer._multi_price,
+    ("GET", "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"): FakeKISServer._daily_chart,
+    ("GET", "/uapi/domestic-stock/v1/quotations/chk-holiday"): FakeKISServer._holiday,
+    ("GET", "/uapi/domestic-stock/v1/trading/inquire-balance"): FakeKISServer._balance,
+    ("GET", "/uapi/domestic-stock/v1/trading/inquire-psbl-order"): FakeKISServer._buyable_cash,
+    ("POST", "/uapi/domestic-stock/v1/trading/order-cash"): FakeKISServer._order,
+    ("POST", "/uapi/domestic-stock/v1/trading/order-rvsecncl"): FakeKISServer._revise_cancel,
+    ("GET", "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"): FakeKISServer._daily_ccld,
+}
+
+
+if __name__ == "__main__":
+    # Serve the simulator: python -m src.kis_simulator [--port 18080] [--fixture data.json] [--latency 0.05] [--tps 18]
+    # then run the bot/benchmarks with KIS_URL_BASE=http://127.0.0.1:<port>
+    import argparse
+    parser = argparse.ArgumentParser(description="Local KIS REST API simulator")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--fixture", help="Recorded data (JSON: charts, prices, holidays, names, cash, holdings)")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--tps", type=float, default=None)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    sim = FakeKISServer(
+        SimulatorData.from_file(args.fixture) if args.fixture else None, port=args.port,
+        latency=args.latency, latency_jitter=args.jitter, tps=args.tps,
+        rate_limit_rate=args.rate_limit_rate, server_error_rate=args.server_error_rate,
+    )
+    print(f"KIS simulator on {sim.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        sim.stop()
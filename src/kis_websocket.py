@@ -0,0 +1,229 @@
+import asyncio
+import base64
+import json
+import logging
+import threading
+import websockets
+
+try:
+    from Crypto.Cipher import AES  # pycryptodome: execution notices are AES-256-CBC encrypted
+except ImportError:
+    AES = None
+
+# Real-time TR_IDs
+TR_TRADE_TICK = "H0STCNT0"  # 국내주식 실시간체결가 (KRX)
+TR_FILL_NOTICE = "H0STCNI0"  # 국내주식 실시간체결통보 (Real)
+TR_FILL_NOTICE_MOCK = "H0STCNI9"  # 국내주식 실시간체결통보 (Mock)
+
+# KIS allows ~41 real-time registrations per session (appkey)
+MAX_SUBSCRIPTIONS = 41
+
+
+def default_ws_url(is_mock):
+    """Real: ops.koreainvestment.com:21000, Mock: :31000"""
+    return "ws://ops.koreainvestment.com:31000" if is_mock else "ws://ops.koreainvestment.com:21000"
+
+
+def parse_frame(raw):
+    """
+    Parse a real-time data frame: '<encrypted>|<tr_id>|<count>|<f1^f2^...>'
+    Returns (tr_id, encrypted, count, payload) or None for JSON control messages.
+    payload is the raw '^'-joined string (still encrypted if encrypted=True).
+    """
+    if not raw or raw[0] not in ("0", "1"):
+        return None
+    parts = raw.split("|", 3)
+    if len(parts) < 4:
+        return None
+    try:
+        count = int(parts[2])
+    except ValueError:
+        count = 1
+    return parts[1], parts[0] == "1", count, parts[3]
+
+
+def split_records(payload, count):
+    """Split a '^'-joined payload carrying `count` records into lists of fields."""
+    fields = payload.split("^")
+    if count <= 1:
+        return [fields]
+    size = len(fields) // count
+    return [fields[i * size:(i + 1) * size] for i in range(count)]
+
+
+def decrypt_payload(payload, key, iv):
+    """Decrypt an encrypted frame payload (base64 AES-256-CBC, PKCS7) with the key/iv from the subscribe ack."""
+    if AES is None:
+        raise RuntimeError("pycryptodome is required to decrypt KIS real-time notices")
+    raw = AES.new(key.encode("utf-8"), AES.MODE_CBC, iv.encode("utf-8")).decrypt(base64.b64decode(payload))
+    return raw[:-raw[-1]].decode("utf-8")
+
+
+def subscribe_message(approval_key, tr_id, tr_key, subscribe=True):
+    return json.dumps({
+        "header": {
+            "approval_key": approval_key,
+            "custtype": "P",
+            "tr_type": "1" if subscribe else "2",
+            "content-type": "utf-8",
+        },
+        "body": {"input": {"tr_id": tr_id, "tr_key": tr_key}},
+    })
+
+
+class KISWebSocket:
+    """
+    KIS real-time websocket session running on a background thread.
+    - Registrations are (tr_id, tr_key) pairs, re-sent after every reconnect
+    - PINGPONG control frames are echoed back
+    - Data frames are dispatched to handlers registered per TR_ID: handler(tr_id, encrypted, count, payload)
+    - Subscription acks carrying AES iv/key (encrypted TRs) are kept in self.cipher_keys[tr_id];
+      encrypted frames are decrypted before dispatch (handlers always get plain payloads)
+    - on_connect callbacks run (on a worker thread) after every (re)connect, e.g. to resync state
+    approval_key: websocket approval key string, or a callable returning one (fetched on connect)
+    record_path: optional file to append every raw data frame to (replayable by src.ws_replay)
+    """
+    def __init__(self, url, approval_key, max_subscriptions=MAX_SUBSCRIPTIONS, record_path=None, reconnect_delay=1.0):
+        self.url = url
+        self._approval_key = approval_key
+        self.max_subscriptions = max_subscriptions
+        self.record_path = record_path
+        self.reconnect_delay = reconnect_delay
+
+        self.handlers = {}  # tr_id -> [handler]
+        self.on_connect = []  # callables, run after every (re)connect
+        self.cipher_keys = {}  # tr_id -> {'iv': ..., 'key': ...}
+        self.subscriptions = set()  # (tr_id, tr_key)
+        self._lock = threading.Lock()
+
+        self._loop = None
+        self._ws = None
+        self._current_key = None
+        self._thread = None
+        self._stopping = False
+        self.connected = threading.Event()
+
+    # --- Public API (thread-safe) ---
+    def add_handler(self, tr_id, handler):
+        self.handlers.setdefault(tr_id, []).append(handler)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="kis-ws", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stopping = True
+        if self._loop and self._ws:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout)
+        self.connected.clear()
+
+    def subscribe(self, tr_id, tr_keys):
+        """Register tr_keys for tr_id. Returns the keys accepted (bounded by max_subscriptions)."""
+        accepted = []
+        with self._lock:
+            for key in tr_keys:
+                sub = (tr_id, key)
+                if sub in self.subscriptions:
+                    accepted.append(key)
+                    continue
+                if len(self.subscriptions) >= self.max_subscriptions:
+                    logging.warning(f"[KIS-WS] Subscription limit ({self.max_subscriptions}) reached. Skipping {tr_id}:{key}")
+                    continue
+                self.subscriptions.add(sub)
+                accepted.append(key)
+                self._send_threadsafe(tr_id, key, True)
+        return accepted
+
+    def unsubscribe(self, tr_id, tr_keys):
+        with self._lock:
+            for key in tr_keys:
+                if (tr_id, key) in self.subscriptions:
+                    self.subscriptions.discard((tr_id, key))
+                    self._send_threadsafe(tr_id, key, False)
+
+    # --- Internals ---
+    def _approval(self):
+        key = self._approval_key
+        return key() if callable(key) else key
+
+    def _send_threadsafe(self, tr_id, tr_key, subscribe):
+        if self._loop and self._ws and self.connected.is_set():
+            msg = subscribe_message(self._current_key, tr_id, tr_key, subscribe)
+            asyncio.run_coroutine_threadsafe(self._ws.send(msg), self._loop)
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        while not self._stopping:
+            try:
+                self._current_key = await self._loop.run_in_executor(None, self._approval)
+                async with websockets.connect(self.url, ping_interval=None) as ws:
+                    self._ws = ws
+                    with self._lock:
+                        # Registrations added from now on are sent by subscribe() itself
+                        subs = list(self.subscriptions)
+                        self.connected.set()
+                    for tr_id, tr_key in subs:
+                        await ws.send(subscribe_message(self._current_key, tr_id, tr_key))
+                    logging.info(f"[KIS-WS] Connected to {self.url} ({len(subs)} subscriptions)")
+                    for callback in self.on_connect:
+                        self._loop.run_in_executor(None, callback)
+                    async for raw in ws:
+                        await self._on_message(ws, raw)
+            except Exception as e:
+                if not self._stopping:
+                    logging.warning(f"[KIS-WS] Connection error: {e}")
+            finally:
+                self.connected.clear()
+                self._ws = None
+            if not self._stopping:
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _on_message(self, ws, raw):
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        frame = parse_frame(raw)
+        if frame:
+            if self.record_path:
+                with open(self.record_path, "a", encoding="utf-8") as f:
+                    f.write(raw + "\n")
+            tr_id, encrypted, count, payload = frame
+            if encrypted:
+                cipher = self.cipher_keys.get(tr_id)
+                if not cipher:
+                    logging.warning(f"[KIS-WS] Encrypted {tr_id} frame before its key. Dropped.")
+                    return
+                try:
+                    frame = (tr_id, False, count, decrypt_payload(payload, cipher["key"], cipher["iv"]))
+                except Exception as e:
+                    logging.error(f"[KIS-WS] Decrypt failed ({tr_id}): {e}")
+                    return
+            for handler in self.handlers.get(tr_id, []):
+                try:
+                    handler(*frame)
+                except Exception as e:
+                    logging.error(f"[KIS-WS] Handler error ({tr_id}): {e}")
+            return
+
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            logging.debug(f"[KIS-WS] Unknown message: {raw[:80]}")
+            return
+        header = msg.get("header", {})
+        tr_id = header.get("tr_id")
+        if tr_id == "PINGPONG":
+            await ws.send(raw)
+            return
+        body = msg.get("body", {})
+        if body.get("rt_cd") not in (None, "0"):
+            logging.warning(f"[KIS-WS] {tr_id}:{header.get('tr_key')} {body.get('msg1')}")
+            return
+        output = body.get("output") or {}
+        if output.get("key"):
+            self.cipher_keys[tr_id] = {"iv": output.get("iv"), "key": output.get("key")}
+        logging.debug(f"[KIS-WS] {tr_id}:{header.get('tr_key')} {body.get('msg1')}")
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+import pandas as pd
+import config
+from src.kis_websocket import KISWebSocket, TR_TRADE_TICK, split_records, default_ws_url
+from src.utils import get_now_kst
+
+# H0STCNT0 field positions (국내주식 실시간체결가)
+F_CODE = 0
+F_TIME = 1
+F_PRICE = 2
+F_SIGN = 3
+F_CHANGE = 4
+F_CHANGE_RATE = 5
+F_OPEN = 7
+F_HIGH = 8
+F_LOW = 9
+F_ACML_VOL = 13
+
+
+class QuoteBook:
+    """
+    In-memory last price + today's bar per code, fed by real-time trade ticks.
+    Quotes use inquire-price field names (stck_prpr, stck_oprc, ...) so callers
+    can use them in place of get_current_price() output.
+    """
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._quotes = {}  # code -> (ts, quote)
+
+    def on_trade_tick(self, fields):
+        code = fields[F_CODE]
+        quote = {
+            'stck_shrn_iscd': code,
+            'stck_cntg_hour': fields[F_TIME],
+            'stck_prpr': fields[F_PRICE],
+            'prdy_vrss_sign': fields[F_SIGN],
+            'prdy_vrss': fields[F_CHANGE],
+            'prdy_ctrt': fields[F_CHANGE_RATE],
+            'stck_oprc': fields[F_OPEN],
+            'stck_hgpr': fields[F_HIGH],
+            'stck_lwpr': fields[F_LOW],
+            'acml_vol': fields[F_ACML_VOL],
+        }
+        with self._lock:
+            self._quotes[code] = (self._clock(), quote)
+
+    def get(self, code, max_age=None):
+        """Last quote for code, or None if unknown or older than max_age seconds."""
+        with self._lock:
+            entry = self._quotes.get(code)
+        if not entry:
+            return None
+        ts, quote = entry
+        if max_age is not None and self._clock() - ts > max_age:
+            return None
+        return quote
+
+    def day_bar(self, code, max_age=None):
+        """Today's bar as a dict with OHLCV column names (Date is today KST, midnight)."""
+        quote = self.get(code, max_age=max_age)
+        if not quote:
+            return None
+        return {
+            'Date': pd.Timestamp(get_now_kst().strftime("%Y-%m-%d")),
+            'Open': float(quote['stck_oprc']),
+            'High': float(quote['stck_hgpr']),
+            'Low': float(quote['stck_lwpr']),
+            'Close': float(quote['stck_prpr']),
+            'Volume': int(quote['acml_vol']),
+        }
+
+    def codes(self):
+        with self._lock:
+            return list(self._quotes.keys())
+
+
+class MarketStream:
+    """
+    Real-time market data for held / candidate symbols.
+    - Subscribes H0STCNT0 for a watchlist (bounded by the per-session registration limit)
+    - Keeps a QuoteBook that KISClient.get_current_price / get_quotes serve from while fresh
+    - Symbols beyond the limit simply keep using REST quotes
+    kis: KISClient used for the websocket approval key (ignored if approval_key is given)
+    url: websocket URL (default: config.KIS_WS_URL or the Real/Mock KIS endpoint)
+    """
+    def __init__(self, kis=None, url=None, approval_key=None, max_subscriptions=None, max_age=None, record_path=None):
+        self.kis = kis
+        is_mock = kis.is_mock if kis else False
+        self.url = url or config.KIS_WS_URL or default_ws_url(is_mock)
+        self.max_age = config.KIS_WS_QUOTE_MAX_AGE if max_age is None else max_age
+        self.book = QuoteBook()
+        self.ws = KISWebSocket(
+            self.url,
+            approval_key or kis.get_approval_key,
+            max_subscriptions=max_subscriptions or config.KIS_WS_MAX_SUBSCRIPTIONS,
+            record_path=record_path
+        )
+        self.ws.add_handler(TR_TRADE_TICK, self._on_trade)
+
+    def _on_trade(self, tr_id, encrypted, count, payload):
+        for fields in split_records(payload, count):
+            if len(fields) > F_ACML_VOL:
+                self.book.on_trade_tick(fields)
+
+    def start(self, codes=None):
+        """Start the websocket thread. Returns the codes streamed (see set_watchlist)."""
+        self.ws.start()
+        return self.set_watchlist(codes) if codes else []
+
+    def stop(self):
+        self.ws.stop()
+
+    @property
+    def connected(self):
+        return self.ws.connected.is_set()
+
+    def watchlist(self):
+        return [key for tr_id, key in self.ws.subscriptions if tr_id == TR_TRADE_TICK]
+
+    def set_watchlist(self, codes):
+        """
+        Replace the streamed symbols (order = priority when the limit is hit).
+        Returns the codes actually streamed.
+        """
+        codes = list(dict.fromkeys(codes))
+        wanted = codes[:self.ws.max_subscriptions]
+        current = set(self.watchlist())
+        # Free slots first so higher-priority codes are never crowded out by stale registrations
+        self.ws.unsubscribe(TR_TRADE_TICK, [c for c in current if c not in wanted])
+        accepted = self.ws.subscribe(TR_TRADE_TICK, wanted)
+        if len(accepted) < len(codes):
+            logging.info(f"[Stream] Streaming {len(accepted)}/{len(codes)} symbols (rest via REST quotes)")
+        return accepted
+
+    def get_quote(self, code):
+        """Fresh streamed quote for code, or None (not streamed / stale / disconnected)."""
+        if not self.connected:
+            return None
+        return self.book.get(code, max_age=self.max_age)
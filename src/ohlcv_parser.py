@@ -0,0 +1,74 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# Daily chart page as typed arrays (one element per bar)
+# date: int32 YYYYMMDD, open/high/low/close: float64, volume: int64
+OHLCVArrays = namedtuple("OHLCVArrays", ["date", "open", "high", "low", "close", "volume"])
+
+# output2 field -> (array name, dtype)
+CHART_FIELDS = (
+    ("stck_bsop_date", "date", np.int32),
+    ("stck_oprc", "open", np.float64),
+    ("stck_hgpr", "high", np.float64),
+    ("stck_lwpr", "low", np.float64),
+    ("stck_clpr", "close", np.float64),
+    ("acml_vol", "volume", np.int64),
+)
+
+
+def empty_arrays():
+    return OHLCVArrays(*(np.empty(0, dtype=dtype) for _, _, dtype in CHART_FIELDS))
+
+
+def parse_chart_rows(rows):
+    """
+    Decode FHKST03010100 output2 rows straight into typed arrays (no DataFrame).
+    Blank placeholder rows (no bars in range) are skipped. Order is kept (newest first).
+    """
+    rows = [r for r in rows if r.get("stck_bsop_date")]
+    n = len(rows)
+    if n == 0:
+        return empty_arrays()
+    # fromiter with count preallocates; numpy parses the numeric strings itself
+    return OHLCVArrays(*(
+        np.fromiter((r[field] for r in rows), dtype=dtype, count=n)
+        for field, _, dtype in CHART_FIELDS
+    ))
+
+
+def merge_pages(pages):
+    """Concatenate pages, drop duplicate dates (first page wins) and sort ascending by date."""
+    pages = [p for p in pages if len(p.date)]
+    if not pages:
+        return empty_arrays()
+    if len(pages) == 1:
+        merged = pages[0]
+    else:
+        merged = OHLCVArrays(*(np.concatenate(cols) for cols in zip(*pages)))
+    # np.unique returns sorted dates and the first index of each
+    _, idx = np.unique(merged.date, return_index=True)
+    return OHLCVArrays(*(col[idx] for col in merged))
+
+
+def dates_to_datetime64(dates):
+    """int32 YYYYMMDD -> datetime64[ns] without string parsing."""
+    dates = np.asarray(dates, dtype=np.int64)
+    years = (dates // 10000 - 1970).astype("datetime64[Y]")
+    months = (dates // 100 % 100 - 1).astype("timedelta64[M]")
+    days = (dates % 100 - 1).astype("timedelta64[D]")
+    return ((years + months) + days).astype("datetime64[ns]")
+
+
+def to_frame(arrays):
+    """Single DataFrame[Date, Open, High, Low, Close, Volume] from merged arrays."""
+    if len(arrays.date) == 0:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        "Date": dates_to_datetime64(arrays.date),
+        "Open": arrays.open,
+        "High": arrays.high,
+        "Low": arrays.low,
+        "Close": arrays.close,
+        "Volume": arrays.volume,
+    })
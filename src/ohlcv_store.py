@@ -0,0 +1,233 @@
+import os
+import glob
+import json
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from src.utils import file_lock, atomic_replace
+
+OHLCV_STORE_PATH = "data/ohlcv/ohlcv.arrow"
+LEGACY_PICKLE_DIR = "data/ohlcv"
+
+PRICE_COLS = ['Open', 'High', 'Low', 'Close']
+OHLCV_COLS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+SCHEMA = pa.schema([
+    ('code', pa.string()),
+    ('Date', pa.timestamp('ns')),
+    ('Open', pa.float64()),
+    ('High', pa.float64()),
+    ('Low', pa.float64()),
+    ('Close', pa.float64()),
+    ('Volume', pa.int64()),
+])
+
+
+class OHLCVStore:
+    """
+    Single columnar OHLCV store for the whole universe (Arrow IPC file).
+    - Rows are keyed by (code, Date) and kept sorted, so one symbol is a contiguous slice
+    - The file is memory-mapped once and sliced per code without copying; load()/load_many()
+      copy only the requested slices into DataFrames (to_pandas)
+    - The mapped table is reused until the file changes (bot and dashboard share the same file)
+    - Writes rewrite the whole file atomically under a cross-process lock, so batch them (put_many)
+    - Per-code 'synced through' dates for once-a-day gap fills live in a small JSON sidecar
+      ({path}.synced.json), so marking a symbol synced never rewrites the bars
+    """
+    def __init__(self, path=OHLCV_STORE_PATH, legacy_dir=LEGACY_PICKLE_DIR):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.synced_path = path + ".synced.json"
+        self.legacy_dir = legacy_dir
+        self._lock = threading.RLock()
+        self._table = None
+        self._mtime = None
+        self._index = {}  # code -> (offset, length)
+        self._synced = {}  # code -> YYYYMMDD of the last API gap check
+        self._synced_mtime = None
+        self._legacy_synced = {}  # markers of files written before the sidecar existed
+
+        if not os.path.exists(self.path):
+            self.migrate_legacy_pickles()
+
+    # --- Read ---
+    def _empty_table(self):
+        return SCHEMA.empty_table()
+
+    def _get_table(self):
+        """Return the memory-mapped table, re-mapping only if the file changed on disk."""
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                self._table, self._mtime, self._index, self._legacy_synced = self._empty_table(), None, {}, {}
+                return self._table
+
+            if self._table is None or mtime != self._mtime:
+                source = pa.memory_map(self.path, 'r')
+                table = ipc.open_file(source).read_all()
+                self._table = table
+                self._mtime = mtime
+                self._index = self._build_index(table)
+                meta = table.schema.metadata or {}
+                self._legacy_synced = json.loads(meta.get(b'synced', b'{}'))
+            return self._table
+
+    @staticmethod
+    def _build_index(table):
+        """code -> (offset, length) for the contiguous (sorted) code blocks."""
+        if table.num_rows == 0:
+            return {}
+        codes = table.column('code').to_numpy(zero_copy_only=False)
+        starts = np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+        ends = np.append(starts[1:], len(codes))
+        return {codes[s]: (int(s), int(e - s)) for s, e in zip(starts, ends)}
+
+    def codes(self):
+        self._get_table()
+        return list(self._index.keys())
+
+    def load(self, code):
+        """One symbol as DataFrame[Date, Open, High, Low, Close, Volume] (ascending)."""
+        table = self._get_table()
+        loc = self._index.get(code)
+        if loc is None:
+            return pd.DataFrame()
+        offset, length = loc
+        return table.slice(offset, length).drop_columns(['code']).to_pandas()
+
+    def load_many(self, codes=None):
+        """Returns dict code -> DataFrame from a single read of the store."""
+        table = self._get_table()
+        wanted = self._index.keys() if codes is None else codes
+        result = {}
+        for code in wanted:
+            loc = self._index.get(code)
+            if loc is None:
+                continue
+            result[code] = table.slice(*loc).drop_columns(['code']).to_pandas()
+        return result
+
+    def last_date(self, code):
+        table = self._get_table()
+        loc = self._index.get(code)
+        if loc is None:
+            return None
+        offset, length = loc
+        return pd.Timestamp(table.column('Date')[offset + length - 1].as_py())
+
+    def _get_synced(self):
+        """code -> YYYYMMDD map from the sidecar, re-read only if it changed on disk."""
+        with self._lock:
+            try:
+                mtime = os.stat(self.synced_path).st_mtime_ns
+            except FileNotFoundError:
+                self._get_table()
+                return self._legacy_synced
+            if mtime != self._synced_mtime:
+                try:
+                    with open(self.synced_path, "r") as f:
+                        self._synced = json.load(f)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"[OHLCVStore] Unreadable synced markers {self.synced_path}: {e}")
+                    self._synced = {}
+                self._synced_mtime = mtime
+            return self._synced
+
+    def synced_date(self, code):
+        """YYYYMMDD of the last day this code was gap-checked against the API (or None)."""
+        return self._get_synced().get(code)
+
+    # --- Write ---
+    @staticmethod
+    def _to_table(code, df):
+        df = df[OHLCV_COLS].copy()
+        df['Date'] = pd.to_datetime(df['Date']).astype('datetime64[ns]')
+        df[PRICE_COLS] = df[PRICE_COLS].astype('float64')
+        df['Volume'] = df['Volume'].fillna(0).astype('int64')
+        df = df.drop_duplicates(subset=['Date'], keep='last').sort_values('Date')
+        df.insert(0, 'code', code)
+        return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+    def put_many(self, frames, merge=False, synced=None):
+        """
+        Write several symbols in one atomic rewrite.
+        Every call with frames re-reads and rewrites the whole file (all symbols), so a one-symbol
+        put/append costs as much as a universe-wide write: collect updates and write them in one call.
+        frames: dict code -> DataFrame
+        merge=False: replace all rows of each code, merge=True: upsert bars by Date
+        synced: optional dict code -> YYYYMMDD to record as gap-checked (sidecar only)
+        """
+        frames = {code: df for code, df in frames.items() if df is not None and not df.empty}
+        if not frames and not synced:
+            return
+
+        with self._lock, file_lock(self.lock_path):
+            # Bars first: a reader must never see a code marked synced before its bars land
+            if frames:
+                self._write_frames(frames, merge)
+            if synced:
+                markers = dict(self._get_synced())
+                markers.update(synced)
+                atomic_replace(self.synced_path, lambda f: json.dump(markers, f), mode="w")
+                self._synced, self._synced_mtime = markers, os.stat(self.synced_path).st_mtime_ns
+
+    def _write_frames(self, frames, merge):
+        """Rewrite the store with frames replacing (or merged into) their codes. Caller holds the locks."""
+        current = self._get_table()
+        keep = current
+        if current.num_rows:
+            codes = current.column('code').to_numpy(zero_copy_only=False)
+            mask = ~np.isin(codes, list(frames.keys()))
+            keep = current.filter(pa.array(mask))
+
+        parts = [keep]
+        for code, df in frames.items():
+            if merge:
+                existing = self.load(code)
+                if not existing.empty:
+                    df = pd.concat([existing, df[OHLCV_COLS]], ignore_index=True)
+            parts.append(self._to_table(code, df))
+
+        table = pa.concat_tables(parts).sort_by([('code', 'ascending'), ('Date', 'ascending')])
+        if self._legacy_synced and not os.path.exists(self.synced_path):
+            # Keep pre-sidecar markers until the first sidecar write takes them over
+            table = table.replace_schema_metadata({'synced': json.dumps(self._legacy_synced)})
+
+        def write(f):
+            with ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+        atomic_replace(self.path, write)
+        # Force re-map on next read
+        self._table, self._mtime = None, None
+
+    def put(self, code, df):
+        """Replace all bars of one symbol."""
+        self.put_many({code: df})
+
+    def append(self, code, df, synced=None):
+        """Upsert bars of one symbol (same Date -> new bar wins)."""
+        self.put_many({code: df}, merge=True, synced={code: synced} if synced else None)
+
+    # --- Migration ---
+    def migrate_legacy_pickles(self):
+        """Import the old per-symbol data/ohlcv/{code}.pkl cache into the store once."""
+        pkl_files = glob.glob(os.path.join(self.legacy_dir, "*.pkl"))
+        if not pkl_files:
+            return 0
+
+        frames = {}
+        for pkl in pkl_files:
+            code = os.path.splitext(os.path.basename(pkl))[0]
+            try:
+                frames[code] = pd.read_pickle(pkl)
+            except Exception as e:
+                logging.warning(f"[OHLCVStore] Skipping unreadable legacy cache {pkl}: {e}")
+
+        self.put_many(frames)
+        logging.info(f"[OHLCVStore] Migrated {len(frames)} legacy pickle caches into {self.path}")
+        return len(frames)
@@ -0,0 +1,129 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import config
+
+# Per-order result status
+STATUS_SUBMITTED = "submitted"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+
+class OrderExecutor:
+    """
+    Submits a whole target list in one pass instead of one order at a time.
+    - Buys are sized together from one quote snapshot (get_quotes) and one buying-power
+      figure (the caller's cash, else get_buyable_cash); each sized order reserves its amount
+      from the shared budget
+    - Orders go out concurrently (up to the order TPS budget); the KISRateLimiter order lane
+      paces them, and _send_request handles EGW00201 retries
+    - Returns a per-order report: dicts with code, name, side, qty, price (reference price
+      used for sizing, 0 for sells), status (submitted / failed / skipped), msg, elapsed_ms
+    """
+    def __init__(self, kis, max_workers=None):
+        self.kis = kis
+        self.max_workers = max_workers or config.KIS_ORDER_CONCURRENCY
+
+    def _workers(self, count):
+        order_tps = int(self.kis.rate_limiter.limits.get("order", 1))
+        return max(1, min(count, self.max_workers, order_tps))
+
+    # --- Sizing ---
+    def size_buys(self, targets, amount_per_stock, cash=None):
+        """
+        Split the day's buying power over targets (in priority order).
+        cash: orderable cash already known (e.g. a fresh balance max_buy_amt) is used as the
+        budget as-is; without it inquire-psbl-order max_buy is fetched once (if that fails, each
+        target gets the full amount per stock, like the serial loop). A target is skipped once
+        the remaining budget is below half of amount_per_stock (same rule as the serial loop).
+        Returns (report, orders): report dicts for every target (in order) and the sized subset.
+        """
+        quotes = self.kis.get_quotes([t['code'] for t in targets])
+        if cash is not None:
+            budget = float(cash)
+        else:
+            buyable = self.kis.get_buyable_cash()
+            if buyable is None:
+                # Don't cancel the day's buys over one failed check
+                logging.error("⚠️ Failed to check buying power, sizing at the full amount per stock")
+                budget = float("inf")
+            else:
+                budget = float(buyable['max_buy'])
+
+        report, orders = [], []
+        for target in targets:
+            entry = _entry(target, "buy")
+            report.append(entry)
+            curr = quotes.get(target['code'])
+            if budget < amount_per_stock * 0.5:
+                entry['msg'] = f"Insufficient cash ({budget:,.0f})"
+            elif not curr or float(curr.get('stck_prpr') or 0) <= 0:
+                entry['msg'] = "No quote"
+            else:
+                price = float(curr['stck_prpr'])
+                qty = int(amount_per_stock / price)
+                if qty * price > budget:
+                    logging.warning(f"⚠️ Insufficient Cash for {target['name']}. Needed: {qty * price:.0f}, Max: {budget:.0f}. Adjusting qty.")
+                    qty = int(budget / price)
+                entry.update(qty=qty, price=price)
+                if qty < 1:
+                    entry['msg'] = "Qty adjusted to 0"
+                else:
+                    budget -= qty * price
+                    orders.append(entry)
+                    continue
+            logging.warning(f"⚠️ Skipping {target['name']}: {entry['msg']}")
+        return report, orders
+
+    # --- Submission ---
+    def submit(self, orders, order_type="01"):
+        """Send sized orders concurrently (price 0 = market). Fills in status/msg/elapsed_ms in place."""
+        def send(entry):
+            started = time.perf_counter()
+            try:
+                success, msg = self.kis.send_order(entry['code'], entry['qty'], side=entry['side'], price=0, order_type=order_type)
+            except Exception as e:
+                success, msg = False, str(e)
+            entry.update(status=STATUS_SUBMITTED if success else STATUS_FAILED, msg=msg,
+                         elapsed_ms=round((time.perf_counter() - started) * 1000, 1))
+            return entry
+
+        if not orders:
+            return []
+        with ThreadPoolExecutor(max_workers=self._workers(len(orders)), thread_name_prefix="order") as pool:
+            return list(pool.map(send, orders))
+
+    def buy(self, targets, amount_per_stock, cash=None, order_type="01"):
+        """Size and submit buys for targets. Returns the report in target order."""
+        report, orders = self.size_buys(targets, amount_per_stock, cash=cash)
+        self.submit(orders, order_type=order_type)
+        return report
+
+    def sell(self, targets, order_type="01"):
+        """Submit sells for targets (dicts with code, name, qty). Returns the report in target order."""
+        report = []
+        for target in targets:
+            entry = _entry(target, "sell")
+            entry['qty'] = int(target.get('qty', 0))
+            if entry['qty'] < 1:
+                entry['msg'] = "No quantity"
+            report.append(entry)
+        self.submit([e for e in report if e['qty'] > 0], order_type=order_type)
+        return report
+
+
+def _entry(target, side):
+    return {'code': target['code'], 'name': target['name'], 'side': side, 'qty': 0, 'price': 0.0,
+            'status': STATUS_SKIPPED, 'msg': "", 'elapsed_ms': 0.0}
+
+
+def summarize(report):
+    """One line per order for logs / Telegram."""
+    icons = {STATUS_SUBMITTED: "✅", STATUS_FAILED: "❌", STATUS_SKIPPED: "⏭️"}
+    lines = []
+    for e in report:
+        line = f"{icons[e['status']]} {e['side'].upper()} {e['name']}({e['code']}) {e['qty']}주"
+        if e['status'] != STATUS_SUBMITTED:
+            line += f" - {e['msg']}"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,52 @@
+import threading
+import time
+
+
+class QuoteCache:
+    """
+    Short-TTL quote snapshot cache (code -> inquire-price style dict).
+    Entries from the full single-symbol TR (inquire-price) are marked `full`;
+    multi-symbol snapshots only carry price/volume fields and must not be used
+    where status fields (iscd_stat_cls_code, mrkt_warn_cls_code ...) are required.
+    A partial snapshot merged into a full entry refreshes the prices only: the entry
+    stays `full` for the TTL of its last full fetch.
+    """
+    def __init__(self, ttl, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}  # code -> (price ts, data, full ts or None)
+
+    def get(self, code, full_only=False, max_age=None):
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            entry = self._entries.get(code)
+        if not entry:
+            return None
+        ts, data, full_ts = entry
+        now = self._clock()
+        if now - ts > max_age:
+            return None
+        # Status fields age from the last full fetch, not from later partial price merges
+        if full_only and (full_ts is None or now - full_ts > max_age):
+            return None
+        return data
+
+    def put(self, code, data, full=True):
+        with self._lock:
+            now = self._clock()
+            # Never downgrade a fresh full entry to a partial one
+            entry = self._entries.get(code)
+            if entry and entry[2] is not None and not full and now - entry[2] <= self.ttl:
+                merged = dict(entry[1])
+                merged.update(data)
+                self._entries[code] = (now, merged, entry[2])
+                return
+            self._entries[code] = (now, data, now if full else None)
+
+    def invalidate(self, code=None):
+        with self._lock:
+            if code is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(code, None)
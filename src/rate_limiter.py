@@ -0,0 +1,193 @@
+import threading
+import heapq
+import itertools
+import time
+import logging
+import config
+from src.resilience import AdaptiveRate
+
+# Float tolerance so accumulated refill rounding never leaves a caller spinning on a ~0s wait
+_EPSILON = 1e-9
+
+# Endpoint classes (each class has its own TPS budget under the shared account budget)
+ENDPOINT_ORDER = "order"       # order-cash, order-rvsecncl
+ENDPOINT_ACCOUNT = "account"   # inquire-balance, inquire-psbl-order, inquire-daily-ccld
+ENDPOINT_QUOTE = "quote"       # inquire-price, chk-holiday
+ENDPOINT_HISTORY = "history"   # inquire-daily-itemchartprice
+
+ENDPOINT_CLASSES = (ENDPOINT_ORDER, ENDPOINT_ACCOUNT, ENDPOINT_QUOTE, ENDPOINT_HISTORY)
+
+# Priority lanes for the shared budget (lower value = served first)
+# Orders > Balance/Fills > Quotes > History (2-year chart pagination never blocks an order)
+ENDPOINT_PRIORITY = {
+    ENDPOINT_ORDER: 0,
+    ENDPOINT_ACCOUNT: 1,
+    ENDPOINT_QUOTE: 2,
+    ENDPOINT_HISTORY: 3,
+}
+
+# TR_ID -> Endpoint Class (Real 'T' / Mock 'V' prefixes are both listed)
+TR_ID_CLASSES = {
+    # Orders
+    "TTTC0802U": ENDPOINT_ORDER, "VTTC0802U": ENDPOINT_ORDER,   # Buy
+    "TTTC0801U": ENDPOINT_ORDER, "VTTC0801U": ENDPOINT_ORDER,   # Sell
+    "TTTC0803U": ENDPOINT_ORDER, "VTTC0803U": ENDPOINT_ORDER,   # Revise/Cancel
+    # Account
+    "TTTC8434R": ENDPOINT_ACCOUNT, "VTTC8434R": ENDPOINT_ACCOUNT, # Balance
+    "TTTC8908R": ENDPOINT_ACCOUNT, "VTTC8908R": ENDPOINT_ACCOUNT, # Buyable Cash
+    "TTTC8001R": ENDPOINT_ACCOUNT, "VTTC8001R": ENDPOINT_ACCOUNT, # Daily Conclusion
+    "CTSC9115R": ENDPOINT_ACCOUNT, "VTSC9115R": ENDPOINT_ACCOUNT, # Daily Conclusion (older than 3 months)
+    # Quotes
+    "FHKST01010100": ENDPOINT_QUOTE,  # Current Price
+    "FHKST11300006": ENDPOINT_QUOTE,  # Multi-symbol Current Price
+    "CTCA0903R": ENDPOINT_QUOTE,      # Holiday Check
+    # History
+    "FHKST03010100": ENDPOINT_HISTORY, # Daily Item Chart Price
+    "FHKST01010400": ENDPOINT_HISTORY, # Daily Price
+}
+
+
+def classify_tr_id(tr_id):
+    """Map a KIS TR_ID to its endpoint class. Unknown TR_IDs are treated as quotes."""
+    if tr_id in TR_ID_CLASSES:
+        return TR_ID_CLASSES[tr_id]
+    # Account-side TR_IDs: T/V + TTC... ('U' = write, 'R' = read)
+    if tr_id[:4] in ("TTTC", "VTTC"):
+        return ENDPOINT_ORDER if tr_id.endswith("U") else ENDPOINT_ACCOUNT
+    return ENDPOINT_QUOTE
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    rate: tokens added per second, capacity: max burst size.
+    acquire() blocks only as long as the bucket actually requires.
+    """
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(max(1, capacity))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._last
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens if available.
+        Returns 0.0 on success, otherwise the seconds to wait before retrying.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens - _EPSILON:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available. Returns total seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+
+class KISRateLimiter:
+    """
+    Central TPS limiter for every KIS REST call.
+    - One shared bucket per appkey (KIS TPS is counted per appkey)
+    - One bucket per endpoint class (order / account / quote / history)
+    - Budgets differ for Real vs Mock (openapivts) environments (see config.KIS_TPS_LIMITS)
+    - The shared bucket is handed out by priority lane (ENDPOINT_PRIORITY), FIFO within a lane
+    - Server feedback (EGW00201) lowers the shared TPS target, successes restore it (AIMD)
+    """
+    def __init__(self, is_mock=False, limits=None, clock=time.monotonic, sleep=time.sleep):
+        self.env = "mock" if is_mock else "real"
+        self.limits = limits or config.KIS_TPS_LIMITS[self.env]
+        burst = self.limits.get("burst", 1)
+
+        self.total = TokenBucket(self.limits["total"], burst, clock=clock, sleep=sleep)
+        self.buckets = {
+            cls: TokenBucket(self.limits.get(cls, self.limits["total"]), burst, clock=clock, sleep=sleep)
+            for cls in ENDPOINT_CLASSES
+        }
+        self._clock = clock
+        self._sleep = sleep
+        self.adaptive = AdaptiveRate(
+            self.total, ceiling=self.limits["total"],
+            decrease=config.KIS_TPS_DECREASE, recovery=config.KIS_TPS_RECOVERY, clock=clock
+        )
+
+        # Waiting queue for the shared bucket: heap of (priority, seq)
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def acquire(self, tr_id, priority=None):
+        """
+        Block until a request for tr_id fits into both its class budget and the shared budget.
+        priority: override the lane derived from the TR_ID (0 = highest).
+        Returns seconds waited.
+        """
+        cls = classify_tr_id(tr_id)
+        if priority is None:
+            priority = ENDPOINT_PRIORITY[cls]
+        waited = self.buckets[cls].acquire()
+        waited += self._acquire_shared(priority)
+        if waited > 1.0:
+            logging.debug(f"[KIS] RateLimiter: {tr_id} ({cls}) waited {waited:.2f}s")
+        return waited
+
+    def on_rate_limited(self):
+        """Server rejected a call for TPS (EGW00201): lower the shared rate."""
+        return self.adaptive.penalize()
+
+    def on_success(self):
+        """Call accepted: let the shared rate recover towards the configured limit."""
+        return self.adaptive.reward()
+
+    def _acquire_shared(self, priority):
+        """
+        Take one token from the shared bucket in priority order.
+        Only the head of the queue may take a token. The head sleeps for at most one
+        refill interval, so a higher-priority arrival takes over the next free token.
+        """
+        ticket = (priority, next(self._seq))
+        start = self._clock()
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                with self._cond:
+                    if self._waiters[0] != ticket:
+                        # Not our turn: wait until the head takes its token
+                        self._cond.wait(timeout=1.0)
+                        continue
+                    wait = self.total.try_acquire()
+                    if wait <= 0:
+                        heapq.heappop(self._waiters)
+                        self._cond.notify_all()
+                        return self._clock() - start
+                self._sleep(wait)
+        except BaseException:
+            with self._cond:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                self._cond.notify_all()
+            raise
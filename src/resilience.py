@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+import logging
+
+
+class Backoff:
+    """
+    Exponential backoff with full jitter: delay(n) is uniform in [0, min(cap, base * 2^n)].
+    Jitter keeps concurrent workers that hit the same limit from retrying in lockstep.
+    """
+    def __init__(self, base=0.25, cap=8.0, rng=random.random):
+        self.base = base
+        self.cap = cap
+        self._rng = rng
+
+    def delay(self, attempt):
+        return self._rng() * min(self.cap, self.base * (2 ** attempt))
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the endpoint's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+    - closed: calls pass; `failure_threshold` consecutive failures open the circuit
+    - open: calls are refused for `reset_timeout` seconds
+    - half-open: one probe call is let through; success closes, failure re-opens
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                now = self._clock()
+                # One probe at a time (a probe that never reported back is replaced after reset_timeout)
+                if not self._probing or now - self._probe_started >= self.reset_timeout:
+                    self._probing = True
+                    self._probe_started = now
+                    return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logging.info(f"[KIS] Circuit closed: {self.name}")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logging.warning(f"[KIS] Circuit open: {self.name} ({self.failures} failures, retry in {self.reset_timeout:.0f}s)")
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+
+
+class AdaptiveRate:
+    """
+    AIMD feedback for a TokenBucket's rate.
+    - penalize(): multiplicative decrease (at most once per `cooldown`, so a burst of
+      concurrent rate-limit errors counts as one signal)
+    - reward(): additive increase of `recovery` TPS per second since the last change, up to `ceiling`
+    Throughput settles just under the server's real limit instead of oscillating around it.
+    """
+    def __init__(self, bucket, ceiling, floor=0.5, decrease=0.8, recovery=0.5, cooldown=1.0, clock=time.monotonic):
+        self.bucket = bucket
+        self.ceiling = float(ceiling)
+        self.floor = float(floor)
+        self.decrease = decrease
+        self.recovery = recovery
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_decrease = None
+        self._last_change = clock()
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def penalize(self):
+        with self._lock:
+            now = self._clock()
+            if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+                return self.bucket.rate
+            new_rate = max(self.floor, self.bucket.rate * self.decrease)
+            self.bucket.set_rate(new_rate)
+            self._last_decrease = now
+            self._last_change = now
+            logging.warning(f"[KIS] Rate limited by server. TPS target -> {new_rate:.2f}")
+            return new_rate
+
+    def reward(self):
+        with self._lock:
+            rate = self.bucket.rate
+            if rate >= self.ceiling:
+                return rate
+            now = self._clock()
+            new_rate = min(self.ceiling, rate + self.recovery * (now - self._last_change))
+            self.bucket.set_rate(new_rate)
+            self._last_change = now
+            return new_rate
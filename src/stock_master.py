@@ -0,0 +1,183 @@
+import os
+import ast
+import json
+import logging
+import threading
+from src.utils import get_now_kst, atomic_replace
+
+STOCK_MASTER_PATH = "data/stock_master.json"
+
+# Index -> (seed list file, market)
+INDEX_LIST_FILES = {
+    "KOSDAQ150": ("data/kosdaq150_list.txt", "KOSDAQ"),
+    "KOSPI200": ("data/kospi200_list.txt", "KOSPI"),
+}
+
+# Index -> KRX index ticker (pykrx)
+INDEX_TICKERS = {
+    "KOSDAQ150": "2203",
+    "KOSPI200": "1028",
+}
+
+
+def parse_list_file(path):
+    """Parse a "{'code': ..., 'name': ...}," per line list file."""
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.endswith(','): line = line[:-1]
+            if not line: continue
+            try:
+                items.append(ast.literal_eval(line))
+            except (ValueError, SyntaxError):
+                pass
+    return items
+
+
+class StockMaster:
+    """
+    Local stock master table (data/stock_master.json).
+    - code -> {code, name, market, indices, listed}, plus name -> code and ordered index members
+    - Loaded once into memory; lookups never touch the network
+    - Seeded from the bundled index list files when no master exists yet
+    - refresh() rebuilds it from KRX (pykrx, optional) and is meant for the 05:00 job
+    """
+    def __init__(self, path=STOCK_MASTER_PATH, list_files=INDEX_LIST_FILES):
+        self.path = path
+        self.list_files = list_files
+        self._lock = threading.RLock()
+        self._loaded = False
+        self.updated = None
+        self._stocks = {}  # code -> record
+        self._indices = {}  # index -> [code] (KRX order)
+        self._by_name = {}  # name -> code
+
+    # --- Load / Save ---
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    self._set(data.get("stocks", {}), data.get("indices", {}), data.get("updated"))
+                    return
+                except Exception as e:
+                    logging.error(f"[StockMaster] Failed to load {self.path}: {e}")
+            stocks, indices = self._from_list_files()
+            if stocks:
+                self._set(stocks, indices, None)
+                self._save()
+
+    def _set(self, stocks, indices, updated):
+        self._stocks = stocks
+        self._indices = indices
+        self.updated = updated
+        self._by_name = {rec['name']: code for code, rec in stocks.items() if rec.get('name')}
+
+    def _save(self):
+        data = {"updated": self.updated, "indices": self._indices, "stocks": self._stocks}
+        try:
+            atomic_replace(self.path, lambda f: json.dump(data, f, ensure_ascii=False, indent=1), mode="w")
+        except Exception as e:
+            logging.error(f"[StockMaster] Failed to save {self.path}: {e}")
+
+    def _from_list_files(self):
+        stocks, indices = {}, {}
+        for index, (path, market) in self.list_files.items():
+            if not os.path.exists(path):
+                continue
+            try:
+                items = parse_list_file(path)
+            except Exception as e:
+                logging.error(f"[StockMaster] List File Load Error ({path}): {e}")
+                continue
+            indices[index] = [item['code'] for item in items]
+            for item in items:
+                rec = stocks.setdefault(item['code'], {
+                    'code': item['code'], 'name': item.get('name', ''), 'market': market,
+                    'indices': [], 'listed': True
+                })
+                rec['indices'].append(index)
+        return stocks, indices
+
+    # --- Lookups ---
+    def get(self, code):
+        self._ensure_loaded()
+        return self._stocks.get(code)
+
+    def name(self, code, default=None):
+        rec = self.get(code)
+        return rec['name'] if rec and rec.get('name') else default
+
+    def code_of(self, name):
+        self._ensure_loaded()
+        return self._by_name.get(name)
+
+    def is_listed(self, code):
+        rec = self.get(code)
+        return bool(rec and rec.get('listed', True))
+
+    def members(self, index, listed_only=True):
+        """Index constituents as [{'code', 'name'}] in KRX order."""
+        self._ensure_loaded()
+        result = []
+        for code in self._indices.get(index, []):
+            rec = self._stocks.get(code)
+            if not rec or (listed_only and not rec.get('listed', True)):
+                continue
+            result.append({'code': code, 'name': rec['name']})
+        return result
+
+    # --- Refresh (off the hot path) ---
+    def refresh(self):
+        """
+        Rebuild from KRX listings + index constituents (pykrx). Falls back to the list files
+        for anything pykrx can't provide. Codes that left the market are kept with listed=False.
+        Returns the number of stocks in the master.
+        """
+        self._ensure_loaded()
+        stocks, indices = self._from_list_files()
+        listed_codes = None
+        try:
+            from pykrx import stock
+            listed_codes = set()
+            for market in ("KOSPI", "KOSDAQ"):
+                for ticker in stock.get_market_ticker_list(market=market):
+                    listed_codes.add(ticker)
+                    rec = stocks.setdefault(ticker, {'code': ticker, 'indices': [], 'listed': True})
+                    rec['market'] = market
+                    # Names come from pykrx' in-memory ticker table (loaded once per listing)
+                    rec['name'] = stock.get_market_ticker_name(ticker)
+            for index, ticker in INDEX_TICKERS.items():
+                members = list(stock.get_index_portfolio_deposit_file(ticker))
+                if not members:
+                    continue
+                indices[index] = members
+                for rec in stocks.values():
+                    if index in rec['indices']:
+                        rec['indices'].remove(index)
+                for code in members:
+                    if code in stocks:
+                        stocks[code]['indices'].append(index)
+        except Exception as e:
+            logging.warning(f"[StockMaster] KRX listing unavailable, using list files only: {e}")
+            listed_codes = None
+
+        with self._lock:
+            # Keep delisted codes (names for old trade records / exclusion list)
+            for code, rec in self._stocks.items():
+                if code not in stocks:
+                    stocks[code] = dict(rec, indices=[], listed=False if listed_codes is not None else rec.get('listed', True))
+            if listed_codes is not None:
+                for code, rec in stocks.items():
+                    rec['listed'] = code in listed_codes
+            self._set(stocks, indices, get_now_kst().strftime("%Y%m%d"))
+            self._save()
+        logging.info(f"[StockMaster] Refreshed: {len(stocks)} stocks, " + ", ".join(f"{k} {len(v)}" for k, v in indices.items()))
+        return len(stocks)
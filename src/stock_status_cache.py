@@ -0,0 +1,112 @@
+import os
+import json
+import logging
+import threading
+from src.utils import get_now_kst, atomic_replace
+
+STOCK_STATUS_PATH = "data/stock_status.json"
+
+# Status fields of inquire-price (FHKST01010100) kept per code
+STATUS_FIELDS = ('iscd_stat_cls_code', 'mrkt_warn_cls_code', 'mang_issu_cls_code', 'invt_caful_yn')
+
+
+def evaluate_status(status):
+    """
+    Danger rules on inquire-price status fields.
+    Returns: (is_dangerous: bool, reason: str)
+    """
+    # 1. Issue Status Class Code (iscd_stat_cls_code)
+    # 55: Normal (KOSPI 200), 57: Normal
+    # 58: Trading Suspended (confirmed with Fadu)
+    # 51: Admin Issue, 52: Inv Caution, 53: Warning, 54: Danger
+    iscd_code = status.get('iscd_stat_cls_code', '')
+    if iscd_code in ['51', '52', '53', '54', '58', '59']:
+        return True, f"Bad Status Code ({iscd_code})"
+
+    # 2. Market Warning (mrkt_warn_cls_code)
+    # 00: Normal, 01: Caution, 02: Warning, 03: Danger
+    warn_code = status.get('mrkt_warn_cls_code', '00')
+    if warn_code != '00':
+        return True, f"Market Warning ({warn_code})"
+
+    # 3. Management Issue (mang_issu_cls_code)
+    # N: Normal. Not 'N' -> Issue (assuming 'Y' or code)
+    mang_code = status.get('mang_issu_cls_code', 'N')
+    if mang_code != 'N':
+        return True, f"Management Issue ({mang_code})"
+
+    # 4. Investment Caution (invt_caful_yn)
+    if status.get('invt_caful_yn', 'N') == 'Y':
+        return True, "Investment Caution"
+
+    return False, "Safe"
+
+
+def is_managed(status):
+    """Managed item (관리종목): admin issue status or management issue flag."""
+    return status.get('iscd_stat_cls_code', '') == '51' or status.get('mang_issu_cls_code', 'N') != 'N'
+
+
+class StockStatusCache:
+    """
+    Per-trading-day cache of stock status fields (data/stock_status.json).
+    Warning / managed designations change at most once a day, so entries are valid
+    for the KST date they were fetched on and the whole file is discarded on a new day.
+    """
+    def __init__(self, path=STOCK_STATUS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._date = None
+        self._status = {}  # code -> {field: value}
+        self._load()
+
+    def _today(self):
+        return get_now_kst().strftime("%Y%m%d")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._date = data.get("date")
+            self._status = data.get("status", {})
+        except Exception as e:
+            logging.error(f"[StatusCache] Failed to load {self.path}: {e}")
+
+    def _save(self):
+        data = {"date": self._date, "status": self._status}
+        try:
+            atomic_replace(self.path, lambda f: json.dump(data, f, ensure_ascii=False), mode="w")
+        except Exception as e:
+            logging.error(f"[StatusCache] Failed to save {self.path}: {e}")
+
+    def _roll(self):
+        today = self._today()
+        if self._date != today:
+            self._date = today
+            self._status = {}
+
+    def get(self, code):
+        """Today's status fields for code, or None if not fetched today."""
+        with self._lock:
+            if self._date != self._today():
+                return None
+            return self._status.get(code)
+
+    def put_many(self, statuses):
+        """statuses: dict code -> inquire-price output (only STATUS_FIELDS are kept)."""
+        if not statuses:
+            return
+        with self._lock:
+            self._roll()
+            for code, data in statuses.items():
+                self._status[code] = {k: data.get(k) for k in STATUS_FIELDS if data.get(k) is not None}
+            self._save()
+
+    def put(self, code, data):
+        self.put_many({code: data})
+
+    def count(self):
+        with self._lock:
+            return len(self._status) if self._date == self._today() else 0
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import logging
 import config
+from src.indicator_panel import calculate_panel
 
 class Strategy:
     def __init__(self):
@@ -54,6 +55,15 @@ class Strategy:
         
         return df
     
+    def calculate_panel(self, close, present=None):
+        """
+        Universe-wide RSI and SMA in one pass.
+        close: DataFrame of Close prices (dates x codes), NaN where a code has no row.
+        present: optional row mask from close_panel(..., with_present=True) (keeps NaN-Close rows).
+        Returns {'RSI': DataFrame, 'SMA': DataFrame}, equal to calculate_indicators per code.
+        """
+        return calculate_panel(close, self.rsi_window, self.sma_window, present)
+
     def calculate_extended_indicators(self, df):
         """
         AI 프롬프트용 확장 지표 계산.
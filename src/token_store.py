@@ -0,0 +1,57 @@
+import json
+import time
+import logging
+from collections import namedtuple
+from src.utils import file_lock, atomic_replace
+
+CachedToken = namedtuple("CachedToken", ["access_token", "expires_at"])
+
+
+class TokenStore:
+    """
+    Access token file shared by every local process (bot, dashboard, scripts).
+    - Writes replace the file atomically, so readers never see a half-written token
+    - Refresh is single-flight across processes: issuers serialize on `<path>.lock`
+      and re-read the file first, so only one process calls /oauth2/tokenP
+    - A token rejected by the server is never deleted; it is replaced only if the file
+      still holds that exact token (another process may already have refreshed it)
+    """
+    def __init__(self, path="token.json"):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    def read(self):
+        """Cached token if the file holds one that has not expired, else None."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if time.time() < data['token_expired_at']:
+                return CachedToken(data['access_token'], data['token_expired_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def write(self, access_token, expires_at):
+        data = {'access_token': access_token, 'token_expired_at': expires_at}
+        atomic_replace(self.path, lambda f: json.dump(data, f), mode="w")
+
+    def get_or_refresh(self, issue, rejected_token=None):
+        """
+        Valid token from the file, issuing a new one only when needed.
+        issue() -> (access_token, expires_at); called with the cross-process lock held.
+        rejected_token: token the server just refused (EGW00123); never returned again.
+        """
+        cached = self.read()
+        if cached and cached.access_token != rejected_token:
+            return cached
+        with file_lock(self.lock_path):
+            # Re-check: another process may have refreshed while we waited for the lock
+            cached = self.read()
+            if cached and cached.access_token != rejected_token:
+                return cached
+            access_token, expires_at = issue()
+            try:
+                self.write(access_token, expires_at)
+            except Exception as e:
+                logging.error(f"[KIS] Failed to save token ({self.path}): {e}")
+            return CachedToken(access_token, expires_at)
@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime, timedelta
+from src.kis_client import period_trades_cutoff
+
+# Calendar days per inquire-daily-ccld query during a backfill
+BACKFILL_CHUNK_DAYS = 30
+
+
+def date_chunks(start_date, end_date, chunk_days=BACKFILL_CHUNK_DAYS):
+    """
+    Split [start_date, end_date] (YYYYMMDD) into (start, end) ranges of at most chunk_days.
+    Ranges never straddle the 3-month cutoff, since each side uses a different TR_ID.
+    """
+    cutoff = period_trades_cutoff()
+    cursor = datetime.strptime(start_date, "%Y%m%d")
+    last = datetime.strptime(end_date, "%Y%m%d")
+    while cursor <= last:
+        chunk_end = min(cursor + timedelta(days=chunk_days - 1), last)
+        chunk_start_str = cursor.strftime("%Y%m%d")
+        if chunk_start_str < cutoff <= chunk_end.strftime("%Y%m%d"):
+            chunk_end = datetime.strptime(cutoff, "%Y%m%d") - timedelta(days=1)
+        yield chunk_start_str, chunk_end.strftime("%Y%m%d")
+        cursor = chunk_end + timedelta(days=1)
+
+
+def aggregate_fills(rows):
+    """
+    inquire-daily-ccld output1 rows -> trade_history records, one per (date, code, action)
+    with the day's total quantity and volume-weighted price (same rule as sync_trades_at_close).
+    """
+    totals = {}
+    for row in rows:
+        qty = int(float(row.get('tot_ccld_qty') or 0))
+        if qty <= 0:
+            continue
+        day = row.get('ord_dt', '')
+        action = "SELL" if row.get('sll_buy_dvsn_cd') == '01' else "BUY"
+        key = (f"{day[:4]}-{day[4:6]}-{day[6:]}", row.get('pdno', ''), action)
+        entry = totals.setdefault(key, {'name': row.get('prdt_name', ''), 'qty': 0, 'amt': 0.0})
+        entry['qty'] += qty
+        entry['amt'] += float(row.get('tot_ccld_amt') or 0)
+
+    return [
+        {'date': date, 'code': code, 'name': t['name'], 'action': action,
+         'price': t['amt'] / t['qty'], 'quantity': t['qty']}
+        for (date, code, action), t in sorted(totals.items())
+    ]
+
+
+def backfill_trade_history(kis, db, start_date, end_date, chunk_days=BACKFILL_CHUNK_DAYS, replace=False):
+    """
+    Rebuild trade_history for [start_date, end_date] (YYYYMMDD) from inquire-daily-ccld.
+    Each chunk is fetched through every continuation page, aggregated and written in one
+    batch (DBManager.save_trade_records). A chunk that fails mid-pagination is not written,
+    so a partial day never lands in the DB; it is reported in 'failed' instead.
+    Writes the DB only: trade_history.json (holdings / last trade) is left to TradeManager.
+    Returns {'chunks', 'rows', 'inserted', 'updated', 'failed': [(start, end)]}.
+    """
+    summary = {'chunks': 0, 'rows': 0, 'inserted': 0, 'updated': 0, 'failed': []}
+    for chunk_start, chunk_end in date_chunks(start_date, end_date, chunk_days):
+        summary['chunks'] += 1
+        try:
+            rows = list(kis.iter_period_trades(chunk_start, chunk_end, strict=True))
+        except Exception as e:
+            logging.error(f"[Backfill] {chunk_start}~{chunk_end} failed: {e}")
+            summary['failed'].append((chunk_start, chunk_end))
+            continue
+        inserted, updated = db.save_trade_records(aggregate_fills(rows), replace=replace)
+        summary['rows'] += len(rows)
+        summary['inserted'] += inserted
+        summary['updated'] += updated
+        logging.info(f"[Backfill] {chunk_start}~{chunk_end}: {len(rows)} orders, {inserted} inserted, {updated} updated")
+    return summary
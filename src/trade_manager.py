@@ -1,6 +1,7 @@
 import json
 import os
 import logging
+import threading
 import pytz
 from datetime import datetime
 import pandas as pd
@@ -9,9 +10,13 @@ import config
 HISTORY_FILE = "data/trade_history.json"
 
 class TradeManager:
-    def __init__(self, db=None):
+    def __init__(self, db=None, calendar=None):
         self.history = self._load_history()
+        # Updates also arrive from the execution-notice thread (src.fill_stream)
+        self._lock = threading.RLock()
         self.db = db
+        # Optional TradingCalendar: trading-day holding periods without OHLCV data
+        self.calendar = calendar
 
     def _load_history(self):
         if not os.path.exists(HISTORY_FILE):
@@ -30,34 +35,42 @@ class TradeManager:
         except Exception as e:
             logging.error(f"[TradeManager] Failed to save history: {e}")
 
-    def update_buy(self, code, name, date_str, price, qty):
-        """Called upon successful buy."""
+    def update_buy(self, code, name, date_str, price, qty, replace=False):
+        """
+        Called upon successful buy.
+        replace=True: price/qty are the day's cumulative fill and overwrite today's DB record.
+        """
         # Clean date string just in case
         date_str = date_str.replace("-", "")
-        self.history["holdings"][code] = {"buy_date": date_str}
-        self._save_history()
+        with self._lock:
+            self.history["holdings"][code] = {"buy_date": date_str}
+            self._save_history()
         
         # Save to DB if available
         if self.db:
             # Convert YYYYMMDD back to YYYY-MM-DD for DB consistency if needed
             db_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
-            self.db.save_trade_record(db_date, code, name, "BUY", float(price), int(qty))
+            self.db.save_trade_record(db_date, code, name, "BUY", float(price), int(qty), replace=replace)
 
-    def update_sell(self, code, name, date_str, price, qty, pnl_pct):
-        """Called upon successful sell."""
+    def update_sell(self, code, name, date_str, price, qty, pnl_pct, replace=False):
+        """
+        Called upon successful sell.
+        replace=True: price/qty are the day's cumulative fill and overwrite today's DB record.
+        """
         date_str = date_str.replace("-", "")
         
-        # Record Last Trade
-        self.history["last_trade"][code] = {
-            "sell_date": date_str,
-            "pnl_pct": float(pnl_pct)
-        }
-        
-        # Remove from holdings
-        if code in self.history["holdings"]:
-            del self.history["holdings"][code]
+        with self._lock:
+            # Record Last Trade
+            self.history["last_trade"][code] = {
+                "sell_date": date_str,
+                "pnl_pct": float(pnl_pct)
+            }
             
-        self._save_history()
+            # Remove from holdings
+            if code in self.history["holdings"]:
+                del self.history["holdings"][code]
+                
+            self._save_history()
 
         # Save to DB if available
         if self.db:
@@ -65,7 +78,7 @@ class TradeManager:
             # Calculate pnl_amt if we want it in DB (optional since we have avg price in balance, but here we just pass it)
             # Actually, main.py calculates pnl_pct. Let's assume we might want pnl_amt later.
             # Simplified: just save pct for now as passed.
-            self.db.save_trade_record(db_date, code, name, "SELL", float(price), int(qty), pnl_pct=float(pnl_pct))
+            self.db.save_trade_record(db_date, code, name, "SELL", float(price), int(qty), pnl_pct=float(pnl_pct), replace=replace)
 
     def get_trade(self, code):
         """Retrieve trade info for a specific code from holdings."""
@@ -76,7 +89,8 @@ class TradeManager:
         """
         보유 일수 계산.
         - df(OHLCV 데이터)가 제공되면: 영업일(Trading Days) 기준
-        - df가 없으면: 캘린더 일수(Calendar Days) 기준 (Fallback)
+        - df가 없고 calendar 가 있으면: 거래일 캘린더 기준 영업일 (네트워크 호출 없음)
+        - 둘 다 없으면: 캘린더 일수(Calendar Days) 기준 (Fallback)
         """
         # If unknown, treat as 0 days held (Do NOT Force Sell)
         if code not in self.history["holdings"]:
@@ -116,11 +130,18 @@ class TradeManager:
                 logging.error(f"[TradeManager] DF Date Calc Error ({code}): {e}")
                 # Fallback to calendar days
         
-        # 2. Calendar Days Calculation (Fallback)
         if not current_date_str:
             tz_kst = pytz.timezone('Asia/Seoul')
             current_date_str = datetime.now(pytz.utc).astimezone(tz_kst).strftime("%Y%m%d")
-            
+        
+        # 2. Trading Calendar (Trading Days, no OHLCV needed)
+        if self.calendar is not None:
+            try:
+                return self.calendar.trading_days_between(buy_date_str, current_date_str)
+            except Exception as e:
+                logging.error(f"[TradeManager] Calendar Calc Error ({code}): {e}")
+        
+        # 3. Calendar Days Calculation (Fallback)
         try:
             d1 = datetime.strptime(buy_date_str, "%Y%m%d")
             d2 = datetime.strptime(current_date_str, "%Y%m%d")
@@ -0,0 +1,157 @@
+import os
+import json
+import bisect
+import logging
+import threading
+from datetime import datetime, timedelta
+from src.utils import get_now_kst, atomic_replace
+
+TRADING_CALENDAR_PATH = "data/trading_calendar.json"
+
+
+def _shift(date_str, days):
+    return (datetime.strptime(date_str, "%Y%m%d") + timedelta(days=days)).strftime("%Y%m%d")
+
+
+class TradingCalendar:
+    """
+    Persisted KRX trading calendar (data/trading_calendar.json).
+    - Covers whole years: the first lookup in an uncovered year fetches that year once
+    - Lookups bisect a sorted list of open days (no network once the year is cached)
+    - fetcher(start, end) -> {YYYYMMDD: is_open} (KISClient.fetch_holidays). Without a
+      fetcher, or if fetching fails, weekends are closed and weekdays open (not persisted)
+    - A partially covered year (API not yet publishing the tail) is re-fetched at most once a day
+    """
+    def __init__(self, path=TRADING_CALENDAR_PATH, fetcher=None):
+        self.path = path
+        self.fetcher = fetcher
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._days = {}  # YYYYMMDD -> is_open
+        self._open_days = []  # sorted YYYYMMDD of open days
+        self._covered = {}  # YYYY -> last covered YYYYMMDD
+        self._attempted = {}  # YYYY -> YYYYMMDD (KST) of the last fetch attempt
+
+    # --- Persistence ---
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._days = {d: bool(v) for d, v in data.get("days", {}).items()}
+            self._covered = data.get("covered", {})
+            self._rebuild()
+        except Exception as e:
+            logging.error(f"[Calendar] Failed to load {self.path}: {e}")
+
+    def _save(self):
+        data = {"covered": self._covered, "days": dict(sorted(self._days.items()))}
+        try:
+            atomic_replace(self.path, lambda f: json.dump(data, f, indent=1), mode="w")
+        except Exception as e:
+            logging.error(f"[Calendar] Failed to save {self.path}: {e}")
+
+    def _rebuild(self):
+        self._open_days = sorted(d for d, is_open in self._days.items() if is_open)
+
+    # --- Refresh ---
+    def _ensure(self, date_str):
+        """Make sure the year of date_str is cached (lazy, at most one fetch per year per day)."""
+        with self._lock:
+            self._load()
+            year = date_str[:4]
+            covered = self._covered.get(year)
+            if covered and covered >= date_str:
+                return
+            if self.fetcher is None:
+                return
+            today = get_now_kst().strftime("%Y%m%d")
+            if self._attempted.get(year) == today:
+                return
+            self._attempted[year] = today
+
+            start = _shift(covered, 1) if covered else f"{year}0101"
+            try:
+                fetched = self.fetcher(start, f"{year}1231")
+            except Exception as e:
+                logging.error(f"[Calendar] Fetch failed for {year}: {e}")
+                return
+            if not fetched:
+                return
+            self._days.update(fetched)
+            self._covered[year] = max(fetched)
+            self._rebuild()
+            self._save()
+            logging.info(f"[Calendar] Cached {len(fetched)} days of {year} (through {self._covered[year]})")
+
+    def _is_known(self, date_str):
+        covered = self._covered.get(date_str[:4])
+        return covered is not None and date_str <= covered and date_str in self._days
+
+    # --- Lookups ---
+    def is_trading_day(self, date_str):
+        self._ensure(date_str)
+        if self._is_known(date_str):
+            return self._days[date_str]
+        # Fallback: weekday rule
+        return datetime.strptime(date_str, "%Y%m%d").weekday() < 5
+
+    def next_trading_day(self, date_str):
+        """First trading day strictly after date_str."""
+        day = _shift(date_str, 1)
+        self._ensure(day)
+        idx = bisect.bisect_right(self._open_days, date_str)
+        if idx < len(self._open_days):
+            candidate = self._open_days[idx]
+            if candidate[:4] == day[:4] and self._is_known(day) and self._is_known(candidate):
+                return candidate
+        # Year boundary / uncovered range: walk day by day
+        for _ in range(30):
+            if self.is_trading_day(day):
+                return day
+            day = _shift(day, 1)
+        return day
+
+    def prev_trading_day(self, date_str):
+        """Last trading day strictly before date_str."""
+        day = _shift(date_str, -1)
+        self._ensure(day)
+        idx = bisect.bisect_left(self._open_days, date_str) - 1
+        if idx >= 0:
+            candidate = self._open_days[idx]
+            if candidate[:4] == day[:4] and self._is_known(day) and self._is_known(candidate):
+                return candidate
+        for _ in range(30):
+            if self.is_trading_day(day):
+                return day
+            day = _shift(day, -1)
+        return day
+
+    def trading_days_between(self, start_str, end_str):
+        """
+        Number of trading days in (start_str, end_str], i.e. days held if bought on start_str.
+        Cached years use bisect on the open-day list; uncovered days use the weekday rule.
+        """
+        if end_str <= start_str:
+            return 0
+        self._ensure(start_str)
+        self._ensure(end_str)
+        count = 0
+        day = start_str
+        while day < end_str:
+            nxt = _shift(day, 1)
+            seg_end = min(f"{nxt[:4]}1231", end_str)
+            covered = self._covered.get(nxt[:4])
+            if covered and covered >= seg_end:
+                # (day, seg_end] from the open-day index
+                count += bisect.bisect_right(self._open_days, seg_end) - bisect.bisect_right(self._open_days, day)
+                day = seg_end
+            else:
+                if self.is_trading_day(nxt):
+                    count += 1
+                day = nxt
+        return count
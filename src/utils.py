@@ -1,6 +1,46 @@
+import os
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 import pytz
 
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process locking is not available
+    fcntl = None
+
 def get_now_kst():
     """Get current time in KST (Asia/Seoul)"""
     return datetime.now(pytz.timezone('Asia/Seoul'))
+
+@contextmanager
+def file_lock(lock_path):
+    """Cross-process exclusive lock (POSIX flock). No-op where fcntl is unavailable."""
+    lock_dir = os.path.dirname(lock_path)
+    if lock_dir:
+        os.makedirs(lock_dir, exist_ok=True)
+    with open(lock_path, "a") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def atomic_replace(path, write_fn, mode="wb"):
+    """
+    Write a file atomically: write_fn(f) writes into a temp file in the same directory,
+    which then replaces `path` (readers never see a partially written file).
+    """
+    target_dir = os.path.dirname(path) or "."
+    os.makedirs(target_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=".tmp_", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, mode) as f:
+            write_fn(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
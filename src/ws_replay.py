@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import threading
+import websockets
+from src.kis_websocket import parse_frame, TR_FILL_NOTICE
+
+# Total number of fields in one H0STCNT0 record
+TRADE_TICK_FIELDS = 46
+# Total number of fields in one H0STCNI0 / H0STCNI9 record
+FILL_NOTICE_FIELDS = 26
+
+
+def make_trade_frame(code, price, open_=None, high=None, low=None, acml_vol=0, hhmmss="152000"):
+    """Build a single-record H0STCNT0 data frame (for offline tests / synthetic feeds)."""
+    fields = [""] * TRADE_TICK_FIELDS
+    fields[0] = code
+    fields[1] = hhmmss
+    fields[2] = str(price)
+    fields[3] = "3"
+    fields[4] = "0"
+    fields[5] = "0.00"
+    fields[7] = str(open_ if open_ is not None else price)
+    fields[8] = str(high if high is not None else price)
+    fields[9] = str(low if low is not None else price)
+    fields[13] = str(acml_vol)
+    return "0|H0STCNT0|001|" + "^".join(fields)
+
+
+def make_fill_frame(hts_id, order_no, code, side="buy", qty=0, price=0, order_qty=None, filled=True,
+                    orig_order_no="", revise_cls="0", rejected=False, name="", hhmmss="152000", tr_id=TR_FILL_NOTICE):
+    """
+    Build a plain (unencrypted) execution notice frame.
+    filled=True: one execution of `qty` at `price`; False: order / revise / cancel acceptance of `order_qty`.
+    """
+    fields = [""] * FILL_NOTICE_FIELDS
+    fields[0] = hts_id
+    fields[2] = order_no
+    fields[3] = orig_order_no
+    fields[4] = "02" if side == "buy" else "01"
+    fields[5] = revise_cls
+    fields[8] = code
+    fields[9] = str(qty if filled else 0)
+    fields[10] = str(price if filled else 0)
+    fields[11] = hhmmss
+    fields[12] = "Y" if rejected else "N"
+    fields[13] = "2" if filled else "1"
+    fields[14] = "Y"
+    fields[15] = "00950"
+    fields[16] = str(order_qty if order_qty is not None else qty)
+    fields[18] = name or code
+    fields[22] = str(price)
+    return f"0|{tr_id}|001|" + "^".join(fields)
+
+
+def load_frames(path):
+    """Read a recording made with KISWebSocket(record_path=...)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+class ReplayServer:
+    """
+    Local stand-in for the KIS real-time websocket.
+    Accepts the same subscribe messages, acks them, and replays recorded data frames
+    for each subscribed (tr_id, tr_key) pair from the start of the recording. Frames are
+    matched on their first field (the code); frames push()ed later are delivered live.
+    Runs on a background thread; `url` is ready once start() returns.
+    interval: seconds between replayed frames
+    ping_interval: send a PINGPONG control frame every N seconds (None = never)
+    """
+    def __init__(self, frames=None, host="127.0.0.1", port=0, interval=0.0, ping_interval=None):
+        self.frames = list(frames or [])
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.ping_interval = ping_interval
+        self.url = None
+        self.received = []  # subscribe / pong messages from clients
+
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stopped = None
+
+    def start(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), name="ws-replay", daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self.url
+
+    def stop(self):
+        if self._loop and self._stopped:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread:
+            self._thread.join(5)
+
+    def push(self, frame):
+        """Append a frame; it is delivered to clients already subscribed to its key."""
+        self.frames.append(frame)
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        async with websockets.serve(self._handle, self.host, self.port) as server:
+            port = server.sockets[0].getsockname()[1]
+            self.url = f"ws://{self.host}:{port}"
+            self._ready.set()
+            await self._stopped.wait()
+
+    async def _handle(self, ws):
+        cursors = {}  # (tr_id, tr_key) -> next frame index to scan
+        pinger = asyncio.create_task(self._ping(ws)) if self.ping_interval else None
+        reader = asyncio.create_task(self._read(ws, cursors))
+        try:
+            while not reader.done():
+                # Each subscription replays its own frames from the start, one frame per key per round
+                sent = False
+                for key in list(cursors):
+                    idx = cursors.get(key)
+                    while idx is not None and idx < len(self.frames):
+                        frame = self.frames[idx]
+                        idx += 1
+                        parsed = parse_frame(frame)
+                        if parsed and (parsed[0], parsed[3].split("^", 1)[0]) == key:
+                            await ws.send(frame)
+                            sent = True
+                            break
+                    if key in cursors:
+                        cursors[key] = idx
+                if sent and self.interval:
+                    await asyncio.sleep(self.interval)
+                elif not sent:
+                    await asyncio.sleep(0.01)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+            if pinger:
+                pinger.cancel()
+
+    async def _read(self, ws, cursors):
+        async for raw in ws:
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                continue
+            self.received.append(msg)
+            header = msg.get("header", {})
+            if header.get("tr_id") == "PINGPONG":
+                continue
+            sub = msg.get("body", {}).get("input", {})
+            key = (sub.get("tr_id"), sub.get("tr_key"))
+            if header.get("tr_type") == "2":
+                cursors.pop(key, None)
+                msg1 = "UNSUBSCRIBE SUCCESS"
+            else:
+                cursors.setdefault(key, 0)
+                msg1 = "SUBSCRIBE SUCCESS"
+            await ws.send(json.dumps({
+                "header": {"tr_id": key[0], "tr_key": key[1], "encrypt": "N"},
+                "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": msg1},
+            }))
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send(json.dumps({"header": {"tr_id": "PINGPONG", "datetime": "20260101000000"}}))
+
+
+if __name__ == "__main__":
+    # Replay a recorded session: python -m src.ws_replay data/ws_record.txt [port]
+    import sys
+    import time
+    logging.basicConfig(level=logging.INFO)
+    server = ReplayServer(load_frames(sys.argv[1]), port=int(sys.argv[2]) if len(sys.argv) > 2 else 0, interval=0.01)
+    print(f"Replaying {len(server.frames)} frames on {server.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
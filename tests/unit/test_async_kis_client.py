@@ -0,0 +1,48 @@
+import time
+import unittest
+import pandas as pd
+from src.kis_client import KISClient
+from src.async_kis_client import AsyncKISClient
+
+
+class SlowKISClient(KISClient):
+    """Stub client: every call takes 0.1s (network latency), no real requests."""
+    def __init__(self):
+        self.is_mock = True
+
+    def get_daily_ohlcv(self, code, start_date=None, end_date=None, period_code="D"):
+        time.sleep(0.1)
+        if code == "ERROR":
+            raise RuntimeError("boom")
+        return pd.DataFrame({'Date': pd.to_datetime(['2026-01-02']), 'Close': [1000.0]})
+
+    def get_current_price(self, code):
+        time.sleep(0.1)
+        return {'stck_prpr': '1010'}
+
+
+class TestAsyncKISClient(unittest.TestCase):
+    def test_scan_runs_concurrently(self):
+        async_kis = AsyncKISClient(SlowKISClient(), max_concurrency=10)
+        codes = [f"{i:06d}" for i in range(20)]
+
+        start = time.monotonic()
+        data = async_kis.fetch_scan_data_sync(codes)
+        elapsed = time.monotonic() - start
+        async_kis.close()
+
+        self.assertEqual(set(data.keys()), set(codes))
+        self.assertEqual(data["000000"]['price']['stck_prpr'], '1010')
+        # 40 calls x 0.1s serially = 4s; 10 workers -> ~0.4s
+        self.assertLess(elapsed, 1.5)
+
+    def test_failed_code_is_skipped(self):
+        async_kis = AsyncKISClient(SlowKISClient(), max_concurrency=4)
+        data = async_kis.fetch_scan_data_sync(["000001", "ERROR"])
+        async_kis.close()
+        self.assertIn("000001", data)
+        self.assertNotIn("ERROR", data)
+
+
+if __name__ == '__main__':
+    unittest.main()
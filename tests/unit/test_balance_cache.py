@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from src.kis_client import KISClient
+
+BALANCE = {'cash_available': 1000.0, 'max_buy_amt': 1000.0, 'total_asset': 5000.0,
+           'total_pnl': 0.0, 'total_return_rate': 0.0, 'holdings': [{'pdno': '000660', 'hldg_qty': '3'}]}
+
+
+def order_response():
+    res = MagicMock()
+    res.json.return_value = {'rt_cd': '0', 'msg1': 'OK'}
+    return res
+
+
+class TestBalanceCache(unittest.TestCase):
+    def setUp(self):
+        self.kis = KISClient()
+
+    @patch('src.kis_client.KISClient._fetch_balance', return_value=BALANCE)
+    def test_ttl_and_force_refresh(self, mock_fetch):
+        first = self.kis.get_balance()
+        first['holdings'].clear()  # callers can't corrupt the cached snapshot
+        second = self.kis.get_balance()
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(len(second['holdings']), 1)
+
+        self.kis.get_balance(force_refresh=True)
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch('src.kis_client.KISClient._get_headers', return_value={})
+    @patch('src.kis_client.KISClient._send_request', return_value=order_response())
+    @patch('src.kis_client.KISClient._fetch_balance', return_value=BALANCE)
+    def test_invalidated_by_orders(self, mock_fetch, _mock_send, _mock_headers):
+        self.kis.get_balance()
+        self.kis.send_order('000660', 1, side="sell", price=0, order_type="01")
+        self.kis.get_balance()
+        self.assertEqual(mock_fetch.call_count, 2)
+
+        self.kis.revise_cancel_order('00950', '0000123', 0, 0, is_cancel=True)
+        self.kis.get_balance()
+        self.assertEqual(mock_fetch.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from src.kis_client import KISClient
+from src.db_manager import DBManager
+from src.fill_stream import FillStream
+from src.ws_replay import ReplayServer, make_fill_frame
+
+HTS_ID = "tester01"
+
+# Filled before the stream connected (seen only through the REST snapshot)
+SEED_ROWS = [
+    {'odno': '0000000001', 'pdno': '035720', 'prdt_name': '카카오', 'sll_buy_dvsn_cd': '01',
+     'ord_qty': '3', 'ord_unpr': '0', 'tot_ccld_qty': '3', 'tot_ccld_amt': '150000'},
+]
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestFillStream(unittest.TestCase):
+    def setUp(self):
+        frames = [
+            make_fill_frame(HTS_ID, '0000000002', '000660', side="buy", order_qty=10, price=0, filled=False, name="SK하이닉스"),
+            make_fill_frame(HTS_ID, '0000000002', '000660', side="buy", qty=4, price=100, order_qty=10, name="SK하이닉스"),
+            make_fill_frame(HTS_ID, '0000000002', '000660', side="buy", qty=6, price=101, order_qty=10, name="SK하이닉스"),
+            make_fill_frame(HTS_ID, '0000000003', '247540', side="buy", order_qty=5, price=200, filled=False),
+        ]
+        self.server = ReplayServer(frames)
+        self.server.start()
+        self.kis = KISClient()
+        self.trade_manager = MagicMock()
+        self.stream = FillStream(self.kis, hts_id=HTS_ID, url=self.server.url, trade_manager=self.trade_manager)
+        self.stream.ws._approval_key = "test-key"
+
+    def tearDown(self):
+        self.stream.stop()
+        self.server.stop()
+
+    @patch('src.kis_client.KISClient._send_request')
+    def test_notices_update_book_and_trades(self, mock_send):
+        with patch.object(self.kis, 'get_period_trades', return_value=SEED_ROWS) as seed:
+            self.kis.attach_fill_stream(self.stream)
+            self.assertTrue(self.stream.start())
+            self.assertTrue(wait_for(lambda: self.stream.book.filled_info('000660')['filled_qty'] == 10))
+            seed.assert_called_once()
+        self.assertTrue(self.stream.is_live())
+
+        info = self.kis.get_today_filled_info('000660', side="buy")
+        self.assertEqual(info['filled_qty'], 10)
+        self.assertAlmostEqual(info['avg_price'], 100.6)
+        self.assertEqual(info['unfilled_qty'], 0)
+
+        # Seeded sell is kept, accepted-but-unfilled order is outstanding
+        self.assertEqual(self.kis.get_today_filled_info('035720', side="sell")['filled_qty'], 3)
+        self.assertTrue(wait_for(lambda: len(self.kis.get_outstanding_orders()) == 1))
+        outstanding = self.kis.get_outstanding_orders()[0]
+        self.assertEqual((outstanding['pdno'], outstanding['ord_qty'], outstanding['ccld_qty']), ('247540', '5', '0'))
+        mock_send.assert_not_called()
+
+        # Cumulative totals pushed to TradeManager as each fill arrives
+        self.trade_manager.update_sell.assert_called_once()
+        last_buy = self.trade_manager.update_buy.call_args
+        self.assertEqual(last_buy.args[:2], ('000660', 'SK하이닉스'))
+        self.assertAlmostEqual(last_buy.args[3], 100.6)
+        self.assertEqual(last_buy.args[4], 10)
+        self.assertTrue(last_buy.kwargs['replace'])
+
+        rows = {r['pdno']: r for r in self.stream.book.ccld_rows()}
+        self.assertEqual(rows['000660']['tot_ccld_amt'], '1006')
+
+    def test_cancel_clears_outstanding(self):
+        self.server.push(make_fill_frame(HTS_ID, '0000000004', '247540', side="buy", order_qty=5, filled=False,
+                                         orig_order_no='0000000003', revise_cls="2"))
+        with patch.object(self.kis, 'get_period_trades', return_value=[]):
+            self.stream.start()
+            self.assertTrue(wait_for(lambda: self.stream.book.filled_info('247540')['unfilled_qty'] == 0
+                                     and self.stream.book.filled_info('000660')['filled_qty'] == 10))
+        self.assertEqual(self.stream.book.outstanding(), [])
+
+
+class TestTradeRecordReplace(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DBManager(market_db=os.path.join(self.tmp, "market.db"), user_db=os.path.join(self.tmp, "user.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_replace_updates_cumulative_fill(self):
+        self.db.save_trade_record("2026-01-19", "000660", "SK하이닉스", "BUY", 100.0, 4)
+        self.db.save_trade_record("2026-01-19", "000660", "SK하이닉스", "BUY", 100.6, 10)  # skipped
+        self.assertEqual(self.db.get_trade_history()[0]['quantity'], 4)
+
+        self.db.save_trade_record("2026-01-19", "000660", "SK하이닉스", "BUY", 100.6, 10, replace=True)
+        history = self.db.get_trade_history()
+        self.assertEqual(len(history), 1)
+        self.assertEqual((history[0]['quantity'], history[0]['amount']), (10, 1006.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.strategy import Strategy
+from src.indicator_panel import close_panel, rsi_matrix, sma_matrix
+
+
+def ragged_panel(T=300, N=40, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = np.round(10000 * np.exp(np.cumsum(rng.normal(0, 0.02, (T, N)), axis=0)), -1)
+    prices[:, 1] = 5000.0                          # Constant price
+    prices[120:160, 2] = prices[119, 2]            # Flat run (trading halt at same price)
+    prices[:, 3] = rng.integers(100, 105, T)       # Small integer prices, many repeats
+    for j in range(4, N):
+        start = int(rng.integers(0, 200)) if j % 3 == 0 else 0
+        prices[:start, j] = np.nan                 # Listed late
+        if j % 5 == 0:
+            prices[rng.integers(start, T, 4), j] = np.nan  # Missing days
+        if j % 7 == 0:
+            prices[int(rng.integers(250, T)):, j] = np.nan  # Delisted
+    dates = pd.date_range("2024-01-02", periods=T, freq="B")
+    return pd.DataFrame(prices, index=dates, columns=[f"{100000 + j:06d}" for j in range(N)])
+
+
+class TestIndicatorPanel(unittest.TestCase):
+    def assert_matches_per_ticker(self, strategy, panel):
+        result = strategy.calculate_panel(panel)
+        for code in panel.columns:
+            df = strategy.calculate_indicators(pd.DataFrame({'Close': panel[code].dropna()}))
+            for col in ('RSI', 'SMA'):
+                np.testing.assert_array_equal(result[col][code].reindex(df.index).to_numpy(), df[col].to_numpy(),
+                                              err_msg=f"{code} {col}")
+            # Dates the ticker did not trade stay empty
+            self.assertTrue(result['RSI'][code][panel[code].isna()].isna().all())
+
+    def test_identical_to_calculate_indicators(self):
+        strategy = Strategy()
+        panel = ragged_panel()
+        for rsi_window, sma_window in ((strategy.rsi_window, strategy.sma_window), (14, 20), (2, 1)):
+            strategy.rsi_window, strategy.sma_window = rsi_window, sma_window
+            self.assert_matches_per_ticker(strategy, panel)
+
+    def test_edge_shapes(self):
+        self.assertEqual(rsi_matrix(np.empty((0, 3)), 5).shape, (0, 3))
+        short = np.array([[100.0], [101.0]])
+        self.assertTrue(np.isnan(sma_matrix(short, 5)).all())
+        self.assertTrue(np.isnan(rsi_matrix(np.full((10, 2), np.nan), 5)).all())
+
+    def test_close_panel_from_ohlcv_frames(self):
+        dates = pd.date_range("2025-01-02", periods=4, freq="B")
+        frames = {
+            "000660": pd.DataFrame({"Date": dates, "Close": [1, 2, 3, 4]}),
+            "247540": pd.DataFrame({"Date": dates[2:], "Close": [10.0, 11.0]}),
+            "035720": pd.DataFrame(),
+        }
+        panel = close_panel(frames)
+        self.assertEqual(list(panel.columns), ["000660", "247540"])
+        self.assertEqual(panel.index.tolist(), list(dates))
+        self.assertEqual(panel["247540"].isna().sum(), 2)
+
+    def test_nan_close_row_matches_with_present_mask(self):
+        strategy = Strategy()
+        strategy.rsi_window, strategy.sma_window = 3, 4
+        dates = pd.date_range("2025-01-02", periods=12, freq="B")
+        closes = [100, 102, 101, np.nan, 104, 103, 105, 107, 106, 108, 110, 109]
+        frames = {
+            "000660": pd.DataFrame({"Date": dates, "Close": closes}),
+            "005930": pd.DataFrame({"Date": dates[3:], "Close": closes[4:] + [111.0]}),
+        }
+        panel, present = close_panel(frames, with_present=True)
+        self.assertTrue(present.at[dates[3], "000660"])
+        self.assertFalse(present.at[dates[0], "005930"])
+
+        result = strategy.calculate_panel(panel, present)
+        for code, frame in frames.items():
+            df = strategy.calculate_indicators(frame.copy())
+            for col in ('RSI', 'SMA'):
+                np.testing.assert_array_equal(result[col][code].reindex(frame['Date']).to_numpy(),
+                                              df[col].to_numpy(), err_msg=f"{code} {col}")
+
+    def test_close_panel_keeps_last_duplicate_date(self):
+        dates = pd.to_datetime(["2025-01-02", "2025-01-03", "2025-01-03"])
+        panel, present = close_panel({"000660": pd.DataFrame({"Date": dates, "Close": [1.0, 2.0, 3.0]})},
+                                     with_present=True)
+        self.assertEqual(panel["000660"].tolist(), [1.0, 3.0])
+        self.assertTrue(present["000660"].all())
+
+
+if __name__ == '__main__':
+    unittest.main()
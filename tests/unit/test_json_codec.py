@@ -0,0 +1,46 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+import requests
+import src.json_codec as json_codec
+
+PAYLOAD = {"rt_cd": "0", "msg1": "정상처리 되었습니다.", "output": [{"pdno": "005930", "stck_prpr": "71000"}]}
+
+
+def make_response(body):
+    res = requests.Response()
+    res.status_code = 200
+    res._content = body
+    return res
+
+
+class TestJsonCodec(unittest.TestCase):
+    def test_round_trip_both_backends(self):
+        for backend in (json_codec.orjson, None):
+            with patch.object(json_codec, "orjson", backend):
+                encoded = json_codec.dumps(PAYLOAD)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(json.loads(encoded), PAYLOAD)
+                self.assertEqual(json_codec.loads(encoded), PAYLOAD)
+                self.assertEqual(json_codec.loads(encoded.decode("utf-8")), PAYLOAD)
+
+    def test_install_decodes_once(self):
+        res = json_codec.install(make_response(json.dumps(PAYLOAD).encode("utf-8")))
+        first = res.json()
+        self.assertEqual(first, PAYLOAD)
+        self.assertIs(res.json(), first)
+
+    def test_invalid_body_raises_value_error(self):
+        res = json_codec.install(make_response(b"<html>Bad Gateway</html>"))
+        with self.assertRaises(ValueError):
+            res.json()
+
+    def test_non_response_untouched(self):
+        res = MagicMock()
+        res.json.return_value = PAYLOAD
+        json_codec.install(res)
+        self.assertEqual(res.json(), PAYLOAD)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from src.kis_client import KISClient
+from src.kis_credentials import build_pool
+
+EXTRA_KEYS = [("2", "key2", "secret2"), ("3", "key3", "secret3")]
+
+
+def ok_response():
+    res = MagicMock()
+    res.status_code = 200
+    res.json.return_value = {'rt_cd': '0', 'msg_cd': '', 'msg1': 'OK'}
+    return res
+
+
+class TestCredentialPool(unittest.TestCase):
+    def test_market_data_round_robin_orders_pinned(self):
+        pool = build_pool("key1", "secret1", EXTRA_KEYS)
+        self.assertEqual(len(pool), 3)
+
+        names = [pool.for_tr_id("FHKST01010100").name for _ in range(3)]
+        self.assertEqual(sorted(names), ["2", "3", "primary"])
+        self.assertEqual(pool.for_tr_id("FHKST03010100").name, "primary")  # 4th call wraps around
+
+        for tr_id in ("TTTC0802U", "TTTC8434R", "TTTC8001R"):
+            self.assertIs(pool.for_tr_id(tr_id), pool.primary)
+
+    def test_each_key_has_own_limiter_and_token_file(self):
+        pool = build_pool("key1", "secret1", EXTRA_KEYS)
+        limiters = {id(c.rate_limiter) for c in pool.market_data}
+        self.assertEqual(len(limiters), 3)
+        self.assertEqual([c.token_path for c in pool.market_data], ["token.json", "token_2.json", "token_3.json"])
+
+    def test_duplicate_or_blank_keys_ignored(self):
+        pool = build_pool("key1", "secret1", [("2", "key1", "secret1"), ("3", "", "x")])
+        self.assertEqual(len(pool), 1)
+
+
+class TestShardedRequests(unittest.TestCase):
+    @patch('src.kis_client.config.KIS_MARKET_DATA_KEYS', EXTRA_KEYS)
+    def setUp(self):
+        self.kis = KISClient()
+        for cred in self.kis.credentials.market_data:
+            cred.access_token = f"tok-{cred.name}"
+            cred.token_expired_at = time.time() + 3600
+        self.kis.session = MagicMock()
+        self.kis.session.get.return_value = ok_response()
+        self.kis.session.post.return_value = ok_response()
+
+    def test_quotes_spread_over_appkeys(self):
+        for _ in range(6):
+            self.kis._send_request("GET", "/uapi/domestic-stock/v1/quotations/inquire-price", "FHKST01010100")
+        used = [c.kwargs['headers']['appkey'] for c in self.kis.session.get.call_args_list]
+        self.assertEqual(sorted(used), sorted(["key2", "key2", "key3", "key3", self.kis.app_key, self.kis.app_key]))
+
+    def test_orders_use_account_key(self):
+        for _ in range(3):
+            self.kis._send_request("POST", "/uapi/domestic-stock/v1/trading/order-cash", "TTTC0802U", body={})
+        used = {c.kwargs['headers']['authorization'] for c in self.kis.session.post.call_args_list}
+        self.assertEqual(used, {"Bearer tok-primary"})
+
+
+if __name__ == '__main__':
+    unittest.main()
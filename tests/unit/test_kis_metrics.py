@@ -0,0 +1,82 @@
+import os
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from src.kis_client import KISClient
+from src.kis_metrics import KISMetrics, list_dumps
+
+
+def response(status=200, payload=None):
+    res = MagicMock()
+    res.status_code = status
+    res.json.return_value = payload if payload is not None else {'rt_cd': '0', 'msg_cd': '', 'msg1': 'OK'}
+    return res
+
+
+class TestKISMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.metrics = KISMetrics(directory=self.tmp)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_records_and_ranks_by_time(self):
+        for ms in (10, 20, 30, 400):
+            self.metrics.record_call("FHKST03010100", ms, 200)
+        self.metrics.record_call("FHKST01010100", 5, 500, error=True)
+        self.metrics.record_wait("FHKST03010100", 0.5)
+
+        snap = self.metrics.snapshot()
+        self.assertEqual(list(snap), ["FHKST03010100", "FHKST01010100"])
+        chart = snap["FHKST03010100"]
+        self.assertEqual(chart["calls"], 4)
+        self.assertEqual(chart["total_ms"], 460)
+        self.assertEqual(chart["p50_ms"], 25)
+        self.assertEqual(chart["p95_ms"], 500)
+        self.assertEqual(chart["limiter_wait_ms"], 500)
+        self.assertEqual(snap["FHKST01010100"]["statuses"], {"500": 1})
+        self.assertEqual(snap["FHKST01010100"]["errors"], 1)
+
+    def test_job_resets_and_dumps(self):
+        self.metrics.record_call("OLD", 1, 200)
+        with patch('src.kis_metrics.get_now_kst', return_value=datetime(2026, 1, 2, 15, 10)):
+            with self.metrics.job("buy_analysis"):
+                self.metrics.record_call("FHKST03010100", 100, 200)
+
+        self.assertEqual(list_dumps(self.tmp), ["20260102_1510_buy_analysis.json"])
+        with open(os.path.join(self.tmp, "20260102_1510_buy_analysis.json")) as f:
+            data = json.load(f)
+        self.assertEqual(data["job"], "buy_analysis")
+        self.assertEqual(list(data["tr_ids"]), ["FHKST03010100"])
+        with open(os.path.join(self.tmp, "20260102_1510_buy_analysis.csv")) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]["tr_id"], "FHKST03010100")
+        self.assertEqual(rows[0]["statuses"], "200:1")
+
+
+@patch('src.kis_client.time.sleep')
+class TestSendRequestMetrics(unittest.TestCase):
+    def test_retries_and_rate_limits_counted(self, _sleep):
+        kis = KISClient()
+        kis._get_headers = lambda tr_id, data=None, credential=None: {'authorization': 'Bearer t'}
+        kis.session = MagicMock()
+        kis.session.get.side_effect = [
+            response(200, {'rt_cd': '1', 'msg_cd': 'EGW00201', 'msg1': '초당 거래건수를 초과하였습니다.'}),
+            response(),
+        ]
+        kis._send_request("GET", "/q", "FHKST01010100")
+
+        stats = kis.metrics.snapshot()["FHKST01010100"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["rate_limited"], 1)
+        self.assertEqual(stats["errors"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import requests
+from src.kis_client import KISClient
+from src.kis_simulator import FakeKISServer, SimulatorData
+from src.token_store import TokenStore
+
+
+def make_client(url, tmp):
+    kis = KISClient()
+    kis.base_url = url
+    kis.is_mock = False
+    for cred in kis.credentials.market_data:
+        cred.store = TokenStore(os.path.join(tmp, f"token_{cred.name}.json"))
+    return kis
+
+
+@patch('src.kis_client.time.sleep')
+class TestKISSimulator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.server = FakeKISServer(SimulatorData(names={"000660": "SK하이닉스"}, cash=1_000_000), seed=1)
+        self.kis = make_client(self.server.start(), self.tmp)
+
+    def tearDown(self):
+        self.kis.close()
+        self.server.stop()
+        shutil.rmtree(self.tmp)
+
+    def test_quotes_and_chart(self, _sleep):
+        price = self.kis.get_current_price("000660", use_cache=False, use_stream=False)
+        self.assertEqual(price["hts_kor_isnm"], "SK하이닉스")
+
+        df = self.kis.get_daily_ohlcv("000660", start_date="20240101", end_date="20241231", parallel=False)
+        # Paged backwards: 2024 has ~250 weekdays -> 3 chart calls
+        self.assertGreater(len(df), 200)
+        self.assertTrue(df["Date"].is_monotonic_increasing)
+        self.assertEqual(self.server.requests["FHKST03010100"], 3)
+
+        quotes = self.kis.get_quotes(["000660", "005930"])
+        self.assertEqual(set(quotes), {"000660", "005930"})
+        self.assertEqual(self.server.requests["FHKST11300006"], 1)
+
+    def test_order_balance_and_fills(self, _sleep):
+        ok, _ = self.kis.send_order("000660", 1, side="buy", price=0, order_type="01")
+        self.assertTrue(ok)
+        balance = self.kis.get_balance()
+        self.assertEqual([h["pdno"] for h in balance["holdings"]], ["000660"])
+        self.assertLess(balance["cash_available"], 1_000_000)
+
+        filled = self.kis.get_today_filled_info("000660", side="buy")
+        self.assertEqual(filled["filled_qty"], 1)
+
+        ok, msg = self.kis.send_order("005930", 10_000, side="buy", price=0, order_type="01")
+        self.assertFalse(ok)
+
+    def test_revise_cancel_error_bodies(self, _sleep):
+        self.server.server_error_rate = 1.0
+        self.assertEqual(self.kis.revise_cancel_order("00950", "0000001", 0, 0, is_cancel=True), (False, "HTTP 500"))
+
+        gateway = requests.Response()
+        gateway.status_code = 502
+        gateway._content = b"<html>502 Bad Gateway</html>"
+        with patch.object(self.kis, "_send_request", return_value=gateway):
+            self.assertEqual(self.kis.revise_cancel_order("00950", "0000001", 0, 0, is_cancel=True), (False, "JSON Error"))
+
+    def test_holidays(self, _sleep):
+        self.server.data.holidays["20250101"] = "N"
+        days = self.kis.fetch_holidays("20250101", "20250110")
+        self.assertFalse(days["20250101"])
+        self.assertTrue(days["20250102"])
+        self.assertFalse(days["20250104"])  # Saturday
+
+    def test_fault_injection_is_retried(self, _sleep):
+        self.server.rate_limit_rate = 0.3
+        self.server.server_error_rate = 0.2
+        for code in ("000660", "005930", "035720", "247540"):
+            self.assertIsNotNone(self.kis.get_current_price(code, use_cache=False, use_stream=False))
+        self.assertGreater(sum(self.server.rejected.values()), 0)
+
+    def test_tps_limit_and_token_expiry(self, _sleep):
+        self.server.tps = 1
+        self.kis.get_current_price("000660", use_cache=False, use_stream=False)
+        self.kis.get_current_price("005930", use_cache=False, use_stream=False)
+        self.assertGreaterEqual(self.server.rejected["tps"], 1)
+
+        self.server.tps = None
+        self.server.expire_tokens()
+        self.assertIsNotNone(self.kis.get_current_price("035720", use_cache=False, use_stream=False))
+        self.assertEqual(self.server.rejected["token"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import time
+import unittest
+from unittest.mock import patch
+from src.kis_client import KISClient
+from src.market_stream import MarketStream
+from src.ws_replay import ReplayServer, make_trade_frame
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestMarketStream(unittest.TestCase):
+    def setUp(self):
+        frames = [
+            make_trade_frame('000660', 100, open_=98, high=101, low=97, acml_vol=10),
+            make_trade_frame('035720', 50, acml_vol=5),
+            make_trade_frame('000660', 102, open_=98, high=102, low=97, acml_vol=25),
+        ]
+        self.server = ReplayServer(frames, ping_interval=0.05)
+        self.server.start()
+        self.stream = MarketStream(url=self.server.url, approval_key="test-key", max_subscriptions=1, max_age=60)
+
+    def tearDown(self):
+        self.stream.stop()
+        self.server.stop()
+
+    def test_book_follows_subscribed_ticks(self):
+        accepted = self.stream.start(['000660', '035720'])
+        self.assertEqual(accepted, ['000660'])
+
+        self.assertTrue(wait_for(lambda: (self.stream.get_quote('000660') or {}).get('stck_prpr') == '102'))
+        bar = self.stream.book.day_bar('000660')
+        self.assertEqual((bar['Open'], bar['High'], bar['Low'], bar['Close'], bar['Volume']), (98.0, 102.0, 97.0, 102.0, 25))
+        # Over the registration limit -> never streamed
+        self.assertIsNone(self.stream.get_quote('035720'))
+        # PINGPONG is echoed back
+        self.assertTrue(wait_for(lambda: any(m['header'].get('tr_id') == 'PINGPONG' for m in self.server.received)))
+
+    @patch('src.kis_client.KISClient._send_request')
+    def test_kis_serves_quotes_from_stream(self, mock_send):
+        kis = KISClient()
+        kis.attach_market_stream(self.stream)
+        self.stream.start(['000660'])
+        self.assertTrue(wait_for(lambda: (self.stream.get_quote('000660') or {}).get('stck_prpr') == '102'))
+
+        self.assertEqual(kis.get_current_price('000660')['stck_prpr'], '102')
+        self.assertEqual(kis.get_quotes(['000660'])['000660']['acml_vol'], '25')
+        mock_send.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+import pandas as pd
+from src.kis_client import KISClient
+from src.ohlcv_store import OHLCVStore
+
+
+def make_bars(dates, closes):
+    return pd.DataFrame({
+        'Date': pd.to_datetime(dates),
+        'Open': closes, 'High': closes, 'Low': closes, 'Close': closes,
+        'Volume': [1000] * len(closes)
+    })
+
+
+class TestOHLCVWriteThrough(unittest.TestCase):
+    def setUp(self):
+        self.kis = KISClient()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.kis.ohlcv_store = OHLCVStore(path=os.path.join(self.tmp.name, 'ohlcv.arrow'), legacy_dir=self.tmp.name)
+
+        today = datetime.now()
+        self.d = [(today - timedelta(days=n)).strftime("%Y-%m-%d") for n in (3, 2, 1, 0)]
+        self.kis.ohlcv_store.put('000660', make_bars(self.d[:2], [100.0, 101.0]))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch('src.kis_client.KISClient._get_multi_quotes', return_value={})
+    @patch('src.kis_client.KISClient.get_current_price')
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_gap_fill_persists_closed_bars_once(self, mock_get_ohlcv, mock_price, _mock_multi):
+        # Gap: yesterday (closed) + today (live)
+        mock_get_ohlcv.return_value = make_bars(self.d[2:], [102.0, 103.0])
+        mock_price.return_value = {'stck_prpr': '104', 'stck_oprc': '103', 'stck_hgpr': '105', 'stck_lwpr': '102', 'acml_vol': '5000'}
+
+        df1 = self.kis.get_ohlcv_cached('000660')
+        df2 = self.kis.get_ohlcv_cached('000660')
+
+        # Gap fetched only once per day
+        self.assertEqual(mock_get_ohlcv.call_count, 1)
+        # Live candle updated with real-time price on every call
+        self.assertEqual(df1['Close'].tolist(), [100.0, 101.0, 102.0, 104.0])
+        self.assertEqual(df2['Close'].tolist(), [100.0, 101.0, 102.0, 104.0])
+
+        # Only the closed bar was written through
+        stored = self.kis.ohlcv_store.load('000660')
+        self.assertEqual(stored['Close'].tolist(), [100.0, 101.0, 102.0])
+
+    @patch('src.kis_client.KISClient._get_multi_quotes', return_value={})
+    @patch('src.kis_client.KISClient.get_current_price', return_value=None)
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_failed_gap_fill_is_retried(self, mock_get_ohlcv, _mock_price, _mock_multi):
+        mock_get_ohlcv.side_effect = [Exception("HTTP 500"), make_bars(self.d[2:3], [102.0])]
+        today_str = datetime.now().strftime("%Y%m%d")
+
+        df1 = self.kis.get_ohlcv_cached('000660')
+        # API error: cached bars are served, but the symbol is not marked synced
+        self.assertEqual(df1['Close'].tolist(), [100.0, 101.0])
+        self.assertIsNone(self.kis.ohlcv_store.synced_date('000660'))
+        self.assertTrue(mock_get_ohlcv.call_args.kwargs['strict'])
+
+        df2 = self.kis.get_ohlcv_cached('000660')
+        self.assertEqual(mock_get_ohlcv.call_count, 2)
+        self.assertEqual(df2['Close'].tolist(), [100.0, 101.0, 102.0])
+        self.assertEqual(self.kis.ohlcv_store.synced_date('000660'), today_str)
+
+    @patch('src.kis_client.KISClient._get_multi_quotes', return_value={})
+    @patch('src.kis_client.KISClient.get_current_price', return_value=None)
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_empty_gap_fill_counts_as_synced(self, mock_get_ohlcv, _mock_price, _mock_multi):
+        # No new closed bars (e.g. holiday) is not an error
+        mock_get_ohlcv.return_value = pd.DataFrame()
+        mtime = os.stat(self.kis.ohlcv_store.path).st_mtime_ns
+        self.kis.get_ohlcv_cached('000660')
+        self.kis.get_ohlcv_cached('000660')
+        self.assertEqual(mock_get_ohlcv.call_count, 1)
+        # Only the synced marker was written, not the bars
+        self.assertEqual(os.stat(self.kis.ohlcv_store.path).st_mtime_ns, mtime)
+        self.assertEqual(self.kis.ohlcv_store.synced_date('000660'), datetime.now().strftime("%Y%m%d"))
+
+    @patch('src.kis_client.KISClient._get_multi_quotes', return_value={})
+    @patch('src.kis_client.KISClient.get_current_price', return_value=None)
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_many_reads_store_once(self, mock_get_ohlcv, _mock_price, _mock_multi):
+        mock_get_ohlcv.return_value = make_bars(self.d[2:3], [102.0])
+
+        store = self.kis.ohlcv_store
+        with patch.object(store, 'load_many', wraps=store.load_many) as mock_many:
+            frames = self.kis.get_ohlcv_cached_many(['000660', '005930'])
+        mock_many.assert_called_once_with(['000660', '005930'])
+
+        self.assertEqual(frames['000660']['Close'].tolist(), [100.0, 101.0, 102.0])
+        # Not cached yet -> full history fetch
+        self.assertEqual(frames['005930']['Close'].tolist(), [102.0])
+        self.assertEqual(mock_get_ohlcv.call_count, 2)
+
+    @patch('src.kis_client.KISClient._get_multi_quotes', return_value={})
+    @patch('src.kis_client.KISClient.get_current_price', return_value=None)
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_batch_writes_store_once(self, mock_get_ohlcv, _mock_price, _mock_multi):
+        mock_get_ohlcv.return_value = make_bars(self.d[2:3], [102.0])
+        store = self.kis.ohlcv_store
+
+        with patch.object(store, 'put_many', wraps=store.put_many) as mock_put:
+            with self.kis.ohlcv_batch():
+                for code in ('000660', '005930', '000660'):
+                    self.kis.get_ohlcv_cached(code)
+                mock_put.assert_not_called()
+        mock_put.assert_called_once()
+
+        # Buffered gap fill counted as today's sync (no second fetch for 000660)
+        self.assertEqual(mock_get_ohlcv.call_count, 2)
+        self.assertEqual(store.load('000660')['Close'].tolist(), [100.0, 101.0, 102.0])
+        self.assertEqual(store.load('005930')['Close'].tolist(), [102.0])
+        self.assertEqual(store.synced_date('000660'), datetime.now().strftime("%Y%m%d"))
+
+
+if __name__ == '__main__':
+    unittest.main()
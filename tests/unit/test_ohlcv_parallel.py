@@ -0,0 +1,69 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+import pandas as pd
+from src.kis_client import KISClient
+
+BDAYS = [d.strftime("%Y%m%d") for d in pd.bdate_range("2023-06-01", "2025-12-31")]
+
+
+class FakeChartAPI:
+    """Serves FHKST03010100 like KIS: newest first, at most 100 bars per call."""
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, method, path, tr_id, params=None, body=None):
+        with self.lock:
+            self.calls += 1
+        start, end = params["FID_INPUT_DATE_1"], params["FID_INPUT_DATE_2"]
+        days = [d for d in BDAYS if start <= d <= end][::-1][:100]
+        res = MagicMock()
+        res.status_code = 200
+        res.json.return_value = {
+            'rt_cd': '0',
+            'output2': [{'stck_bsop_date': d, 'stck_oprc': '10', 'stck_hgpr': '12', 'stck_lwpr': '9',
+                         'stck_clpr': str(int(d) % 1000), 'acml_vol': '100'} for d in days]
+            # No bars in range: KIS returns one blank row
+            or [dict.fromkeys(['stck_bsop_date', 'stck_oprc', 'stck_hgpr', 'stck_lwpr', 'stck_clpr', 'acml_vol'], '')]
+        }
+        return res
+
+
+class TestParallelOHLCV(unittest.TestCase):
+    def setUp(self):
+        self.kis = KISClient()
+
+    def fetch(self, parallel, start_date="20230101"):
+        api = FakeChartAPI()
+        self.kis._send_request = api
+        df = self.kis.get_daily_ohlcv("000660", start_date=start_date, end_date="20251231", parallel=parallel)
+        return df, api.calls
+
+    def test_parallel_matches_serial(self):
+        serial, serial_calls = self.fetch(parallel=False)
+        parallel, parallel_calls = self.fetch(parallel=True)
+
+        self.assertEqual(len(serial), len(BDAYS))
+        pd.testing.assert_frame_equal(serial.reset_index(drop=True), parallel.reset_index(drop=True))
+        # One call per window (3 years / 140 days)
+        self.assertEqual(parallel_calls, len(KISClient._ohlcv_windows("20230101", "20251231")))
+
+    def test_parallel_calls_no_more_than_serial(self):
+        # Range fully covered by bars (serial paging stops early before a listing date)
+        _, serial_calls = self.fetch(parallel=False, start_date=BDAYS[0])
+        _, parallel_calls = self.fetch(parallel=True, start_date=BDAYS[0])
+        self.assertLessEqual(parallel_calls, serial_calls)
+
+    def test_windows_fit_one_page(self):
+        windows = KISClient._ohlcv_windows("20230101", "20251231")
+        self.assertEqual(windows[0][1], "20251231")
+        self.assertEqual(windows[-1][0], "20230101")
+        for start, end in windows[:-1]:
+            # Weekdays only (no holidays): every full window is exactly one full page
+            self.assertEqual(len(pd.bdate_range(start, end)), 100)
+        self.assertLessEqual(len(pd.bdate_range(*windows[-1])), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.ohlcv_parser import parse_chart_rows, merge_pages, to_frame, dates_to_datetime64
+
+
+def rows(dates, base=100):
+    return [{'stck_bsop_date': d, 'stck_oprc': str(base), 'stck_hgpr': str(base + 2), 'stck_lwpr': str(base - 1),
+             'stck_clpr': str(base + 1), 'acml_vol': '1500', 'prdy_vrss': '0'} for d in dates]
+
+
+class TestOHLCVParser(unittest.TestCase):
+    def test_typed_arrays(self):
+        page = parse_chart_rows(rows(['20250103', '20250102']) + [dict.fromkeys(rows(['x'])[0], '')])
+        self.assertEqual(page.date.dtype, np.int32)
+        self.assertEqual(page.close.dtype, np.float64)
+        self.assertEqual(page.volume.dtype, np.int64)
+        self.assertEqual(page.date.tolist(), [20250103, 20250102])
+
+    def test_merge_dedup_sort_and_frame(self):
+        newer = parse_chart_rows(rows(['20250106', '20250103'], base=200))
+        older = parse_chart_rows(rows(['20250103', '20241231'], base=100))
+        merged = merge_pages([newer, older])
+        self.assertEqual(merged.date.tolist(), [20241231, 20250103, 20250106])
+        # Duplicate date: first page wins
+        self.assertEqual(merged.close.tolist(), [101.0, 201.0, 201.0])
+
+        df = to_frame(merged)
+        self.assertEqual(list(df.columns), ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        self.assertEqual(df['Date'].tolist(), list(pd.to_datetime(['2024-12-31', '2025-01-03', '2025-01-06'])))
+
+    def test_date_conversion(self):
+        dates = np.array([20240229, 19991231, 20260101], dtype=np.int32)
+        expected = pd.to_datetime(dates.astype(str), format="%Y%m%d").values
+        np.testing.assert_array_equal(dates_to_datetime64(dates), expected)
+
+    def test_empty(self):
+        self.assertTrue(to_frame(merge_pages([parse_chart_rows([])])).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,39 +1,92 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import os
+import tempfile
 import pandas as pd
 from src.kis_client import KISClient
+from src.ohlcv_store import OHLCVStore
+
+
+def make_bars(dates, closes):
+    return pd.DataFrame({
+        'Date': pd.to_datetime(dates),
+        'Open': closes, 'High': closes, 'Low': closes, 'Close': closes,
+        'Volume': [1000] * len(closes)
+    })
+
 
 class TestOHLCVRefresh(unittest.TestCase):
     def setUp(self):
         self.kis = KISClient()
         self.kis.is_mock = True
+        self.tmp = tempfile.TemporaryDirectory()
+        self.kis.ohlcv_store = OHLCVStore(path=os.path.join(self.tmp.name, 'ohlcv.arrow'), legacy_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
 
-    @patch('os.remove')
-    @patch('src.kis_client.os.path.exists')
-    @patch('src.kis_client.pd.DataFrame.to_pickle')
     @patch('src.kis_client.KISClient.get_daily_ohlcv')
-    def test_refresh_ohlcv_cache(self, mock_get_ohlcv, mock_to_pickle, mock_exists, mock_remove):
+    def test_refresh_ohlcv_cache(self, mock_get_ohlcv):
         # Setup
         universe = [{'code': '000660', 'name': 'SK Hynix'}]
-        mock_exists.return_value = True # File exists to trigger delete
+        self.kis.ohlcv_store.put('000660', make_bars(['2023-01-02'], [500.0]))
         
         # Mock DF return
-        mock_df = pd.DataFrame({'Date': ['2024-01-01'], 'Close': [1000]})
-        mock_get_ohlcv.return_value = mock_df
+        mock_get_ohlcv.return_value = make_bars(['2024-01-01'], [1000.0])
 
         # Execution
         self.kis.refresh_ohlcv_cache(universe)
 
         # Verification
-        # 1. os.remove called?
-        mock_remove.assert_called_with('data/ohlcv/000660.pkl')
-        
-        # 2. get_daily_ohlcv called?
+        # 1. get_daily_ohlcv called?
         mock_get_ohlcv.assert_called()
         
-        # 3. to_pickle called?
-        mock_to_pickle.assert_called_with('data/ohlcv/000660.pkl')
+        # 2. Old bars replaced by the fresh download?
+        df = self.kis.ohlcv_store.load('000660')
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df.iloc[0]['Close'], 1000.0)
+
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_refresh_never_stores_todays_bar(self, mock_get_ohlcv):
+        universe = [{'code': '000660', 'name': 'SK Hynix'}]
+        today = pd.Timestamp.now().normalize()
+        mock_get_ohlcv.return_value = make_bars([today - pd.Timedelta(days=1), today], [1000.0, 1010.0])
+
+        for incremental in (False, True):
+            self.kis.ohlcv_store.put('000660', make_bars(['2023-01-02'], [500.0]))
+            self.kis.refresh_ohlcv_cache(universe, incremental=incremental)
+            # Full reload in both modes (incremental: reconciliation mismatch)
+            df = self.kis.ohlcv_store.load('000660')
+            self.assertEqual(df['Close'].tolist(), [1000.0], f"incremental={incremental}")
+
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_incremental_refresh_appends_new_bars(self, mock_get_ohlcv):
+        store = self.kis.ohlcv_store
+        store.put('000660', make_bars(['2024-01-02', '2024-01-03', '2024-01-04'], [100.0, 101.0, 102.0]))
+        mock_get_ohlcv.return_value = make_bars(['2024-01-03', '2024-01-04', '2024-01-05'], [101.0, 102.0, 103.0])
+
+        self.kis.refresh_ohlcv_cache([{'code': '000660', 'name': 'SK Hynix'}], incremental=True, reconcile_days=2)
+
+        # Only the overlap window is fetched
+        self.assertEqual(mock_get_ohlcv.call_args.kwargs['start_date'], '20240103')
+        df = store.load('000660')
+        self.assertEqual(len(df), 4)
+        self.assertEqual(df.iloc[-1]['Close'], 103.0)
+
+    @patch('src.kis_client.KISClient.get_daily_ohlcv')
+    def test_incremental_refresh_reloads_on_adjustment(self, mock_get_ohlcv):
+        store = self.kis.ohlcv_store
+        store.put('000660', make_bars(['2024-01-02', '2024-01-03', '2024-01-04'], [100.0, 101.0, 102.0]))
+        # Split: all adjusted closes halved
+        adjusted = make_bars(['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05'], [50.0, 50.5, 51.0, 52.0])
+        mock_get_ohlcv.return_value = adjusted
+
+        self.kis.refresh_ohlcv_cache([{'code': '000660', 'name': 'SK Hynix'}], incremental=True, reconcile_days=2)
+
+        # Overlap check + full reload
+        self.assertEqual(mock_get_ohlcv.call_count, 2)
+        df = store.load('000660')
+        self.assertEqual(df.iloc[0]['Close'], 50.0)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.ohlcv_store import OHLCVStore
+
+
+def make_bars(dates, closes):
+    return pd.DataFrame({
+        'Date': pd.to_datetime(dates),
+        'Open': closes, 'High': closes, 'Low': closes, 'Close': closes,
+        'Volume': [1000] * len(closes)
+    })
+
+
+class TestOHLCVStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = OHLCVStore(path=os.path.join(self.tmp.name, 'ohlcv.arrow'), legacy_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_and_load_symbol(self):
+        self.store.put_many({
+            '000660': make_bars(['2024-01-03', '2024-01-02'], [101, 100]),
+            '005930': make_bars(['2024-01-02'], [70000]),
+        })
+        df = self.store.load('000660')
+        self.assertEqual(list(df.columns), ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        self.assertEqual(df['Close'].tolist(), [100.0, 101.0])
+        self.assertEqual(self.store.last_date('000660'), pd.Timestamp('2024-01-03'))
+        self.assertTrue(self.store.load('999999').empty)
+
+    def test_append_upserts_by_date(self):
+        self.store.put('000660', make_bars(['2024-01-02', '2024-01-03'], [100, 101]))
+        self.store.append('000660', make_bars(['2024-01-03', '2024-01-04'], [105, 106]))
+        df = self.store.load('000660')
+        self.assertEqual(df['Close'].tolist(), [100.0, 105.0, 106.0])
+
+    def test_load_many_skips_missing_codes(self):
+        self.store.put_many({
+            'A': make_bars(['2024-01-02', '2024-01-03'], [10, 11]),
+            'B': make_bars(['2024-01-03'], [20]),
+        })
+        frames = self.store.load_many(['B', 'C', 'A'])
+        self.assertEqual(sorted(frames), ['A', 'B'])
+        self.assertEqual(frames['A']['Close'].tolist(), [10.0, 11.0])
+        self.assertEqual(frames['B']['Date'].tolist(), [pd.Timestamp('2024-01-03')])
+
+    def test_synced_markers_do_not_rewrite_bars(self):
+        self.store.put('000660', make_bars(['2024-01-02'], [100]))
+        mtime = os.stat(self.store.path).st_mtime_ns
+        self.store.put_many({}, synced={'000660': '20240103'})
+        self.store.append('005930', make_bars([], []), synced='20240103')
+
+        self.assertEqual(os.stat(self.store.path).st_mtime_ns, mtime)
+        self.assertEqual(self.store.synced_date('000660'), '20240103')
+        # Shared with other processes through the sidecar file
+        other = OHLCVStore(path=self.store.path, legacy_dir=self.tmp.name)
+        self.assertEqual(other.synced_date('005930'), '20240103')
+        self.assertIsNone(other.synced_date('035720'))
+
+    def test_migrates_legacy_pickles(self):
+        legacy = tempfile.TemporaryDirectory()
+        make_bars(['2024-01-02'], [100]).to_pickle(os.path.join(legacy.name, '000660.pkl'))
+        store = OHLCVStore(path=os.path.join(self.tmp.name, 'migrated.arrow'), legacy_dir=legacy.name)
+        self.assertEqual(store.codes(), ['000660'])
+        legacy.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
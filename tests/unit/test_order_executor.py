@@ -0,0 +1,114 @@
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from src.kis_simulator import FakeKISServer, SimulatorData, ROUTES, _error
+from src.order_executor import OrderExecutor, STATUS_SUBMITTED, STATUS_FAILED, STATUS_SKIPPED, summarize
+from tests.unit.test_kis_simulator import make_client
+
+BUYABLE_ROUTE = ("GET", "/uapi/domestic-stock/v1/trading/inquire-psbl-order")
+PRICES = {"000660": 100_000, "005930": 50_000, "035720": 40_000, "247540": 250_000, "293490": 20_000}
+
+
+@patch('src.kis_client.time.sleep')
+class TestOrderExecutorSimulator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        prices = {code: {field: str(p) for field in ("stck_prpr", "stck_oprc", "stck_hgpr", "stck_lwpr", "stck_sdpr", "stck_prdy_clpr", "acml_vol")}
+                  for code, p in PRICES.items()}
+        for price in prices.values():
+            price["prdy_ctrt"] = "0.00"
+        self.data = SimulatorData(prices=prices, cash=2_500_000,
+                                  holdings=[{"pdno": "005930", "prdt_name": "삼성전자", "hldg_qty": "10", "pchs_avg_pric": "45000"}])
+        self.server = FakeKISServer(self.data, seed=1)
+        self.kis = make_client(self.server.start(), self.tmp)
+
+    def tearDown(self):
+        self.kis.close()
+        self.server.stop()
+        shutil.rmtree(self.tmp)
+
+    def test_buy_prefetches_once_and_splits_budget(self, _sleep):
+        targets = [{"code": c, "name": c} for c in ("000660", "035720", "247540", "293490")]
+        report = OrderExecutor(self.kis).buy(targets, 1_000_000)
+
+        self.assertEqual([r["code"] for r in report], [t["code"] for t in targets])
+        by_code = {r["code"]: r for r in report}
+        self.assertEqual((by_code["000660"]["status"], by_code["000660"]["qty"]), (STATUS_SUBMITTED, 10))
+        self.assertEqual((by_code["035720"]["status"], by_code["035720"]["qty"]), (STATUS_SUBMITTED, 25))
+        # 500,000 left: still >= half the per-stock amount, sized down to what remains
+        self.assertEqual((by_code["247540"]["status"], by_code["247540"]["qty"]), (STATUS_SUBMITTED, 2))
+        self.assertEqual(by_code["293490"]["status"], STATUS_SKIPPED)  # Budget used up
+
+        self.assertEqual(self.server.requests["FHKST11300006"], 1)
+        self.assertEqual(self.server.requests["TTTC8908R"], 1)
+        self.assertEqual(self.server.requests["TTTC0802U"], 3)
+        self.assertIn("000660", self.data.holdings)
+
+    def test_buy_uses_balance_cash_without_second_inquiry(self, _sleep):
+        targets = [{"code": c, "name": c} for c in ("000660", "035720")]
+        balance = self.kis.get_balance(force_refresh=True)
+        report = OrderExecutor(self.kis).buy(targets, 1_000_000, cash=balance['max_buy_amt'])
+        self.assertEqual([r["status"] for r in report], [STATUS_SUBMITTED, STATUS_SUBMITTED])
+        # The balance already carried the buying power
+        self.assertEqual(self.server.requests["TTTC8908R"], 1)
+
+    def test_buy_falls_back_to_balance_cash(self, _sleep):
+        targets = [{"code": c, "name": c} for c in ("000660", "035720")]
+        with patch.dict(ROUTES, {BUYABLE_ROUTE: lambda server, params, tr_id: (200, _error("조회 실패"))}):
+            self.assertIsNone(self.kis.get_buyable_cash())
+            balance = self.kis.get_balance(force_refresh=True)
+            report = OrderExecutor(self.kis).buy(targets, 1_000_000, cash=balance['max_buy_amt'])
+        # Orderable cash falls back to the balance deposit instead of 0
+        self.assertEqual(balance['max_buy_amt'], 2_500_000)
+        self.assertEqual([(r["status"], r["qty"]) for r in report], [(STATUS_SUBMITTED, 10), (STATUS_SUBMITTED, 25)])
+        self.assertEqual(self.server.requests["TTTC0802U"], 2)
+
+    def test_buy_without_buying_power_sizes_full_amount(self, _sleep):
+        targets = [{"code": c, "name": c} for c in ("000660", "035720")]
+        with patch.dict(ROUTES, {BUYABLE_ROUTE: lambda server, params, tr_id: (200, _error("조회 실패"))}):
+            report = OrderExecutor(self.kis).buy(targets, 1_000_000)
+        self.assertEqual([(r["status"], r["qty"]) for r in report], [(STATUS_SUBMITTED, 10), (STATUS_SUBMITTED, 25)])
+
+    def test_sell_reports_rejections(self, _sleep):
+        targets = [{"code": "005930", "name": "삼성전자", "qty": 10}, {"code": "000660", "name": "SK하이닉스", "qty": 3},
+                   {"code": "035720", "name": "카카오", "qty": 0}]
+        report = OrderExecutor(self.kis).sell(targets)
+        self.assertEqual([r["status"] for r in report], [STATUS_SUBMITTED, STATUS_FAILED, STATUS_SKIPPED])
+        self.assertNotIn("005930", self.data.holdings)
+        self.assertEqual(self.server.requests["TTTC0801U"], 2)
+        self.assertIn("❌ SELL SK하이닉스(000660) 3주", summarize(report))
+
+
+class TestOrderExecutorConcurrency(unittest.TestCase):
+    def test_orders_overlap_up_to_worker_limit(self):
+        kis = MagicMock()
+        kis.rate_limiter.limits = {"order": 10}
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+
+        def send_order(code, qty, side="buy", price=0, order_type="00"):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return True, "ok"
+
+        kis.send_order.side_effect = send_order
+        targets = [{"code": f"{i:06d}", "name": str(i), "qty": 1} for i in range(8)]
+        report = OrderExecutor(kis, max_workers=4).sell(targets)
+        self.assertTrue(all(r["status"] == STATUS_SUBMITTED for r in report))
+        self.assertEqual(peak[0], 4)
+
+        kis.rate_limiter.limits = {"order": 1}  # Mock server budget: one at a time
+        peak[0] = 0
+        OrderExecutor(kis, max_workers=4).sell(targets)
+        self.assertEqual(peak[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
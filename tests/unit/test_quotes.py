@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from src.kis_client import KISClient
+from src.quote_cache import QuoteCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def multi_response(codes):
+    res = MagicMock()
+    res.status_code = 200
+    res.json.return_value = {
+        'rt_cd': '0',
+        'output': [
+            {'inter_shrn_iscd': c, 'inter_kor_isnm': f'N{c}', 'inter2_prpr': '1000',
+             'inter2_oprc': '990', 'inter2_hgpr': '1010', 'inter2_lwpr': '980', 'acml_vol': '500'}
+            for c in codes
+        ]
+    }
+    return res
+
+
+class TestQuoteCache(unittest.TestCase):
+    def test_ttl_and_full_only(self):
+        clock = FakeClock()
+        cache = QuoteCache(ttl=3, clock=clock)
+        cache.put('A', {'stck_prpr': '1'}, full=False)
+        self.assertIsNotNone(cache.get('A'))
+        self.assertIsNone(cache.get('A', full_only=True))
+
+        clock.now = 4
+        self.assertIsNone(cache.get('A'))
+
+    def test_partial_update_keeps_full_fields(self):
+        cache = QuoteCache(ttl=3, clock=FakeClock())
+        cache.put('A', {'stck_prpr': '1', 'iscd_stat_cls_code': '51'}, full=True)
+        cache.put('A', {'stck_prpr': '2'}, full=False)
+        data = cache.get('A', full_only=True)
+        self.assertEqual(data['stck_prpr'], '2')
+        self.assertEqual(data['iscd_stat_cls_code'], '51')
+
+    def test_partial_merge_does_not_extend_full_age(self):
+        clock = FakeClock()
+        cache = QuoteCache(ttl=3, clock=clock)
+        cache.put('A', {'stck_prpr': '1', 'iscd_stat_cls_code': '51'}, full=True)
+        clock.now = 2
+        cache.put('A', {'stck_prpr': '2'}, full=False)
+
+        clock.now = 4
+        # Prices are 2s old, status fields 4s old
+        self.assertEqual(cache.get('A')['stck_prpr'], '2')
+        self.assertIsNone(cache.get('A', full_only=True))
+
+        # Once the full entry has expired, partial snapshots no longer merge into it
+        cache.put('A', {'stck_prpr': '3'}, full=False)
+        self.assertEqual(cache.get('A'), {'stck_prpr': '3'})
+        self.assertIsNone(cache.get('A', full_only=True))
+
+
+class TestGetQuotes(unittest.TestCase):
+    def setUp(self):
+        self.kis = KISClient()
+        self.kis.is_mock = False
+
+    @patch('src.kis_client.KISClient.get_current_price')
+    @patch('src.kis_client.KISClient._send_request')
+    def test_multi_quote_batches_of_30(self, mock_send, mock_price):
+        codes = [f"{i:06d}" for i in range(45)]
+        mock_send.side_effect = lambda method, path, tr_id, params=None, body=None: multi_response(
+            [v for k, v in params.items() if k.startswith('FID_INPUT_ISCD_')]
+        )
+
+        quotes = self.kis.get_quotes(codes)
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(len(mock_send.call_args_list[0].kwargs['params']), 60)
+        self.assertEqual(len(quotes), 45)
+        self.assertEqual(quotes['000001']['stck_prpr'], '1000')
+        self.assertEqual(quotes['000001']['hts_kor_isnm'], 'N000001')
+        mock_price.assert_not_called()
+
+        # Second snapshot inside the TTL is served from the cache
+        self.kis.get_quotes(codes)
+        self.assertEqual(mock_send.call_count, 2)
+
+    @patch('src.kis_client.KISClient.get_current_price')
+    def test_mock_falls_back_to_single_quotes(self, mock_price):
+        self.kis.is_mock = True
+        mock_price.side_effect = lambda code, use_cache=True, use_stream=True: None if code == 'BAD' else {'stck_prpr': '10'}
+
+        quotes = self.kis.get_quotes(['A', 'B', 'BAD', 'A'])
+
+        self.assertEqual(set(quotes), {'A', 'B'})
+        self.assertEqual(mock_price.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
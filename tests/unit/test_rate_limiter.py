@@ -0,0 +1,136 @@
+import unittest
+import threading
+from src.rate_limiter import TokenBucket, KISRateLimiter, classify_tr_id
+
+
+class FakeClock:
+    """Deterministic clock: sleep() advances time instead of blocking."""
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class SteppedClock:
+    """Fake clock for threaded tests: sleep() blocks until the test advances time past the deadline."""
+    def __init__(self):
+        self.now = 0.0
+        self.cond = threading.Condition()
+        self._deadlines = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self.cond:
+            deadline = self.now + seconds
+            self._deadlines.append(deadline)
+            self.cond.notify_all()
+            while self.now < deadline:
+                self.cond.wait()
+            self._deadlines.remove(deadline)
+            self.cond.notify_all()
+
+    def sleepers(self):
+        """Threads blocked in sleep() on a deadline that has not passed yet."""
+        return sum(1 for d in self._deadlines if d > self.now)
+
+    def advance(self, seconds):
+        with self.cond:
+            self.now += seconds
+            self.cond.notify_all()
+
+    def wait_until(self, predicate, timeout=5.0):
+        with self.cond:
+            if not self.cond.wait_for(predicate, timeout):
+                raise AssertionError("limiter threads did not reach the expected state")
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_classify_tr_id(self):
+        self.assertEqual(classify_tr_id("TTTC0802U"), "order")
+        self.assertEqual(classify_tr_id("VTTC8434R"), "account")
+        self.assertEqual(classify_tr_id("FHKST01010100"), "quote")
+        self.assertEqual(classify_tr_id("FHKST03010100"), "history")
+        self.assertEqual(classify_tr_id("TTTC9999U"), "order")
+
+    def test_bucket_paces_to_rate(self):
+        bucket = TokenBucket(10, 1, clock=self.clock.time, sleep=self.clock.sleep)
+        for _ in range(11):
+            bucket.acquire()
+        # First token is free, next 10 arrive at 10 TPS
+        self.assertAlmostEqual(self.clock.now, 1.0)
+
+    def test_no_wait_when_budget_available(self):
+        bucket = TokenBucket(5, 5, clock=self.clock.time, sleep=self.clock.sleep)
+        for _ in range(5):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(self.clock.now, 0.0)
+
+    def test_class_budget_under_shared_budget(self):
+        limits = {"total": 10, "order": 10, "account": 10, "quote": 10, "history": 2, "burst": 1}
+        limiter = KISRateLimiter(limits=limits, clock=self.clock.time, sleep=self.clock.sleep)
+        for _ in range(3):
+            limiter.acquire("FHKST03010100")
+        # History is capped at 2 TPS
+        self.assertAlmostEqual(self.clock.now, 1.0)
+
+        start = self.clock.now
+        for _ in range(3):
+            limiter.acquire("FHKST01010100")
+        # Quotes are not held back by the history budget
+        self.assertLess(self.clock.now - start, 0.5)
+
+    def test_order_preempts_queued_history(self):
+        # Stepped clock: 3 history calls are queued on a 10 TPS shared budget when the order arrives
+        clock = SteppedClock()
+        limits = {"total": 10, "order": 10, "account": 10, "quote": 10, "history": 10, "burst": 1}
+        limiter = KISRateLimiter(limits=limits, clock=clock.time, sleep=clock.sleep)
+        # Only the shared budget should hold history back here
+        limiter.buckets["history"] = TokenBucket(10, 10, clock=clock.time, sleep=clock.sleep)
+        served = []
+        order_wait = []
+
+        def call(tr_id, kind):
+            waited = limiter.acquire(tr_id)
+            with clock.cond:
+                served.append(kind)
+                if kind == "order":
+                    order_wait.append(waited)
+                clock.cond.notify_all()
+
+        workers = [threading.Thread(target=call, args=("FHKST03010100", "history")) for _ in range(4)]
+        for w in workers:
+            w.start()
+        # First history call took the free token, the head of the other 3 sleeps for the next one
+        clock.wait_until(lambda: served == ["history"] and len(limiter._waiters) == 3 and clock.sleepers() == 1)
+
+        order = threading.Thread(target=call, args=("TTTC0802U", "order"))
+        order.start()
+        clock.wait_until(lambda: clock.sleepers() == 2)
+
+        # Each step releases exactly one token (0.1s at 10 TPS)
+        clock.advance(0.1)
+        clock.wait_until(lambda: len(served) == 2)
+        for count in range(3, 6):
+            clock.wait_until(lambda: clock.sleepers() == 1)
+            clock.advance(0.1)
+            clock.wait_until(lambda: len(served) == count)
+
+        for t in workers + [order]:
+            t.join()
+
+        # Order got the next free token instead of queuing behind the 3 history calls
+        self.assertEqual(served, ["history", "order", "history", "history", "history"])
+        self.assertAlmostEqual(order_wait[0], 0.1)
+        self.assertAlmostEqual(clock.now, 0.4)
+
+if __name__ == '__main__':
+    unittest.main()
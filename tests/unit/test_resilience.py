@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from src.kis_client import KISClient
+from src.rate_limiter import TokenBucket
+from src.resilience import Backoff, CircuitBreaker, AdaptiveRate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status=200, payload=None):
+    res = MagicMock()
+    res.status_code = status
+    res.json.return_value = payload if payload is not None else {'rt_cd': '0', 'msg_cd': '', 'msg1': 'OK'}
+    return res
+
+
+RATE_LIMITED = {'rt_cd': '1', 'msg_cd': 'EGW00201', 'msg1': '초당 거래건수를 초과하였습니다.'}
+
+
+class TestResiliencePrimitives(unittest.TestCase):
+    def test_backoff_is_jittered_and_capped(self):
+        self.assertEqual(Backoff(base=0.25, cap=8, rng=lambda: 1.0).delay(10), 8)
+        self.assertEqual(Backoff(base=0.25, cap=8, rng=lambda: 1.0).delay(2), 1.0)
+        self.assertEqual(Backoff(base=0.25, cap=8, rng=lambda: 0.0).delay(3), 0.0)
+
+    def test_circuit_breaker_cycle(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("x", failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        clock.now = 10
+        self.assertTrue(breaker.allow())   # half-open probe
+        self.assertFalse(breaker.allow())  # only one probe
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_adaptive_rate_aimd(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, clock=clock)
+        adaptive = AdaptiveRate(bucket, ceiling=10, decrease=0.5, recovery=1.0, cooldown=1.0, clock=clock)
+        adaptive.penalize()
+        adaptive.penalize()  # same burst -> one decrease
+        self.assertEqual(bucket.rate, 5)
+
+        clock.now = 2
+        adaptive.reward()
+        self.assertEqual(bucket.rate, 7)
+        clock.now = 100
+        adaptive.reward()
+        self.assertEqual(bucket.rate, 10)
+
+
+@patch('src.kis_client.time.sleep')
+class TestSendRequestResilience(unittest.TestCase):
+    def setUp(self):
+        self.kis = KISClient()
+        self.kis._get_headers = lambda tr_id, data=None, credential=None: {'authorization': 'Bearer t'}
+        self.kis.session = MagicMock()
+
+    def test_rate_limit_lowers_tps_and_retries(self, _sleep):
+        self.kis.session.get.side_effect = [response(200, RATE_LIMITED), response()]
+        start_rate = self.kis.rate_limiter.total.rate
+
+        res = self.kis._send_request("GET", "/q", "FHKST01010100")
+
+        self.assertEqual(res.json()['rt_cd'], '0')
+        self.assertEqual(self.kis.session.get.call_count, 2)
+        self.assertLess(self.kis.rate_limiter.total.rate, start_rate)
+
+    def test_order_not_retried_after_server_error(self, _sleep):
+        self.kis.session.post.return_value = response(500, {})
+        res = self.kis._send_request("POST", "/order", "TTTC0802U", body={})
+        self.assertEqual(res.status_code, 500)
+        self.assertEqual(self.kis.session.post.call_count, 1)
+
+    def test_order_retried_on_explicit_rate_limit(self, _sleep):
+        self.kis.session.post.side_effect = [response(200, RATE_LIMITED), response()]
+        ok, _ = self.kis.send_order("000660", 1, side="buy", price=0, order_type="01")
+        self.assertTrue(ok)
+        self.assertEqual(self.kis.session.post.call_count, 2)
+
+    def test_circuit_opens_on_repeated_server_errors(self, _sleep):
+        self.kis.session.get.return_value = response(503, {})
+        self.kis._send_request("GET", "/q", "FHKST01010100")  # 5 attempts -> open
+        calls = self.kis.session.get.call_count
+
+        self.assertIsNone(self.kis._send_request("GET", "/q", "FHKST01010100"))
+        self.assertEqual(self.kis.session.get.call_count, calls)
+        # Other endpoints are unaffected
+        self.kis.session.get.return_value = response()
+        self.assertIsNotNone(self.kis._send_request("GET", "/other", "FHKST01010100"))
+
+
+if __name__ == '__main__':
+    unittest.main()
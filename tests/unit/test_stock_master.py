@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from src.stock_master import StockMaster
+
+
+def fake_pykrx(listings, names, index_members):
+    stock = MagicMock()
+    stock.get_market_ticker_list.side_effect = lambda market: listings[market]
+    stock.get_market_ticker_name.side_effect = lambda ticker: names[ticker]
+    stock.get_index_portfolio_deposit_file.side_effect = lambda ticker: index_members.get(ticker, [])
+    return SimpleNamespace(stock=stock)
+
+
+class TestStockMaster(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.list_file = os.path.join(self.tmp.name, 'kosdaq150_list.txt')
+        with open(self.list_file, 'w', encoding='utf-8') as f:
+            f.write("{'code': '035760', 'name': 'CJ ENM'},\n{'code': '028300', 'name': 'HLB'},\n\n")
+        self.path = os.path.join(self.tmp.name, 'stock_master.json')
+        self.master = StockMaster(path=self.path, list_files={"KOSDAQ150": (self.list_file, "KOSDAQ")})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_seeded_from_list_file(self):
+        self.assertEqual(self.master.members("KOSDAQ150"), [
+            {'code': '035760', 'name': 'CJ ENM'}, {'code': '028300', 'name': 'HLB'}
+        ])
+        self.assertEqual(self.master.name('028300'), 'HLB')
+        self.assertEqual(self.master.code_of('CJ ENM'), '035760')
+        self.assertEqual(self.master.get('028300')['market'], 'KOSDAQ')
+        self.assertIsNone(self.master.name('999999'))
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_persisted_master_is_used(self):
+        self.master.members("KOSDAQ150")
+        os.remove(self.list_file)
+        reloaded = StockMaster(path=self.path, list_files={"KOSDAQ150": (self.list_file, "KOSDAQ")})
+        self.assertEqual(reloaded.name('035760'), 'CJ ENM')
+
+    def test_refresh_keeps_dropped_codes(self):
+        self.master.members("KOSDAQ150")
+        with open(self.list_file, 'w', encoding='utf-8') as f:
+            f.write("{'code': '035760', 'name': 'CJ ENM'},\n")
+        # pykrx unavailable: list files only (no network)
+        with patch.dict(sys.modules, {'pykrx': None}):
+            self.master.refresh()
+        self.assertEqual([m['code'] for m in self.master.members("KOSDAQ150")], ['035760'])
+        # Name still resolvable after leaving the index
+        self.assertEqual(self.master.name('028300'), 'HLB')
+
+
+    def test_refresh_from_krx(self):
+        self.master.members("KOSDAQ150")
+        pykrx = fake_pykrx(
+            listings={"KOSPI": ["005930"], "KOSDAQ": ["035760", "247540"]},
+            names={"005930": "삼성전자", "035760": "CJ ENM", "247540": "에코프로비엠"},
+            index_members={"2203": ["247540", "035760"], "1028": ["005930"]},
+        )
+        with patch.dict(sys.modules, {'pykrx': pykrx}):
+            self.assertEqual(self.master.refresh(), 4)
+        self.assertEqual([m['code'] for m in self.master.members("KOSDAQ150")], ['247540', '035760'])
+        self.assertEqual([m['code'] for m in self.master.members("KOSPI200")], ['005930'])
+        self.assertEqual(self.master.get('005930')['market'], 'KOSPI')
+        self.assertEqual(self.master.name('247540'), '에코프로비엠')
+        # HLB is no longer in the KRX listing: kept for its name, marked delisted
+        self.assertFalse(self.master.is_listed('028300'))
+        self.assertEqual(self.master.name('028300'), 'HLB')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.kis_client import KISClient
+from src.stock_status_cache import StockStatusCache
+
+NORMAL = {'stck_prpr': '1000', 'iscd_stat_cls_code': '55', 'mrkt_warn_cls_code': '00', 'mang_issu_cls_code': 'N', 'invt_caful_yn': 'N'}
+MANAGED = dict(NORMAL, iscd_stat_cls_code='51', mang_issu_cls_code='Y')
+
+
+class TestStockStatusCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'stock_status.json')
+        self.kis = KISClient()
+        self.kis.status_cache = StockStatusCache(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch('src.kis_client.KISClient.get_current_price')
+    def test_prefetch_then_memory_lookup(self, mock_price):
+        mock_price.side_effect = lambda code, use_cache=True, use_stream=True: MANAGED if code == 'BAD' else NORMAL
+
+        self.assertEqual(self.kis.prefetch_stock_status(['A', 'BAD', 'A']), 2)
+        self.assertEqual(mock_price.call_count, 2)
+
+        self.assertEqual(self.kis.check_dangerous_stock('A'), (False, "Safe"))
+        self.assertTrue(self.kis.check_dangerous_stock('BAD')[0])
+        self.assertTrue(self.kis.check_manage_status('BAD'))
+        # Served from the cache
+        self.assertEqual(mock_price.call_count, 2)
+
+        # Persisted for a restarted bot on the same day
+        self.assertEqual(StockStatusCache(self.path).get('BAD')['iscd_stat_cls_code'], '51')
+
+    @patch('src.kis_client.KISClient.get_current_price', return_value=None)
+    def test_no_data_is_dangerous_and_not_cached(self, mock_price):
+        self.assertEqual(self.kis.check_dangerous_stock('X'), (True, "No Data"))
+        self.assertIsNone(self.kis.status_cache.get('X'))
+
+    def test_new_day_discards_entries(self):
+        cache = StockStatusCache(self.path)
+        cache.put('A', NORMAL)
+        with patch.object(StockStatusCache, '_today', return_value='29991231'):
+            self.assertIsNone(cache.get('A'))
+
+
+if __name__ == '__main__':
+    unittest.main()
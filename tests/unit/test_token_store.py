@@ -0,0 +1,75 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+from src.token_store import TokenStore
+
+
+def _slow_issue(counter_path):
+    def issue():
+        with open(counter_path, "a") as f:
+            f.write("x")
+        time.sleep(0.3)
+        return "fresh-token", time.time() + 3600
+    return issue
+
+
+def _worker(token_path, counter_path, queue):
+    cached = TokenStore(token_path).get_or_refresh(_slow_issue(counter_path))
+    queue.put(cached.access_token)
+
+
+class TestTokenStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "token.json")
+        self.counter = os.path.join(self.tmp, "issued")
+        self.store = TokenStore(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def issued(self):
+        if not os.path.exists(self.counter):
+            return 0
+        with open(self.counter) as f:
+            return len(f.read())
+
+    def test_cached_token_reused(self):
+        self.store.write("tok-a", time.time() + 3600)
+        cached = self.store.get_or_refresh(_slow_issue(self.counter))
+        self.assertEqual(cached.access_token, "tok-a")
+        self.assertEqual(self.issued(), 0)
+
+    def test_expired_token_refreshed(self):
+        self.store.write("tok-a", time.time() - 1)
+        self.assertIsNone(self.store.read())
+        cached = self.store.get_or_refresh(_slow_issue(self.counter))
+        self.assertEqual(cached.access_token, "fresh-token")
+        self.assertEqual(self.store.read().access_token, "fresh-token")
+
+    def test_rejected_token_refreshed_once(self):
+        self.store.write("tok-a", time.time() + 3600)
+        first = self.store.get_or_refresh(_slow_issue(self.counter), rejected_token="tok-a")
+        # A second caller that also saw tok-a rejected picks up the new token
+        second = self.store.get_or_refresh(_slow_issue(self.counter), rejected_token="tok-a")
+        self.assertEqual(first.access_token, "fresh-token")
+        self.assertEqual(second.access_token, "fresh-token")
+        self.assertEqual(self.issued(), 1)
+
+    def test_single_flight_across_processes(self):
+        queue = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_worker, args=(self.path, self.counter, queue)) for _ in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=10)
+        tokens = [queue.get(timeout=1) for _ in procs]
+        self.assertEqual(tokens, ["fresh-token"] * 4)
+        self.assertEqual(self.issued(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
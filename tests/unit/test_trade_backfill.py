@@ -0,0 +1,96 @@
+import shutil
+import tempfile
+import unittest
+import os
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+from src.db_manager import DBManager
+from src.kis_simulator import FakeKISServer, SimulatorData
+from src.trade_backfill import backfill_trade_history, date_chunks
+from src.kis_client import period_trades_cutoff
+from src.utils import get_now_kst
+from tests.unit.test_kis_simulator import make_client
+
+
+def order_row(n, day, code, side, qty, price):
+    return {
+        "ord_dt": day, "ord_tmd": "090000", "odno": f"{n:010d}", "orgn_odno": "", "ord_gno_brno": "00950",
+        "sll_buy_dvsn_cd": side, "pdno": code, "prdt_name": code, "ord_qty": str(qty), "ord_unpr": str(price),
+        "tot_ccld_qty": str(qty), "tot_ccld_amt": str(qty * price), "avg_prvs": str(price), "rmn_qty": "0", "cncl_yn": "N",
+    }
+
+
+def days_ago(n):
+    return (get_now_kst() - timedelta(days=n)).strftime("%Y%m%d")
+
+
+@patch('src.kis_client.time.sleep')
+class TestPeriodTradesPagination(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.data = SimulatorData()
+        self.server = FakeKISServer(self.data, seed=1)
+        self.server.ccld_page_size = 10
+        self.kis = make_client(self.server.start(), self.tmp)
+        self.db = DBManager(market_db=os.path.join(self.tmp, "market.db"), user_db=os.path.join(self.tmp, "user.db"))
+
+    def tearDown(self):
+        self.kis.close()
+        self.server.stop()
+        shutil.rmtree(self.tmp)
+
+    def test_follows_continuation_keys(self, _sleep):
+        day = days_ago(3)
+        self.data.orders = [order_row(i, day, "000660", "02", 1, 100) for i in range(35)]
+        rows = list(self.kis.iter_period_trades(day, day))
+        self.assertEqual(len({r["odno"] for r in rows}), 35)
+        self.assertEqual(self.server.requests["TTTC8001R"], 4)
+        self.assertEqual(len(self.kis.get_period_trades(day, day)), 35)
+
+    def test_truncated_page(self, _sleep):
+        first = MagicMock(status_code=200, headers={"tr_cont": "F"})
+        first.json.return_value = {"rt_cd": "0", "output1": [order_row(1, "20260105", "000660", "02", 1, 100)],
+                                   "ctx_area_fk100": "x", "ctx_area_nk100": "1"}
+        self.kis._send_request = MagicMock(side_effect=[first, None])
+        self.assertEqual(len(list(self.kis.iter_period_trades("20260105", "20260105"))), 1)
+
+        self.kis._send_request = MagicMock(side_effect=[first, None])
+        with self.assertRaises(Exception):
+            list(self.kis.iter_period_trades("20260105", "20260105", strict=True))
+
+    def test_backfill_aggregates_and_batches(self, _sleep):
+        recent, old = days_ago(5), days_ago(120)
+        orders = [order_row(i, recent, "000660", "02", 1, 100 + i) for i in range(12)]   # 12 partial buys
+        orders += [order_row(100, recent, "005930", "01", 5, 70000)]
+        orders += [order_row(200, old, "035720", "02", 3, 50000)]
+        self.data.orders = orders
+
+        summary = backfill_trade_history(self.kis, self.db, days_ago(130), days_ago(0), chunk_days=30)
+        self.assertEqual((summary["rows"], summary["inserted"], summary["failed"]), (14, 3, []))
+        self.assertGreater(self.server.requests["CTSC9115R"], 0)
+
+        history = {(h["code"], h["action"]): h for h in self.db.get_trade_history()}
+        buy = history[("000660", "BUY")]
+        self.assertEqual(buy["quantity"], 12)
+        self.assertAlmostEqual(buy["price"], 105.5)
+        self.assertEqual(buy["date"], f"{recent[:4]}-{recent[4:6]}-{recent[6:]}")
+        self.assertEqual(history[("005930", "SELL")]["amount"], 350000)
+
+        # Re-running is idempotent; replace rewrites in place
+        again = backfill_trade_history(self.kis, self.db, days_ago(130), days_ago(0), chunk_days=30)
+        self.assertEqual((again["inserted"], again["updated"]), (0, 0))
+        again = backfill_trade_history(self.kis, self.db, days_ago(130), days_ago(0), replace=True)
+        self.assertEqual((again["inserted"], again["updated"]), (0, 3))
+        self.assertEqual(len(self.db.get_trade_history()), 3)
+
+    def test_chunks_split_at_cutoff(self, _sleep):
+        cutoff = period_trades_cutoff()
+        chunks = list(date_chunks(days_ago(200), days_ago(0), chunk_days=45))
+        self.assertEqual(chunks[0][0], days_ago(200))
+        self.assertEqual(chunks[-1][1], days_ago(0))
+        self.assertTrue(any(start == cutoff for start, _ in chunks))
+        self.assertTrue(all(end < cutoff or start >= cutoff for start, end in chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
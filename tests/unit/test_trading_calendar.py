@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.trading_calendar import TradingCalendar
+from src.trade_manager import TradeManager
+
+HOLIDAYS = {"20260101", "20260216", "20260217", "20260218"}
+
+
+class FakeFetcher:
+    """Weekends + HOLIDAYS closed."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        days = {}
+        d = datetime.strptime(start, "%Y%m%d")
+        last = datetime.strptime(end, "%Y%m%d")
+        while d <= last:
+            s = d.strftime("%Y%m%d")
+            days[s] = d.weekday() < 5 and s not in HOLIDAYS
+            d += timedelta(days=1)
+        return days
+
+
+class TestTradingCalendar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "calendar.json")
+        self.fetcher = FakeFetcher()
+        self.cal = TradingCalendar(path=self.path, fetcher=self.fetcher)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookups(self):
+        self.assertFalse(self.cal.is_trading_day("20260217"))  # Seollal
+        self.assertTrue(self.cal.is_trading_day("20260219"))
+        self.assertEqual(self.cal.next_trading_day("20260213"), "20260219")
+        self.assertEqual(self.cal.prev_trading_day("20260219"), "20260213")
+        # Fri 02-13 -> Thu 02-19 / Fri 02-20
+        self.assertEqual(self.cal.trading_days_between("20260213", "20260220"), 2)
+        # Whole year fetched once
+        self.assertEqual(self.fetcher.calls, [("20260101", "20261231")])
+
+    def test_persisted_calendar_needs_no_fetch(self):
+        self.cal.is_trading_day("20260302")
+        offline = TradingCalendar(path=self.path, fetcher=None)
+        self.assertFalse(offline.is_trading_day("20260216"))
+        self.assertEqual(offline.trading_days_between("20260213", "20260220"), 2)
+
+    def test_year_boundary(self):
+        # Wed 2025-12-31 -> Fri 2026-01-02 (01-01 closed)
+        self.assertEqual(self.cal.next_trading_day("20251231"), "20260102")
+        self.assertEqual(self.cal.trading_days_between("20251230", "20260105"), 3)
+
+    def test_holding_days_uses_calendar(self):
+        tm = TradeManager(calendar=self.cal)
+        tm.history = {"holdings": {"000660": {"buy_date": "20260213"}}, "last_trade": {}}
+        self.assertEqual(tm.get_holding_days("000660", current_date_str="20260220"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()